@@ -0,0 +1,101 @@
+# backend/admin.py
+"""Admin credential for endpoints that hand out every account's data.
+
+Those endpoints need ADMIN_TOKEN in an X-Admin-Token header (or
+`Authorization: Bearer <token>`), or the session cookie that
+POST /api/admin/session sets in exchange for it. With ADMIN_TOKEN unset they
+are disabled and answer 404, as if they did not exist.
+
+The session cookie lets the browser reach the event stream, whose
+EventSource cannot send headers. It is httpOnly, signed with ADMIN_TOKEN
+(changing the token ends every session) and expires after
+ADMIN_SESSION_SECONDS. The token itself never goes into a URL.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+
+from database import env_bool
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+ADMIN_SESSION_SECONDS = int(os.getenv("ADMIN_SESSION_SECONDS", str(8 * 3600)))
+# The UI is served from another site, so the cookie must be SameSite=None, which needs Secure
+ADMIN_COOKIE_SECURE = env_bool("ADMIN_COOKIE_SECURE", True)
+
+SESSION_COOKIE = "admin_session"
+SESSION_PATH = "/api/admin"
+
+
+def _enabled():
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+def _header_token(request: Request) -> Optional[str]:
+    token = request.headers.get("x-admin-token")
+    if token is None:
+        scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and credentials:
+            token = credentials
+    return token
+
+
+def _valid_token(token: Optional[str]) -> bool:
+    return token is not None and secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def _signature(expires: str) -> str:
+    return hmac.new(ADMIN_TOKEN.encode(), f"admin-session:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def _valid_session(value: Optional[str]) -> bool:
+    """True for an unexpired "<expires>.<signature>" cookie signed with the current token."""
+    if not value:
+        return False
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return secrets.compare_digest(signature.encode(), _signature(expires).encode())
+
+
+def require_admin_token(request: Request):
+    """Dependency: the admin token itself, in a header (not a session)."""
+    _enabled()
+    if not _valid_token(_header_token(request)):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+def require_admin(request: Request):
+    """Dependency: 401 without the admin token or session, 404 while ADMIN_TOKEN is unset."""
+    _enabled()
+    if not (_valid_token(_header_token(request)) or _valid_session(request.cookies.get(SESSION_COOKIE))):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+def start_session(response: Response):
+    """Set a fresh session cookie on `response`."""
+    expires = str(int(time.time()) + ADMIN_SESSION_SECONDS)
+    response.set_cookie(
+        SESSION_COOKIE,
+        f"{expires}.{_signature(expires)}",
+        max_age=ADMIN_SESSION_SECONDS,
+        path=SESSION_PATH,
+        secure=ADMIN_COOKIE_SECURE,
+        httponly=True,
+        samesite="none" if ADMIN_COOKIE_SECURE else "lax",
+    )
+
+
+def end_session(response: Response):
+    response.delete_cookie(
+        SESSION_COOKIE,
+        path=SESSION_PATH,
+        secure=ADMIN_COOKIE_SECURE,
+        httponly=True,
+        samesite="none" if ADMIN_COOKIE_SECURE else "lax",
+    )
@@ -0,0 +1,55 @@
+# backend/benchmarks/bench_async_reads.py
+"""Sync vs async (DB_ASYNC) read endpoints under concurrent load, against SQLite.
+
+Run from backend/:  python -m benchmarks.bench_async_reads
+"""
+import argparse
+import os
+
+from benchmarks.common import run_load, sqlite_url, uvicorn_server
+
+READ_PATHS = [
+    "/api/accounts/{id}",
+    "/api/accounts/{id}/loan-summary",
+    "/api/accounts/{id}/payment-history",
+    "/api/scoring?limit=100",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = sqlite_url()
+    os.environ["DATABASE_URL"] = url
+
+    from benchmarks.seed import seed_database
+    from database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, args.accounts)
+
+    paths = [
+        path.format(id=(i * 7919) % args.accounts + 1)
+        for i in range(args.accounts)
+        for path in READ_PATHS
+    ]
+
+    print(f"{'mode':>6} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        # Default pool settings: up to 40 connections, one per sync handler thread
+        env = {"DATABASE_URL": url, "DB_ASYNC": flag}
+        with uvicorn_server(env, args.port) as base_url:
+            result = run_load(base_url, paths, args.concurrency, args.requests)
+        print(
+            f"{mode:>6} {result['rps']:>8} {result['p50_ms']:>8} "
+            f"{result['p99_ms']:>8} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
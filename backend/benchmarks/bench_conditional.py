@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_conditional.py
+"""Polled reads: full responses vs 304 Not Modified, and gzip sizes, against SQLite.
+
+For each endpoint, the same load is run twice: plain GETs (200 with a body)
+and GETs carrying the ETag of an earlier response (If-None-Match), which the
+API answers with an empty 304 while nothing has been written.
+
+Run from backend/:  python -m benchmarks.bench_conditional
+"""
+import argparse
+import os
+
+import httpx
+
+from benchmarks.common import run_load, sqlite_url, uvicorn_server
+
+ENDPOINTS = {
+    "account": "/api/accounts/{id}",
+    "loan-summary": "/api/accounts/{id}/loan-summary",
+    "payment-history": "/api/accounts/{id}/payment-history",
+    "dashboard": "/api/accounts/{id}/dashboard",
+    "scoring": "/api/scoring?limit=500",
+}
+
+
+def _size(base_url: str, path: str, encoding: str) -> int:
+    """Body bytes on the wire (httpx decompresses .content)."""
+    return httpx.get(base_url + path, headers={"Accept-Encoding": encoding}).num_bytes_downloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = sqlite_url()
+    os.environ["DATABASE_URL"] = url
+
+    from benchmarks.seed import seed_database
+    from database import engine
+    from migrations import migrate
+
+    migrate(engine)
+    seed_database(engine, args.accounts)
+    ids = [(i * 7919) % args.accounts + 1 for i in range(args.accounts)]
+
+    env = {"DATABASE_URL": url}
+    print(
+        f"{'endpoint':<16} {'200 rps':>8} {'304 rps':>8} {'200 p99':>8} {'304 p99':>8} "
+        f"{'bytes':>7} {'gzip':>7}"
+    )
+    with uvicorn_server(env, args.port) as base_url:
+        for name, template in ENDPOINTS.items():
+            paths = [template.format(id=user_id) for user_id in ids]
+            # The endpoints' validators come from table-wide counters, so one
+            # ETag covers every account's URL
+            etag = httpx.get(base_url + paths[0]).headers["etag"]
+            full = run_load(base_url, paths, args.concurrency, args.requests)
+            cached = run_load(
+                base_url, paths, args.concurrency, args.requests, headers={"If-None-Match": etag}
+            )
+            print(
+                f"{name:<16} {full['rps']:>8} {cached['rps']:>8} {full['p99_ms']:>8} "
+                f"{cached['p99_ms']:>8} {_size(base_url, paths[0], 'identity'):>7} "
+                f"{_size(base_url, paths[0], 'gzip'):>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
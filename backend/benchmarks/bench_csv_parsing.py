@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_csv_parsing.py
+"""Per-cell vs column-level parsing of the microloans CSV layout.
+
+Run from backend/:  python -m benchmarks.bench_csv_parsing
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+from csv_ingest import (
+    ACCOUNT_TEXT_COLUMNS,
+    LOAN_CSV_DTYPES,
+    MONTH_AMOUNT_COLUMNS,
+    MONTH_DATE_COLUMNS,
+    normalise_frame,
+)
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "data",
+    "microloans_500(Sheet1).csv",
+)
+
+
+# Baseline: the per-cell helpers the importers used before the column stage
+def norm(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and pd.isna(value):
+        return None
+    return str(value).strip()
+
+
+def parse_date(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def per_cell(df: pd.DataFrame):
+    for _, row in df.iterrows():
+        for col in ACCOUNT_TEXT_COLUMNS:
+            norm(row[col])
+        for col in MONTH_DATE_COLUMNS:
+            parse_date(row[col])
+        for col in MONTH_AMOUNT_COLUMNS:
+            value = row[col]
+            if isinstance(value, float) and pd.isna(value):
+                value = None
+
+
+def column_level(df: pd.DataFrame):
+    normalise_frame(
+        df,
+        text_cols=ACCOUNT_TEXT_COLUMNS,
+        date_cols=MONTH_DATE_COLUMNS,
+        amount_cols=MONTH_AMOUNT_COLUMNS,
+    )
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    """Tile the bundled 500-row sample up to `rows` rows."""
+    sample = pd.read_csv(SAMPLE_CSV, encoding="utf-8-sig", dtype=LOAN_CSV_DTYPES)
+    repeats = -(-rows // len(sample))
+    return pd.concat([sample] * repeats, ignore_index=True).iloc[:rows]
+
+
+def timed(fn, df) -> float:
+    start = time.perf_counter()
+    fn(df)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 5000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'per-cell s':>12} {'column s':>10} {'speedup':>8}")
+    for rows in args.rows:
+        df = synthetic_frame(rows)
+        before = timed(per_cell, df)
+        after = timed(column_level, df)
+        print(f"{rows:>8} {before:>12.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_export.py
+"""Repayment export: time to first byte, rows/s and peak memory per format and layout.
+
+Runs export.export_chunks() in-process against a seeded SQLite file; peak
+memory is what tracemalloc sees allocated while one export is consumed
+(measured in a second pass, as tracing slows it down). It should stay flat
+as --accounts grows.
+
+Run from backend/:
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --accounts 100000 --formats csv parquet
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.common import sqlite_url
+
+
+def _consume(chunks) -> tuple:
+    """(seconds to the first chunk, total seconds, bytes)."""
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=20_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "ndjson", "parquet"])
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", sqlite_url())
+
+    from benchmarks.seed import seed_database
+    from database import engine
+    from export import EXPORT_BATCH_SIZE, LAYOUTS, export_chunks, parquet_available
+    from migrations import migrate
+
+    migrate(engine)
+    seed_database(engine, args.accounts)
+    today = date.today()
+
+    print(f"{args.accounts:,} loans, windows of {EXPORT_BATCH_SIZE} loans")
+    print(f"{'format':<8} {'layout':<6} {'first ms':>9} {'seconds':>8} {'loans/s':>9} {'MB':>8} {'peak MB':>8}")
+    for fmt in args.formats:
+        if fmt == "parquet" and not parquet_available():
+            print(f"{fmt:<8} skipped: pyarrow is not installed")
+            continue
+        for layout in LAYOUTS:
+            first, seconds, size = _consume(export_chunks(engine, fmt, layout, today))
+            tracemalloc.start()
+            _consume(export_chunks(engine, fmt, layout, today))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{fmt:<8} {layout:<6} {first * 1000:>9.1f} {seconds:>8.2f} "
+                f"{args.accounts / seconds:>9,.0f} {size / 1e6:>8.1f} {peak / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
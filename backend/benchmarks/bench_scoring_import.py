@@ -0,0 +1,67 @@
+# backend/benchmarks/bench_scoring_import.py
+"""Scoring CSV import throughput (rows/sec): per-row upserts vs batched upserts.
+
+Each size is imported twice per batch size: into an empty scoring_table
+(inserts) and again over the same rows (updates).
+
+Run from backend/:  python -m benchmarks.bench_scoring_import
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import sqlite_url
+
+
+def write_scores_csv(path: str, rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(0, 1300, size=rows).round(6)
+    pd.DataFrame({"PointScore": scores, "Percentage": np.minimum(scores / 1200, 1).round(4)}).to_csv(
+        path, index=False
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or sqlite_url()
+
+    from database import Base, engine
+    from import_scoring_from_csv import import_scoring
+    from sqlalchemy import text
+
+    Base.metadata.create_all(bind=engine)
+    directory = tempfile.mkdtemp(prefix="aidmakers-bench-")
+
+    print(f"{'rows':>8} {'batch':>6} {'insert rows/s':>14} {'update rows/s':>14}")
+    for size in args.sizes:
+        path = os.path.join(directory, f"scores_{size}.csv")
+        write_scores_csv(path, size)
+
+        for batch_size in args.batch_sizes:
+            with engine.begin() as conn:
+                conn.execute(text("DELETE FROM scoring_table"))
+
+            rates = []
+            for _ in ("insert", "update"):
+                start = time.perf_counter()
+                # Silence the per-chunk progress lines
+                with contextlib.redirect_stdout(io.StringIO()):
+                    import_scoring(batch_size=batch_size, path=path)
+                rates.append(size / (time.perf_counter() - start))
+
+            print(f"{size:>8} {batch_size:>6} {rates[0]:>14,.0f} {rates[1]:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# backend/benchmarks/bench_serialisation.py
+"""Cost of serialising 10k scoring rows: response_model validation vs the orjson fast path.
+
+- orm + response_model: ORM objects validated into list[ScoringOut], dumped
+  to JSON-able data and rendered with json.dumps (FastAPI's default path)
+- rows + orjson: row tuples turned into dicts and rendered by
+  FastJSONResponse, as /api/scoring does now
+
+No database or HTTP is involved; rows are built in memory.
+
+Run from backend/:  python -m benchmarks.bench_serialisation
+"""
+import argparse
+import json
+import os
+import time
+from decimal import Decimal
+
+from benchmarks.common import sqlite_url
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", sqlite_url())
+
+    from models import Scoring, ScoringOut
+    from pydantic import TypeAdapter
+    from responses import FastJSONResponse
+
+    scores = [Decimal(f"{(i * 37) % 1200}.50") for i in range(args.rows)]
+    orm_rows = [
+        Scoring(id=i + 1, user_id=i + 101, point_score=score, percentage=Decimal("0.7512"))
+        for i, score in enumerate(scores)
+    ]
+    tuples = [(i + 1, i + 101, score, Decimal("0.7512")) for i, score in enumerate(scores)]
+    adapter = TypeAdapter(list[ScoringOut])
+
+    def response_model_path():
+        validated = adapter.validate_python(orm_rows, from_attributes=True)
+        data = adapter.dump_python(validated, mode="json")
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def fast_path():
+        content = [
+            {"user_id": user_id, "point_score": point_score, "percentage": percentage}
+            for _, user_id, point_score, percentage in tuples
+        ]
+        return FastJSONResponse(content).body
+
+    assert json.loads(response_model_path()) == json.loads(fast_path())
+
+    per_10k = 10_000 / args.rows
+    print(f"{'path':<24} {'ms per 10k rows':>16}")
+    for name, func in (("orm + response_model", response_model_path), ("rows + orjson", fast_path)):
+        print(f"{name:<24} {_best_of(args.repeat, func) * 1000 * per_10k:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
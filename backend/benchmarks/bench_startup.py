@@ -0,0 +1,133 @@
+# backend/benchmarks/bench_startup.py
+"""Cold start: `import main` time (-X importtime) and time to the first response.
+
+- import: median wall time of `python -X importtime -c "import main"` as
+  reported for main itself, plus the heaviest modules main imports directly;
+- first response: from spawning uvicorn to the first 200 on /;
+- no DB on import: main is imported with a DATABASE_URL that cannot be
+  opened, which fails if startup touches the database.
+
+Run from backend/:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --out /tmp/startup.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, sqlite_url
+
+# "import time:  self [us] | cumulative | imported package", nesting shown by indentation
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _run_import(env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def import_profile(env: dict) -> dict:
+    """Cumulative import time of main and of each module it imports directly, in ms."""
+    result = _run_import(env)
+    if result.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{result.stderr[-2000:]}")
+
+    # A module's line comes after those of the modules it imports
+    modules = children = {}
+    total = None
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if not indent:
+            if name == "main":
+                total, modules = int(cumulative) / 1000, children
+            children = {}
+        elif len(indent) == 2:
+            children[name] = int(cumulative) / 1000
+    if total is None:
+        raise RuntimeError("no importtime line for main")
+    return {"import_ms": total, "modules": modules}
+
+
+def first_response_seconds(env: dict, port: int) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+    )
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.perf_counter() - start > 60:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def imports_without_db() -> bool:
+    """True if main imports while its database cannot be opened."""
+    missing = os.path.join(tempfile.mkdtemp(prefix="aidmakers-bench-"), "missing", "bench.db")
+    return _run_import({"DATABASE_URL": f"sqlite:///{missing}"}).returncode == 0
+
+
+def measure_startup(repeat: int = 5, port: int = 8766, top: int = 8) -> dict:
+    env = {"DATABASE_URL": sqlite_url()}
+    profiles = [import_profile(env) for _ in range(repeat)]
+    first_responses = [first_response_seconds(env, port) for _ in range(repeat)]
+
+    modules = {
+        name: statistics.median(profile["modules"].get(name, 0.0) for profile in profiles)
+        for name in profiles[0]["modules"]
+    }
+    heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_ms": round(statistics.median(p["import_ms"] for p in profiles), 1),
+        "first_response_ms": round(statistics.median(first_responses) * 1000, 1),
+        "no_db_on_import": imports_without_db(),
+        "heaviest_imports_ms": {name: round(ms, 1) for name, ms in heaviest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    result = measure_startup(args.repeat, args.port)
+    print(f"{'import main':<24} {result['import_ms']:>8.1f} ms")
+    print(f"{'first response':<24} {result['first_response_ms']:>8.1f} ms")
+    print(f"{'no DB on import':<24} {'yes' if result['no_db_on_import'] else 'NO':>8}")
+    for name, ms in result["heaviest_imports_ms"].items():
+        print(f"  {name:<22} {ms:>8.1f} ms")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    sys.exit(0 if result["no_db_on_import"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_workers.py
+"""Read endpoint throughput as gunicorn workers go from 1 to N (gunicorn.conf.py).
+
+Each worker count serves the same seeded SQLite file. Load comes from
+several client processes so the load generator is not the bottleneck;
+give the machine at least as many cores as workers plus client processes.
+
+Run from backend/:
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --workers 1 2 4 8 --client-processes 4
+"""
+import argparse
+import os
+
+from benchmarks.bench_async_reads import READ_PATHS
+from benchmarks.common import gunicorn_server, run_load_processes, sqlite_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--client-processes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64, help="total, across client processes")
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = sqlite_url()
+    os.environ["DATABASE_URL"] = url
+
+    from benchmarks.seed import seed_database
+    from database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, args.accounts)
+
+    paths = [
+        path.format(id=(i * 7919) % args.accounts + 1)
+        for i in range(args.accounts)
+        for path in READ_PATHS
+    ]
+
+    print(f"{'workers':>7} {'rps':>8} {'scaling':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    baseline = None
+    for workers in args.workers:
+        # Default pool settings in each worker
+        env = {"DATABASE_URL": url}
+        with gunicorn_server(env, args.port, workers) as base_url:
+            # Warm every worker's caches and imports before measuring
+            run_load_processes(base_url, paths, args.concurrency, args.requests // 4, args.client_processes)
+            result = run_load_processes(
+                base_url, paths, args.concurrency, args.requests, args.client_processes
+            )
+        baseline = baseline or result["rps"]
+        print(
+            f"{workers:>7} {result['rps']:>8} {result['rps'] / baseline:>7.2f}x "
+            f"{result['p50_ms']:>8} {result['p99_ms']:>8} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
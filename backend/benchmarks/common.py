@@ -0,0 +1,151 @@
+# backend/benchmarks/common.py
+"""Helpers shared by the HTTP benchmarks: local uvicorn/gunicorn servers and a load generator."""
+import asyncio
+import contextlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sqlite_url(directory: str | None = None) -> str:
+    """URL of a fresh SQLite file for a benchmark run."""
+    directory = directory or tempfile.mkdtemp(prefix="aidmakers-bench-")
+    return f"sqlite:///{os.path.join(directory, 'bench.db')}"
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+@contextlib.contextmanager
+def _server(command: list, env: dict, port: int):
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **env})
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"{command[2]} did not start")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def uvicorn_server(env: dict, port: int, extra_args: tuple = ()):
+    """Run `uvicorn main:app` from backend/ with `env` until the block exits."""
+    return _server(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", *extra_args],
+        env,
+        port,
+    )
+
+
+def gunicorn_server(env: dict, port: int, workers: int):
+    """Run `gunicorn main:app -c gunicorn.conf.py` with `workers` workers until the block exits."""
+    return _server(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+        {**env, "WEB_WORKERS": str(workers)},
+        port,
+    )
+
+
+async def _load(
+    base_url: str,
+    paths: list,
+    concurrency: int,
+    requests: int,
+    method: str,
+    body: dict | None,
+    headers: dict | None = None,
+) -> tuple:
+    """(latencies, errors, elapsed seconds) for one load run."""
+    latencies: list = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, paths[i % len(paths)], json=body, headers=headers)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, errors, elapsed
+
+
+def _summary(requests: int, latencies: list, errors: int, elapsed: float) -> dict:
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def run_load(
+    base_url: str,
+    paths: list,
+    concurrency: int,
+    requests: int,
+    method: str = "GET",
+    body: dict | None = None,
+    headers: dict | None = None,
+) -> dict:
+    """Issue `requests` requests over `paths` from `concurrency` concurrent clients.
+
+    `body`, if given, is sent as JSON with every request, and so are `headers`.
+    """
+    return _summary(
+        requests, *asyncio.run(_load(base_url, paths, concurrency, requests, method, body, headers))
+    )
+
+
+def _load_in_process(args: tuple) -> tuple:
+    return asyncio.run(_load(*args))
+
+
+def run_load_processes(base_url: str, paths: list, concurrency: int, requests: int, processes: int) -> dict:
+    """run_load() for GETs, split across `processes` client processes.
+
+    One Python client saturates a core long before several server workers do.
+    """
+    share = requests // processes
+    jobs = [(base_url, paths, max(1, concurrency // processes), share, "GET", None)] * processes
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(_load_in_process, jobs))
+    latencies = [latency for result in results for latency in result[0]]
+    errors = sum(result[1] for result in results)
+    # The processes run side by side, so the slowest one bounds the run
+    return _summary(share * processes, latencies, errors, max(result[2] for result in results))
@@ -0,0 +1,82 @@
+# backend/benchmarks/compare.py
+"""Compare two benchmark suite results (see suite.py) and flag regressions.
+
+Throughput (requests/s, import rows/s) should not drop, and p99 latency and
+startup times should not rise, by more than --threshold percent; the exit
+code is 1 if any did.
+
+Run from backend/:
+    python -m benchmarks.compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+import argparse
+import json
+import sys
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def _metrics(run: dict):
+    """(section, name, metric, value, higher_is_better) for one scale's run."""
+    for name, result in run.get("http", {}).items():
+        yield "http", name, "rps", result["rps"], True
+        yield "http", name, "p99_ms", result["p99_ms"], False
+    for name, result in run.get("imports", {}).items():
+        yield "imports", name, "rows_per_sec", result["rows_per_sec"], True
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """Print a comparison table; returns the number of regressions."""
+    print(f"old: {old['meta']['commit']}  new: {new['meta']['commit']}")
+    print(f"{'borrowers':>10} {'benchmark':<46} {'metric':<13} {'old':>10} {'new':>10} {'change':>8}")
+
+    regressions = 0
+    if "startup" in old and "startup" in new:
+        for metric in ("import_ms", "first_response_ms"):
+            previous, value = old["startup"][metric], new["startup"][metric]
+            change = _change(previous, value)
+            flag = " !" if change > threshold else ""
+            regressions += bool(flag)
+            print(f"{'-':>10} {'startup':<46} {metric:<13} {previous:>10,.1f} {value:>10,.1f} {change:>+7.1f}%{flag}")
+
+    old_runs = {run["accounts"]: run for run in old["runs"]}
+    for run in new["runs"]:
+        baseline = old_runs.get(run["accounts"])
+        if baseline is None:
+            continue
+        before = {(section, name, metric): value for section, name, metric, value, _ in _metrics(baseline)}
+        for section, name, metric, value, higher_is_better in _metrics(run):
+            previous = before.get((section, name, metric))
+            if previous is None:
+                continue
+            change = _change(previous, value)
+            worse = -change if higher_is_better else change
+            flag = " !" if worse > threshold else ""
+            regressions += bool(flag)
+            print(
+                f"{run['accounts']:>10,} {name:<46} {metric:<13} "
+                f"{previous:>10,.1f} {value:>10,.1f} {change:>+7.1f}%{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    regressions = compare(old, new, args.threshold)
+    print(f"{regressions} regression(s) beyond {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# backend/benchmarks/seed.py
+"""Synthetic accounts, loans, repayments and scores shaped like the microloans CSV.
+
+Every account gets one 12-month loan of £50/£100/£150 starting on the 7th of
+a month in 2025, with a mix of on-time, late, missed and upcoming
+repayments, plus a scoring_table row. csv_shape() measures the amount mix
+and repayment outcomes of a real export so the synthetic data follows it;
+write_loans_csv() produces files in the same layout for the importers.
+"""
+import os
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import models
+from loan_status import rebuild_loan_status
+
+BATCH_SIZE = 5000
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "microloans_500(Sheet1).csv",
+)
+
+
+class SeedShape(NamedTuple):
+    amounts: tuple
+    amount_p: tuple
+    # Share of past-due repayments that are paid on time / paid late / never paid
+    on_time: float
+    late: float
+    missed: float
+    max_days_late: int
+
+
+DEFAULT_SHAPE = SeedShape((50, 100, 150), (0.3, 0.5, 0.2), 0.8, 0.12, 0.08, 19)
+
+
+def csv_shape(path: str = SAMPLE_CSV, today: date | None = None) -> SeedShape:
+    """Loan amount mix and repayment outcomes of a microloans-layout CSV."""
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    today = pd.Timestamp(today or date.today())
+    amounts = df["Loan amount"].value_counts(normalize=True).sort_index()
+
+    on_time = late = missed = 0
+    days_late = [1]
+    for month in range(1, 13):
+        agreed = pd.to_datetime(df[f"Month{month}_AgreedDate"], errors="coerce")
+        actual = pd.to_datetime(df[f"Month{month}_ActualDate"], errors="coerce")
+        delay = (actual - agreed).dt.days
+        on_time += int((delay <= 0).sum())
+        late += int((delay > 0).sum())
+        missed += int((actual.isna() & (agreed < today)).sum())
+        days_late += delay[delay > 0].astype(int).tolist()
+
+    outcomes = max(on_time + late + missed, 1)
+    return SeedShape(
+        amounts=tuple(int(amount) for amount in amounts.index),
+        amount_p=tuple(float(p) for p in amounts.to_numpy()),
+        on_time=on_time / outcomes,
+        late=late / outcomes,
+        missed=missed / outcomes,
+        max_days_late=max(days_late),
+    )
+
+
+def _months_after(start: date, months: int) -> date:
+    year, month = divmod(start.month - 1 + months, 12)
+    return start.replace(year=start.year + year, month=month + 1)
+
+
+def _insert(conn, model, rows: list):
+    for i in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(model), rows[i : i + BATCH_SIZE])
+
+
+def seed_database(
+    engine,
+    accounts: int,
+    seed: int = 42,
+    today: date | None = None,
+    shape: SeedShape = DEFAULT_SHAPE,
+):
+    """Insert `accounts` synthetic borrowers (user_id / loan_id 1..N)."""
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    ids = np.arange(1, accounts + 1)
+
+    amounts = rng.choice(shape.amounts, size=accounts, p=shape.amount_p)
+    start_offsets = rng.integers(0, 12, size=accounts)
+    starts = [_months_after(date(2025, 1, 7), int(n)) for n in range(12)]
+
+    with engine.begin() as conn:
+        for lo in range(0, accounts, BATCH_SIZE):
+            chunk = ids[lo : lo + BATCH_SIZE]
+            _insert(
+                conn,
+                models.Account,
+                [
+                    {
+                        "user_id": int(uid),
+                        "full_name": f"Borrower {uid}",
+                        "dob": date(1990, 1, 1),
+                        "age": 35,
+                        "address": f"{uid % 200 + 1} High Street, Leeds, UK",
+                        "phone_number": f"+447{uid:09d}",
+                        "email": f"borrower{uid}@example.com",
+                        "job_title": "Unknown",
+                        "monthly_income": 1500,
+                        "house_rent": 600,
+                    }
+                    for uid in chunk
+                ],
+            )
+            _insert(
+                conn,
+                models.Loan,
+                [
+                    {
+                        "loan_id": int(uid),
+                        "account_id": int(uid),
+                        "original_amount": int(amounts[uid - 1]),
+                        "start_date": starts[start_offsets[uid - 1]],
+                        "term_months": 12,
+                    }
+                    for uid in chunk
+                ],
+            )
+
+            # 12 repayments per loan, outcome drawn per month
+            n = len(chunk)
+            outcome = rng.choice(3, size=(n, 12), p=[shape.on_time, shape.late, shape.missed])
+            days_late = rng.integers(1, shape.max_days_late + 1, size=(n, 12))
+            repayments = []
+            for row, uid in enumerate(chunk):
+                start = starts[start_offsets[uid - 1]]
+                monthly = round(float(amounts[uid - 1]) / 12, 2)
+                for month in range(12):
+                    agreed = _months_after(start, month)
+                    actual = None
+                    if agreed <= today and outcome[row, month] != 2:
+                        actual = agreed + timedelta(days=int(days_late[row, month]) * int(outcome[row, month]))
+                    repayments.append(
+                        {
+                            "loan_id": int(uid),
+                            "month_number": month + 1,
+                            "agreed_date": agreed,
+                            "actual_date": actual,
+                            "amount_repaid": monthly if actual else None,
+                        }
+                    )
+            _insert(conn, models.LoanRepayment, repayments)
+
+            scores = rng.uniform(0, 1200, size=n).round(2)
+            _insert(
+                conn,
+                models.Scoring,
+                [
+                    {"user_id": int(uid), "point_score": float(score), "percentage": float(score / 1200)}
+                    for uid, score in zip(chunk, scores)
+                ],
+            )
+
+    with Session(engine) as session:
+        rebuild_loan_status(session)
+
+
+def write_loans_csv(
+    path: str,
+    rows: int,
+    seed: int = 42,
+    today: date | None = None,
+    shape: SeedShape = DEFAULT_SHAPE,
+    prefix: str = "bench",
+):
+    """A microloans-layout CSV of `rows` new borrowers, for the import benchmarks."""
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    ids = np.arange(1, rows + 1)
+    amounts = rng.choice(shape.amounts, size=rows, p=shape.amount_p)
+    starts = [_months_after(date(2025, 1, 7), int(n)) for n in rng.integers(0, 12, size=rows)]
+    outcome = rng.choice(3, size=(rows, 12), p=[shape.on_time, shape.late, shape.missed])
+    days_late = rng.integers(1, shape.max_days_late + 1, size=(rows, 12))
+
+    columns = {
+        "Name": [f"{prefix.title()} Borrower {i}" for i in ids],
+        "Address": [f"{i % 200 + 1} Mill Road, York, UK" for i in ids],
+        "Contact number": [f"+447{i:09d}" for i in ids],
+        "email": [f"{prefix}{i}@example.com" for i in ids],
+        "Loan amount": amounts,
+    }
+    for month in range(12):
+        agreed, actual, repaid = [], [], []
+        for row in range(rows):
+            due = _months_after(starts[row], month)
+            paid = None
+            if due <= today and outcome[row, month] != 2:
+                paid = due + timedelta(days=int(days_late[row, month]) * int(outcome[row, month]))
+            agreed.append(due.isoformat())
+            actual.append(paid.isoformat() if paid else None)
+            repaid.append(round(float(amounts[row]) / 12, 2) if paid else None)
+        columns[f"Month{month + 1}_AgreedDate"] = agreed
+        columns[f"Month{month + 1}_ActualDate"] = actual
+        columns[f"Month{month + 1}_AmountRepaid"] = repaid
+
+    pd.DataFrame(columns).to_csv(path, index=False)
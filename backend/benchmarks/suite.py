@@ -0,0 +1,215 @@
+# backend/benchmarks/suite.py
+"""Benchmark suite: API load and CSV import throughput per data scale, as JSON.
+
+For every scale the schema is dropped and recreated, then seeded with that
+many synthetic borrowers shaped like data/microloans_500(Sheet1).csv (see
+seed.csv_shape), and measured:
+
+- each endpoint in ENDPOINTS under --concurrency clients through a local
+  uvicorn server: requests/s, p50 and p99 latency, errors;
+- each CSV importer on generated microloans-layout files: rows/s. The bulk
+  loan import, the account sync and the scoring import get --import-rows
+  rows; the per-row loan import gets --per-row-rows (it is much slower).
+
+Cold start (import time of main and time to the first response, see
+bench_startup.py) is measured once per run.
+
+Runs offline against a fresh SQLite file, or a local MySQL container given
+with --database-url. Results go to --out (default
+benchmarks/results/<commit>.json). Compare two runs with
+    python -m benchmarks.compare old.json new.json
+
+Run from backend/:
+    python -m benchmarks.suite                      # 1k, 100k and 1M borrowers
+    python -m benchmarks.suite --scales 1k --requests 500 --out /tmp/quick.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import BACKEND_DIR, run_load, sqlite_url, uvicorn_server
+
+# name -> (method, path; {id} is replaced by seeded user ids)
+ENDPOINTS = {
+    "GET /api/accounts/{user_id}": ("GET", "/api/accounts/{id}"),
+    "GET /api/accounts/{user_id}/loan-summary": ("GET", "/api/accounts/{id}/loan-summary"),
+    "GET /api/accounts/{user_id}/payment-history": ("GET", "/api/accounts/{id}/payment-history"),
+    "GET /api/scoring": ("GET", "/api/scoring?limit=100"),
+    "POST /api/apply": ("POST", "/api/apply"),
+}
+
+APPLICATION = {
+    "fullName": "Bench Applicant",
+    "dob": "1990-01-01",
+    "email": "applicant@example.com",
+    "phone": "+447000000000",
+    "monthlyIncome": 1500,
+    "houseRent": 600,
+    "referenceName": "Ref Person",
+    "referenceRelationship": "Friend",
+    "referencePhone": "+447000000001",
+}
+
+# Distinct user ids the GET endpoints cycle through
+MAX_IDS = 10_000
+
+
+def parse_scale(value: str) -> int:
+    """'1000', '1k' or '1M' -> 1000, 1000, 1000000."""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = value[-1:].lower()
+    if suffix in multipliers:
+        return int(float(value[:-1]) * multipliers[suffix])
+    return int(value)
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_metadata(database_url: str, args) -> dict:
+    from sqlalchemy import make_url
+
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "database": make_url(database_url).get_backend_name(),
+        "settings": {
+            name: os.environ[name]
+            for name in ("DB_ASYNC", "CACHE_BACKEND", "APPLY_QUEUE", "METRICS_ENABLED")
+            if name in os.environ
+        },
+        "args": {key: value for key, value in vars(args).items() if key != "database_url"},
+    }
+
+
+def reset_database(engine):
+    from database import Base
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def bench_http(url: str, accounts: int, args) -> dict:
+    ids = [(i * 7919) % accounts + 1 for i in range(min(accounts, MAX_IDS))]
+    # The shipped pool defaults, so results match a default deployment
+    env = {"DATABASE_URL": url}
+
+    results = {}
+    with uvicorn_server(env, args.port) as base_url:
+        for name, (method, template) in ENDPOINTS.items():
+            paths = [template.format(id=user_id) for user_id in ids] if "{id}" in template else [template]
+            body = APPLICATION if method == "POST" else None
+            if args.warmup:
+                run_load(base_url, paths, args.concurrency, args.warmup, method, body)
+            results[name] = run_load(base_url, paths, args.concurrency, args.requests, method, body)
+            results[name]["concurrency"] = args.concurrency
+    return results
+
+
+def _timed_import(func, rows: int, **kwargs) -> dict:
+    start = time.perf_counter()
+    # The importers print per chunk (and per row on the per-row path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(**kwargs)
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": round(seconds, 3), "rows_per_sec": round(rows / seconds, 1)}
+
+
+def bench_imports(directory: str, shape, args) -> dict:
+    from benchmarks.bench_scoring_import import write_scores_csv
+    from benchmarks.seed import write_loans_csv
+    from import_loans_from_csv import import_loans_from_csv
+    from import_scoring_from_csv import import_scoring
+    from update_accounts_from_csv import update_accounts_from_csv
+
+    bulk_csv = os.path.join(directory, "loans_bulk.csv")
+    per_row_csv = os.path.join(directory, "loans_per_row.csv")
+    scores_csv = os.path.join(directory, "scores.csv")
+    write_loans_csv(bulk_csv, args.import_rows, shape=shape, prefix="bulk")
+    write_loans_csv(per_row_csv, args.per_row_rows, shape=shape, prefix="perrow")
+    write_scores_csv(scores_csv, args.import_rows)
+
+    return {
+        "loans (bulk)": _timed_import(import_loans_from_csv, args.import_rows, bulk=True, path=bulk_csv),
+        "loans (per row)": _timed_import(import_loans_from_csv, args.per_row_rows, path=per_row_csv),
+        # Same borrowers as the bulk file, so every row updates an existing account
+        "accounts": _timed_import(update_accounts_from_csv, args.import_rows, path=bulk_csv),
+        "scoring": _timed_import(import_scoring, args.import_rows, path=scores_csv),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=parse_scale, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="per endpoint")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests per endpoint")
+    parser.add_argument("--import-rows", type=int, default=10_000)
+    parser.add_argument("--per-row-rows", type=int, default=1_000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--skip-imports", action="store_true")
+    parser.add_argument("--skip-startup", action="store_true")
+    parser.add_argument("--out", help="JSON results file (default benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    url = args.database_url or sqlite_url()
+    os.environ["DATABASE_URL"] = url
+
+    from benchmarks.seed import csv_shape, seed_database
+    from database import engine
+
+    shape = csv_shape()
+    results = {"meta": run_metadata(url, args), "shape": shape._asdict(), "runs": []}
+
+    if not args.skip_startup:
+        from benchmarks.bench_startup import measure_startup
+
+        print("[STARTUP]", file=sys.stderr)
+        results["startup"] = measure_startup(repeat=3, port=args.port)
+
+    for accounts in args.scales:
+        print(f"[SEED] {accounts:,} borrowers", file=sys.stderr)
+        reset_database(engine)
+        start = time.perf_counter()
+        seed_database(engine, accounts, shape=shape)
+        run = {"accounts": accounts, "seed_seconds": round(time.perf_counter() - start, 1)}
+
+        if not args.skip_http:
+            print(f"[HTTP] {accounts:,} borrowers", file=sys.stderr)
+            run["http"] = bench_http(url, accounts, args)
+        if not args.skip_imports:
+            print(f"[IMPORT] {accounts:,} borrowers", file=sys.stderr)
+            run["imports"] = bench_imports(tempfile.mkdtemp(prefix="aidmakers-bench-"), shape, args)
+        results["runs"].append(run)
+
+    engine.dispose()
+    out = args.out or os.path.join(BACKEND_DIR, "benchmarks", "results", f"{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"✅ Results written to {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
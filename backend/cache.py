@@ -0,0 +1,196 @@
+# backend/cache.py
+"""Read-through cache for loan data, invalidated when loans or repayments are written.
+
+Keys:
+  latest-loan:{user_id}  -> loan_id of the account's most recent loan
+  loan:{loan_id}         -> the loan's LoanSchedule (no date-dependent status)
+  portfolio              -> admin portfolio figures and the date they were computed for
+
+CACHE_BACKEND selects the store: "memory" (default, per-process TTL + LRU),
+"redis" (shared between workers and the import scripts, needs a Redis server
+at CACHE_URL, e.g. `docker compose --profile broker up`) or "none".
+
+The session hooks below only see this process's writes. A per-process
+cache also drops everything when the "loans" change counter (versions.py)
+moves, so writes by other workers and the import scripts are not served
+from it under the newer ETag.
+"""
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+_PENDING = "cache_invalidations"
+
+PORTFOLIO_KEY = "portfolio"
+
+
+class MemoryCache:
+    """Thread-safe in-process cache with a per-entry TTL and LRU eviction."""
+
+    shared = False
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """Shared cache in Redis; values are pickled, so only use a trusted instance."""
+
+    prefix = "aidmakers:"
+    # Every writer invalidates it through mark_stale() and the session hooks
+    shared = True
+
+    def __init__(self, url: str, ttl: float):
+        import redis
+
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        raw = self._client.get(self.prefix + key)
+        return None if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value):
+        self._client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(self.ttl)))
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+
+class NullCache:
+    shared = True
+
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value):
+        pass
+
+    def delete(self, *keys: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+def _create_cache():
+    if CACHE_BACKEND == "redis":
+        return RedisCache(CACHE_URL, CACHE_TTL_SECONDS)
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    return MemoryCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+
+cache = _create_cache()
+
+# The "loans" change counter version this process's entries were cached under
+_loans_version = None
+_loans_version_lock = threading.Lock()
+
+
+def sync_loans_version(version: int):
+    """Clear a per-process cache if the loans counter moved since it was last seen.
+
+    versions.py calls this with every counter read, before a handler reads
+    the cache. This process's own commits move it too.
+    """
+    global _loans_version
+    if cache.shared:
+        return
+    with _loans_version_lock:
+        if _loans_version is not None and version != _loans_version:
+            cache.clear()
+        _loans_version = version
+
+
+def latest_loan_key(user_id: int) -> str:
+    return f"latest-loan:{user_id}"
+
+
+def loan_key(loan_id: int) -> str:
+    return f"loan:{loan_id}"
+
+
+def mark_stale(session: Session, user_ids=(), loan_ids=()):
+    """Invalidate these accounts' / loans' entries once `session` commits.
+
+    For writes the ORM hooks below cannot see, such as Core bulk inserts.
+    """
+    pending = session.info.setdefault(_PENDING, set())
+    pending.update(latest_loan_key(int(user_id)) for user_id in user_ids)
+    pending.update(loan_key(int(loan_id)) for loan_id in loan_ids)
+    if pending:
+        pending.add(PORTFOLIO_KEY)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    pending = session.info.setdefault(_PENDING, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table == "loans":
+            pending.add(latest_loan_key(obj.account_id))
+            pending.add(loan_key(obj.loan_id))
+            pending.add(PORTFOLIO_KEY)
+        elif table == "loan_repayments":
+            pending.add(loan_key(obj.loan_id))
+            pending.add(PORTFOLIO_KEY)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    keys = session.info.pop(_PENDING, None)
+    if keys:
+        cache.delete(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,173 @@
+# backend/csv_ingest.py
+"""Streaming CSV ingestion shared by the import scripts.
+
+Files are read in fixed-size chunks with explicit dtypes, each chunk is
+committed together with a checkpoint row, and an interrupted import resumes
+after the last committed chunk when it is re-run on the same file.
+"""
+import os
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+import versions  # noqa: F401  (imported rows bump the change counters)
+from metrics import METRICS_ENABLED, instrument_engine, query_totals
+
+# Rows per chunk: bounds memory and transaction size
+CHUNK_SIZE = 5000
+
+# Explicit dtypes for the microloans layout, so every chunk parses the same way
+# (pandas would otherwise infer types chunk by chunk).
+LOAN_CSV_DTYPES = {
+    "Name": str,
+    "Address": str,
+    "Contact number": str,
+    "email": str,
+    "Loan amount": "float64",
+}
+for _month in range(1, 13):
+    LOAN_CSV_DTYPES[f"Month{_month}_AgreedDate"] = str
+    LOAN_CSV_DTYPES[f"Month{_month}_ActualDate"] = str
+    LOAN_CSV_DTYPES[f"Month{_month}_AmountRepaid"] = "float64"
+
+SCORING_CSV_DTYPES = {
+    "PointScore": "float64",
+    "Percentage": "float64",
+}
+
+ACCOUNT_TEXT_COLUMNS = ["Name", "Address", "Contact number", "email"]
+MONTH_DATE_COLUMNS = [
+    f"Month{month}_{field}"
+    for month in range(1, 13)
+    for field in ("AgreedDate", "ActualDate")
+]
+MONTH_AMOUNT_COLUMNS = [f"Month{month}_AmountRepaid" for month in range(1, 13)]
+
+
+# -------- Column-level normalisation --------
+
+def none_if_missing(series: pd.Series) -> pd.Series:
+    """Object series with NaN/NaT replaced by None, ready for the DB driver."""
+    return series.astype(object).where(series.notna(), None)
+
+
+def clean_text(series: pd.Series) -> pd.Series:
+    """Stripped strings, NaN as None."""
+    return none_if_missing(series.astype(str).str.strip().where(series.notna()))
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """'YYYY-MM-DD' strings to date objects; missing or malformed values become None."""
+    parsed = pd.to_datetime(series, format="%Y-%m-%d", errors="coerce")
+    return none_if_missing(parsed.dt.date.where(parsed.notna()))
+
+
+def parse_amounts(series: pd.Series) -> pd.Series:
+    """Numeric values as floats; missing or malformed values become None."""
+    return none_if_missing(pd.to_numeric(series, errors="coerce"))
+
+
+def normalise_frame(
+    df: pd.DataFrame,
+    text_cols: Iterable[str] = (),
+    date_cols: Iterable[str] = (),
+    amount_cols: Iterable[str] = (),
+) -> pd.DataFrame:
+    """Copy of `df` with the given columns normalised whole-column at a time.
+
+    Columns that are not in the frame are skipped.
+    """
+    df = df.copy()
+    for cols, convert in (
+        (text_cols, clean_text),
+        (date_cols, parse_dates),
+        (amount_cols, parse_amounts),
+    ):
+        for col in cols:
+            if col in df.columns:
+                df[col] = convert(df[col])
+    return df
+
+
+def _fingerprint(path: str) -> str:
+    """Identify a file version so a checkpoint is never applied to a different file."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def ingest_csv(
+    engine,
+    path: str,
+    source: str,
+    handle_chunk: Callable[[Session, pd.DataFrame], object],
+    checkpoint_model,
+    required_cols: Iterable[str] = (),
+    dtype: Optional[dict] = None,
+    chunksize: int = CHUNK_SIZE,
+    encoding: str = "utf-8-sig",
+) -> int:
+    """Feed `path` to `handle_chunk` chunk by chunk, committing after each one.
+
+    `checkpoint_model` is the ImportCheckpoint model; its row for `source`
+    records how many data rows are committed and is removed once the whole
+    file has been ingested. Chunk indexes are absolute row positions in the
+    file, also after a resume. Returns the number of rows ingested.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"CSV file not found at: {path}")
+
+    header = pd.read_csv(path, encoding=encoding, nrows=0)
+    for col in required_cols:
+        if col not in header.columns:
+            raise ValueError(f"Missing required column in CSV: {col}")
+
+    dtype = {col: kind for col, kind in (dtype or {}).items() if col in header.columns}
+    fingerprint = _fingerprint(path)
+    instrument_engine(engine)
+
+    with Session(engine) as session:
+        checkpoint = session.get(checkpoint_model, source)
+        if checkpoint is None or checkpoint.fingerprint != fingerprint:
+            if checkpoint is not None:
+                session.delete(checkpoint)
+                session.flush()
+            checkpoint = checkpoint_model(source=source, fingerprint=fingerprint, rows_done=0)
+            session.add(checkpoint)
+            session.commit()
+        elif checkpoint.rows_done:
+            print(f"[RESUME] {source}: skipping {checkpoint.rows_done} committed rows")
+
+        offset = start_offset = checkpoint.rows_done
+        started = time.perf_counter()
+        reader = pd.read_csv(
+            path,
+            encoding=encoding,
+            dtype=dtype,
+            chunksize=chunksize,
+            # header is line 0; data row n is line n + 1
+            skiprows=range(1, offset + 1),
+        )
+
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            queries_before, _ = query_totals()
+            handle_chunk(session, chunk)
+
+            offset += len(chunk)
+            checkpoint.rows_done = offset
+            checkpoint.updated_at = datetime.utcnow()
+            session.commit()
+            rate = (offset - start_offset) / max(time.perf_counter() - started, 1e-9)
+            progress = f"{rate:,.0f} rows/s"
+            if METRICS_ENABLED:
+                # Grows with the chunk's rows when something looks rows up one at a time
+                progress += f", {query_totals()[0] - queries_before} queries"
+            print(f"[CHUNK] {source}: {offset} rows committed ({progress})")
+
+        session.delete(checkpoint)
+        session.commit()
+
+    return offset
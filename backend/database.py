@@ -1,29 +1,226 @@
 # backend/database.py
+import logging
 import os
+import ssl
+import threading
+import time
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
 
+logger = logging.getLogger(__name__)
+
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "")
 DB_NAME = os.getenv("DB_NAME", "aidmakers_db")
 
-SQLALCHEMY_DATABASE_URL = (
+# DATABASE_URL overrides the MySQL settings above (e.g. sqlite:///./local.db)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL") or (
     f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?ssl_ca={os.getenv('SSL_CA')}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_echo():
+    """DB_ECHO: false (default), true (SQL statements) or debug (statements + rows)."""
+    value = os.getenv("DB_ECHO", "false").strip().lower()
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "on")
+
+
+# 10 kept open, up to 40 in all: one per sync handler thread (SYNC_THREADS)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle before MySQL's wait_timeout / proxies drop idle SSL connections
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_ECHO = _env_echo()
+# Serve the read endpoints from an AsyncEngine (needs aiomysql, or aiosqlite)
+DB_ASYNC = env_bool("DB_ASYNC", False)
+# Connections all API workers may hold together (keep below MySQL's max_connections); 0 = no cap
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+# API worker processes sharing that budget (gunicorn.conf.py sets this)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS") or "1")
+
+
+# Threads running sync handlers (anyio's default thread limiter, which FastAPI uses)
+SYNC_THREADS = 40
+
+
+def _pool_limits() -> tuple:
+    """(pool_size, max_overflow) for each engine in this process.
+
+    With DB_MAX_CONNECTIONS set, the budget is split between WEB_WORKERS
+    processes and, with DB_ASYNC, the sync and async engine of each, so
+    that pool_size + max_overflow summed over every engine of every worker
+    stays within it. A pool size of 0 or a negative overflow (unlimited in
+    SQLAlchemy) takes the whole share.
+    """
+    if not DB_MAX_CONNECTIONS:
+        return DB_POOL_SIZE, DB_MAX_OVERFLOW
+    engines = WEB_WORKERS * (2 if DB_ASYNC else 1)
+    budget = DB_MAX_CONNECTIONS // engines
+    if budget < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={DB_MAX_CONNECTIONS} is less than one connection for each of "
+            f"{engines} pools (WEB_WORKERS={WEB_WORKERS}, DB_ASYNC={DB_ASYNC})"
+        )
+    pool_size = min(DB_POOL_SIZE, budget) if DB_POOL_SIZE > 0 else budget
+    overflow = budget - pool_size
+    if DB_MAX_OVERFLOW >= 0:
+        overflow = min(DB_MAX_OVERFLOW, overflow)
+    return pool_size, overflow
+
+
+DB_POOL_LIMITS = _pool_limits()
+
+if DB_POOL_LIMITS[0] > 0 and DB_POOL_LIMITS[1] >= 0 and sum(DB_POOL_LIMITS) < SYNC_THREADS:
+    # Sync handlers beyond the pool's connections queue for up to DB_POOL_TIMEOUT
+    logger.warning(
+        "DB pool allows %d connections per engine (pool_size=%d, max_overflow=%d), fewer than "
+        "the %d threads running sync handlers: requests beyond that wait for a connection",
+        sum(DB_POOL_LIMITS),
+        *DB_POOL_LIMITS,
+        SYNC_THREADS,
+    )
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if url.startswith("sqlite") and make_url(url).database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection; only the shared settings apply
+        return kwargs
+    kwargs.update(
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_LIMITS[0],
+        max_overflow=DB_POOL_LIMITS[1],
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return kwargs
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_kwargs(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+def _async_url():
+    """ASYNC_DATABASE_URL, or the sync URL with its driver swapped for an async one."""
+    explicit = os.getenv("ASYNC_DATABASE_URL")
+    if explicit:
+        return make_url(explicit)
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    # aiomysql takes the CA as an SSLContext rather than a query parameter
+    return url.set(drivername="mysql+aiomysql", query={})
+
+
+def _create_async_engine():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = _async_url()
+    kwargs = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if url.get_backend_name() != "sqlite":
+        kwargs.update(
+            pool_size=DB_POOL_LIMITS[0],
+            max_overflow=DB_POOL_LIMITS[1],
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+        if os.getenv("SSL_CA"):
+            kwargs["connect_args"] = {"ssl": ssl.create_default_context(cafile=os.getenv("SSL_CA"))}
+    return create_async_engine(url, **kwargs)
+
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = _create_async_engine()
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+def dispose_after_fork():
+    """Give a forked process its own pools; connections opened by the parent are left to it."""
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+def pool_stats() -> dict:
+    """Current connection pool usage, for /health and capacity planning."""
+    pool = engine.pool
+    stats = {"pool": pool.__class__.__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, TimedQueuePool):
+        with pool._stats_lock:
+            checkouts = pool.checkouts
+            stats.update(
+                checkouts=checkouts,
+                wait_seconds_total=round(pool.wait_seconds_total, 6),
+                wait_seconds_avg=round(pool.wait_seconds_total / checkouts, 6)
+                if checkouts
+                else 0.0,
+                wait_seconds_max=round(pool.wait_seconds_max, 6),
+            )
+    return stats
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,212 @@
+# backend/decisions.py
+"""Automated decisions for pending loan applications, off the request path.
+
+An application shows financial strain when house_rent takes more than
+STRAIN_THRESHOLD of monthly_income (or there is no income). Strained
+applications go to manual review; the rest are approved at the tier their
+applicant's score allows (looked up by email through account_information):
+£150 from 90%, £100 from 75%, otherwise the £50 starter loan.
+
+A coordinator walks pending applications in id order and hands disjoint
+batches to a process pool, so throughput grows with cores and /api/apply
+never waits on a decision. Each batch is decided with NumPy and written
+back with one executemany; an application already decided is left alone.
+
+Run from backend/:
+    python decisions.py                 # decide everything pending, then exit
+    python decisions.py --watch         # keep polling for new applications
+    python decisions.py --workers 8 --batch-size 500
+"""
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+
+from database import SessionLocal, dispose_after_fork, engine
+from models import Account, LoanApplicationModel, Scoring
+
+BATCH_SIZE = 200
+POLL_SECONDS = 2.0
+
+STRAIN_THRESHOLD = 0.5
+STARTER_AMOUNT = 50
+# (minimum score percentage, loan amount), highest first
+TIERS = ((0.9, 150), (0.75, 100))
+
+DECISION_COLUMNS = ("decision", "tier_amount", "strain_ratio", "decided_at")
+
+
+def decide(applications: pd.DataFrame) -> pd.DataFrame:
+    """decision / tier_amount / strain_ratio for rows with monthly_income, house_rent, percentage."""
+    income = applications["monthly_income"].to_numpy(dtype="float64")
+    rent = applications["house_rent"].to_numpy(dtype="float64")
+    percentage = applications["percentage"].to_numpy(dtype="float64")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strain_ratio = np.where(income > 0, rent / income, np.inf)
+    strained = strain_ratio > STRAIN_THRESHOLD
+
+    # No score yet (NaN) compares False everywhere and gets the starter amount
+    tier_amount = np.select(
+        [percentage >= minimum for minimum, _ in TIERS],
+        [amount for _, amount in TIERS],
+        default=STARTER_AMOUNT,
+    ).astype("float64")
+
+    return pd.DataFrame(
+        {
+            "id": applications["id"].to_numpy(),
+            "decision": np.where(strained, "review", "approved"),
+            "tier_amount": np.where(strained, np.nan, tier_amount),
+            # Stored ratios are capped to fit the column; no income reads as 9999
+            "strain_ratio": np.minimum(strain_ratio, 9999).round(4),
+        }
+    )
+
+
+def _load_batch(db, ids: list) -> pd.DataFrame:
+    """The pending applications among `ids`, with their applicant's latest score percentage."""
+    apps = LoanApplicationModel
+    rows = db.execute(
+        select(apps.id, apps.email, apps.monthly_income, apps.house_rent).where(
+            apps.id.in_(ids), apps.decision == "pending"
+        )
+    ).all()
+    batch = pd.DataFrame(rows, columns=["id", "email", "monthly_income", "house_rent"])
+
+    emails = sorted({email for email in batch["email"] if email})
+    scores = db.execute(
+        select(Account.email, Scoring.percentage, Scoring.id)
+        .join(Scoring, Scoring.user_id == Account.user_id)
+        .where(Account.email.in_(emails))
+    ).all()
+    if scores:
+        latest = (
+            pd.DataFrame(scores, columns=["email", "percentage", "score_id"])
+            .sort_values("score_id")
+            .drop_duplicates("email", keep="last")[["email", "percentage"]]
+        )
+        batch = batch.merge(latest, on="email", how="left")
+    else:
+        batch["percentage"] = np.nan
+    return batch
+
+
+def decide_applications(ids: list) -> dict:
+    """Decide and store the still-pending applications among `ids`; counts by decision."""
+    table = LoanApplicationModel.__table__
+    statement = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"), table.c.decision == "pending")
+        .values({col: bindparam(f"b_{col}") for col in DECISION_COLUMNS})
+    )
+
+    with SessionLocal() as db:
+        batch = _load_batch(db, ids)
+        if batch.empty:
+            return {}
+        decided = decide(batch)
+        decided_at = datetime.utcnow()
+        params = [
+            {
+                "b_id": int(row.id),
+                "b_decision": row.decision,
+                "b_tier_amount": None if np.isnan(row.tier_amount) else row.tier_amount,
+                "b_strain_ratio": row.strain_ratio,
+                "b_decided_at": decided_at,
+            }
+            for row in decided.itertuples(index=False)
+        ]
+        db.connection().execute(statement, params)
+        db.commit()
+
+    return decided["decision"].value_counts().to_dict()
+
+
+def _init_worker():
+    # Connections inherited from the parent process must not be shared
+    dispose_after_fork()
+
+
+def _pending_batches(batch_size: int):
+    """Ids of pending applications, batch_size at a time, in id order."""
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            ids = (
+                db.execute(
+                    select(LoanApplicationModel.id)
+                    .where(LoanApplicationModel.decision == "pending", LoanApplicationModel.id > last_id)
+                    .order_by(LoanApplicationModel.id)
+                    .limit(batch_size)
+                )
+                .scalars()
+                .all()
+            )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def decision_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+
+def run_decisions(pool: ProcessPoolExecutor, workers: int, batch_size: int = BATCH_SIZE) -> dict:
+    """Decide every currently pending application on `pool`; counts by decision."""
+    totals: dict = {}
+
+    def collect(futures):
+        for future in futures:
+            for decision, count in future.result().items():
+                totals[decision] = totals.get(decision, 0) + count
+
+    in_flight = set()
+    for ids in _pending_batches(batch_size):
+        # Keep a couple of batches per worker queued, no more
+        if len(in_flight) >= workers * 2:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+        in_flight.add(pool.submit(decide_applications, ids))
+    collect(in_flight)
+    return totals
+
+
+def add_decision_columns(engine):
+    """Add the decision columns and index to a loan_applications table created before them."""
+    existing = {col["name"] for col in inspect(engine).get_columns("loan_applications")}
+    with engine.begin() as conn:
+        for name in DECISION_COLUMNS:
+            if name in existing:
+                continue
+            column = CreateColumn(LoanApplicationModel.__table__.c[name]).compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE loan_applications ADD COLUMN {column}"))
+        indexes = {index["name"] for index in inspect(conn).get_indexes("loan_applications")}
+        for index in LoanApplicationModel.__table__.indexes:
+            if index.name not in indexes and "decision" in index.columns:
+                index.create(conn)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Decide pending loan applications")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--watch", action="store_true", help="keep polling for new applications")
+    args = parser.parse_args()
+
+    add_decision_columns(engine)
+    with decision_pool(args.workers) as pool:
+        while True:
+            totals = run_decisions(pool, args.workers, args.batch_size)
+            if totals or not args.watch:
+                print(f"✅ Decided {sum(totals.values())} applications: {totals}")
+            if not args.watch:
+                break
+            time.sleep(POLL_SECONDS)
@@ -0,0 +1,354 @@
+# backend/events.py
+"""Live change events for admin dashboards, pushed as Server-Sent Events.
+
+GET /api/admin/events (admin token required, see admin.py) streams, as SSE `event:` types with JSON data
+{"count": n, "items": [...]} (items capped at EVENTS_MAX_ITEMS, count is
+the full number):
+  application.created   new loan_applications rows
+  repayment.recorded    repayments written with an actual_date
+  score.changed         scoring_table rows written
+  loan.overdue          Active loans whose next due date has just passed
+  resync                events were missed: refetch instead of patching
+
+Writes are collected per session like the cache invalidations: ORM changes
+by a flush hook, Core bulk writes through queue_events(). They are
+published once the session commits. Each process fans published events
+out from one EventBus to its connected streams, so clients never poll the
+database.
+
+The stream is off unless EVENTS_ENABLED is set. EVENTS_BACKEND selects how
+published events reach the bus: "memory" (default, events from this process
+only) or "redis" (pub/sub on EVENTS_URL shared by every gunicorn worker and
+the import scripts; needs a Redis server, e.g. `docker compose --profile
+broker up`).
+"""
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import date
+from itertools import chain
+from typing import Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+from database import SessionLocal, env_bool
+from models import Loan, LoanApplicationModel, LoanRepayment, Scoring
+from responses import dumps
+
+logger = logging.getLogger(__name__)
+
+EVENTS_ENABLED = env_bool("EVENTS_ENABLED", False)
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory").strip().lower()
+EVENTS_URL = os.getenv("EVENTS_URL") or os.getenv("CACHE_URL", "redis://localhost:6379/0")
+EVENTS_MAX_ITEMS = int(os.getenv("EVENTS_MAX_ITEMS", "100"))
+# Events a stream may fall behind by before it is sent `resync`
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+# Recent events replayed to a client reconnecting with Last-Event-ID
+EVENTS_REPLAY = int(os.getenv("EVENTS_REPLAY", "256"))
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+
+EVENTS_PATH = "/api/admin/events"
+
+_PENDING = "pending_events"
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Subscription:
+    """One stream's queue of SSE messages, filled on its event loop."""
+
+    __slots__ = ("loop", "queue")
+
+    def __init__(self, loop, size: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(size)
+
+    def put(self, message: bytes):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop what it has not read and have it refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> bytes:
+        return await self.queue.get()
+
+
+class EventBus:
+    """Hands each event to every subscription; deliver() may be called from any thread."""
+
+    def __init__(self, queue_size: int, replay: int):
+        self.queue_size = queue_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        # Event ids are "<epoch>-<n>": ids from another process or an earlier run never replay
+        self._epoch = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._recent = deque(maxlen=replay)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> tuple:
+        """(subscription, messages the client missed since `last_event_id`); call on the stream's loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            missed = self._missed(last_event_id) if last_event_id else []
+        return subscription, missed
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def deliver(self, event_type: str, data: bytes):
+        with self._lock:
+            self._sequence += 1
+            message = b"id: %s-%d\nevent: %s\ndata: %s\n\n" % (
+                self._epoch.encode(),
+                self._sequence,
+                event_type.encode(),
+                data,
+            )
+            self._recent.append(message)
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # Its loop has closed
+                self.unsubscribe(subscription)
+
+    def _missed(self, last_event_id: str) -> list:
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self._epoch or not sequence.isdigit():
+            return [RESYNC]
+        missed = self._sequence - int(sequence)
+        if missed > len(self._recent):
+            return [RESYNC]
+        return list(self._recent)[len(self._recent) - missed :] if missed > 0 else []
+
+
+class MemoryBroker:
+    """Publishes straight to this process's bus."""
+
+    def __init__(self, bus: EventBus):
+        self.bus = bus
+
+    def publish(self, event_type: str, data: bytes):
+        self.bus.deliver(event_type, data)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def claim(self, key: str, ttl: int) -> bool:
+        return True
+
+
+class RedisBroker:
+    """Publishes to a Redis channel; start() relays the channel to this process's bus."""
+
+    channel = "aidmakers:events"
+    prefix = "aidmakers:events:"
+
+    def __init__(self, bus: EventBus, url: str):
+        import redis
+
+        self.bus = bus
+        self._client = redis.Redis.from_url(url)
+        self._thread = None
+
+    def publish(self, event_type: str, data: bytes):
+        self._client.publish(self.channel, event_type.encode() + b"\n" + data)
+
+    def _relay(self, message):
+        event_type, _, data = message["data"].partition(b"\n")
+        self.bus.deliver(event_type.decode(), data)
+
+    def start(self):
+        if self._thread is None:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._relay})
+            self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def claim(self, key: str, ttl: int) -> bool:
+        """True for the first process to claim `key` within `ttl` seconds."""
+        return bool(self._client.set(self.prefix + key, 1, nx=True, ex=ttl))
+
+
+def _create_broker(bus: EventBus):
+    if not EVENTS_ENABLED:
+        return None
+    if EVENTS_BACKEND == "redis":
+        return RedisBroker(bus, EVENTS_URL)
+    return MemoryBroker(bus)
+
+
+bus = EventBus(EVENTS_QUEUE_SIZE, EVENTS_REPLAY)
+broker = _create_broker(bus)
+
+
+def publish(event_type: str, items: list, count: Optional[int] = None):
+    """Publish `items` now; a failure is logged, never raised into the write that caused it."""
+    if broker is None or not (items or count):
+        return
+    try:
+        data = dumps({"count": len(items) if count is None else count, "items": items[:EVENTS_MAX_ITEMS]})
+        broker.publish(event_type, data)
+    except Exception:
+        logger.exception("Could not publish %s event", event_type)
+
+
+def queue_events(session: Session, event_type: str, items: list, count: Optional[int] = None):
+    """Publish `items` as `event_type` once `session` commits.
+
+    For writes the ORM hook below cannot see, such as Core bulk inserts.
+    `count` is the number of changed rows when only the first few are given.
+    """
+    if broker is None or not (items or count):
+        return
+    # [count, first EVENTS_MAX_ITEMS items], so a bulk import keeps only what it publishes
+    pending = session.info.setdefault(_PENDING, {}).setdefault(event_type, [0, []])
+    pending[0] += len(items) if count is None else count
+    pending[1].extend(items[: max(0, EVENTS_MAX_ITEMS - len(pending[1]))])
+
+
+def _application_item(application) -> dict:
+    return {
+        "id": application.id,
+        "full_name": application.full_name,
+        "monthly_income": application.monthly_income,
+        "house_rent": application.house_rent,
+    }
+
+
+def _repayment_item(repayment) -> dict:
+    return {
+        "loan_id": repayment.loan_id,
+        "month_number": repayment.month_number,
+        "agreed_date": repayment.agreed_date,
+        "actual_date": repayment.actual_date,
+        "amount_repaid": repayment.amount_repaid,
+    }
+
+
+def _score_item(score) -> dict:
+    return {"user_id": score.user_id, "point_score": score.point_score, "percentage": score.percentage}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_events(session, flush_context):
+    if broker is None:
+        return
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, LoanApplicationModel):
+            if obj in session.new:
+                queue_events(session, "application.created", [_application_item(obj)])
+        elif isinstance(obj, LoanRepayment):
+            if obj.actual_date is not None and inspect(obj).attrs.actual_date.history.added:
+                queue_events(session, "repayment.recorded", [_repayment_item(obj)])
+        elif isinstance(obj, Scoring) and session.is_modified(obj):
+            queue_events(session, "score.changed", [_score_item(obj)])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session):
+    pending = session.info.pop(_PENDING, None)
+    for event_type, (count, items) in (pending or {}).items():
+        publish(event_type, items, count)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    session.info.pop(_PENDING, None)
+
+
+class OverdueWatcher:
+    """Publishes loan.overdue for Active loans whose next due date passed since the last check.
+
+    Loans only go overdue when the date changes, so the database is read
+    once per date change; the date itself is checked every `interval`
+    seconds. With several workers on the Redis broker one of them publishes.
+    """
+
+    def __init__(self, interval: float = 60):
+        self.interval = interval
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        checked = date.today()
+        while True:
+            await asyncio.sleep(self.interval)
+            today = date.today()
+            if today > checked:
+                try:
+                    await run_in_threadpool(self.check, checked, today)
+                except Exception:
+                    logger.exception("Overdue check failed")
+                checked = today
+
+    def check(self, since: date, today: date):
+        """Loans due on a day in [since, today) are newly overdue."""
+        if not broker.claim(f"overdue:{today.isoformat()}", ttl=2 * 24 * 3600):
+            return
+        newly_overdue = (Loan.status == "Active", Loan.next_due_date >= since, Loan.next_due_date < today)
+        with SessionLocal() as session:
+            count = session.execute(select(func.count()).where(*newly_overdue)).scalar()
+            rows = session.execute(
+                select(Loan.loan_id, Loan.account_id, Loan.next_due_date)
+                .where(*newly_overdue)
+                .order_by(Loan.next_due_date, Loan.loan_id)
+                .limit(EVENTS_MAX_ITEMS)
+            ).all()
+        publish("loan.overdue", [dict(row._mapping) for row in rows], count)
+
+
+overdue_watcher = OverdueWatcher() if broker is not None else None
+
+
+async def _stream(last_event_id: Optional[str]):
+    subscription, missed = bus.subscribe(last_event_id)
+    try:
+        # Sent at once, so clients and proxies see the stream open
+        yield b": connected\n\n"
+        for message in missed:
+            yield message
+        while True:
+            try:
+                yield await asyncio.wait_for(subscription.get(), EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def event_stream_response(last_event_id: Optional[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,240 @@
+# backend/export.py
+"""Streaming export of every loan with its repayments, for analysts.
+
+Layouts:
+  wide  one row per loan: the loan's columns, then the microloans CSV's
+        Name / Address / Contact number / email / Loan amount and
+        MonthN_AgreedDate, MonthN_ActualDate, MonthN_AmountRepaid
+  long  one row per repayment
+
+Formats: csv, ndjson, parquet (needs the optional `pyarrow` package).
+
+Loans are read on one connection (one snapshot on MySQL) in keyset windows
+of EXPORT_BATCH_SIZE loans, each fetched with yield_per and encoded as soon
+as it is read: memory stays flat however many loans there are, and the
+header goes out before the first window is queried. yield_per streams from
+a server-side cursor where the driver has one (SQLite, aiomysql); SQLAlchemy
+keeps mysql-connector's cursors buffered, which the windows bound.
+"""
+import csv
+import io
+import os
+from datetime import date
+from importlib.util import find_spec
+from itertools import groupby
+from typing import Iterator
+
+from sqlalchemy import func, select
+from starlette.responses import StreamingResponse
+
+from loan_status import status_expression
+from models import Account, Loan, LoanRepayment
+from responses import dumps
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# format -> media type
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+LAYOUTS = ("wide", "long")
+
+# MonthN_<field> columns of the wide layout, in the microloans CSV's order
+MONTH_FIELDS = (
+    ("AgreedDate", "date", LoanRepayment.agreed_date),
+    ("ActualDate", "date", LoanRepayment.actual_date),
+    ("AmountRepaid", "decimal", LoanRepayment.amount_repaid),
+)
+
+
+def parquet_available() -> bool:
+    return find_spec("pyarrow") is not None
+
+
+def _loan_columns(today: date) -> tuple:
+    """(name, kind, expression) of the wide layout's per-loan columns; kind picks the Parquet type."""
+    return (
+        ("loan_id", "int", Loan.loan_id),
+        ("user_id", "int", Loan.account_id),
+        ("start_date", "date", Loan.start_date),
+        ("term_months", "int", Loan.term_months),
+        ("status", "str", status_expression(today)),
+        ("Name", "str", Account.full_name),
+        ("Address", "str", Account.address),
+        ("Contact number", "str", Account.phone_number),
+        ("email", "str", Account.email),
+        ("Loan amount", "decimal", Loan.original_amount),
+    )
+
+
+LONG_COLUMNS = (
+    ("loan_id", "int", LoanRepayment.loan_id),
+    ("user_id", "int", Loan.account_id),
+    ("month_number", "int", LoanRepayment.month_number),
+    ("agreed_date", "date", LoanRepayment.agreed_date),
+    ("actual_date", "date", LoanRepayment.actual_date),
+    ("amount_repaid", "decimal", LoanRepayment.amount_repaid),
+)
+
+
+def _loan_windows(conn) -> Iterator[tuple]:
+    """(first, last) loan_id of each run of EXPORT_BATCH_SIZE loans, in id order."""
+    last_id = 0
+    while True:
+        ids = (
+            conn.execute(
+                select(Loan.loan_id)
+                .where(Loan.loan_id > last_id)
+                .order_by(Loan.loan_id)
+                .limit(EXPORT_BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return
+        yield ids[0], ids[-1]
+        last_id = ids[-1]
+
+
+def _windows(conn, statement) -> Iterator[list]:
+    """`statement`'s rows for one window of loans at a time."""
+    for first_id, last_id in _loan_windows(conn):
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(
+            statement.where(Loan.loan_id.between(first_id, last_id))
+        )
+        yield [tuple(row) for row in result]
+
+
+def _wide(conn, today: date) -> tuple:
+    """(columns, batches): one record per loan, its repayments spread over MonthN_* columns."""
+    loan_columns = _loan_columns(today)
+    months = conn.execute(select(func.max(LoanRepayment.month_number))).scalar() or 0
+    columns = loan_columns + tuple(
+        (f"Month{month}_{field}", kind, None)
+        for month in range(1, months + 1)
+        for field, kind, _ in MONTH_FIELDS
+    )
+    statement = (
+        select(
+            *(expression for _, _, expression in loan_columns),
+            LoanRepayment.month_number,
+            *(expression for _, _, expression in MONTH_FIELDS),
+        )
+        .select_from(Loan)
+        .join(Account, Account.user_id == Loan.account_id)
+        .outerjoin(LoanRepayment, LoanRepayment.loan_id == Loan.loan_id)
+        .order_by(Loan.loan_id, LoanRepayment.month_number)
+    )
+
+    width = len(loan_columns)
+    step = len(MONTH_FIELDS)
+
+    def records(rows: list) -> list:
+        batch = []
+        for _, loan_rows in groupby(rows, key=lambda row: row[0]):
+            loan_rows = list(loan_rows)
+            record = list(loan_rows[0][:width]) + [None] * (months * step)
+            for row in loan_rows:
+                month = row[width]
+                if month is not None and 1 <= month <= months:
+                    start = width + (month - 1) * step
+                    record[start : start + step] = row[width + 1 :]
+            batch.append(tuple(record))
+        return batch
+
+    return columns, (records(rows) for rows in _windows(conn, statement))
+
+
+def _long(conn) -> tuple:
+    statement = (
+        select(*(expression for _, _, expression in LONG_COLUMNS))
+        .select_from(Loan)
+        .join(LoanRepayment, LoanRepayment.loan_id == Loan.loan_id)
+        .order_by(Loan.loan_id, LoanRepayment.month_number)
+    )
+    return LONG_COLUMNS, (rows for rows in _windows(conn, statement) if rows)
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _csv_chunks(columns: tuple, batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _, _ in columns])
+    yield _drain(buffer)
+    for batch in batches:
+        writer.writerows(batch)
+        yield _drain(buffer)
+
+
+def _ndjson_chunks(columns: tuple, batches) -> Iterator[bytes]:
+    names = [name for name, _, _ in columns]
+    for batch in batches:
+        yield b"".join(dumps(dict(zip(names, record))) + b"\n" for record in batch)
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file whose bytes are handed on after each Parquet row group."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _parquet_chunks(columns: tuple, batches) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "str": pa.string(), "date": pa.date32(), "decimal": pa.decimal128(10, 2)}
+    schema = pa.schema([(name, types[kind]) for name, kind, _ in columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema)
+    for batch in batches:
+        arrays = [pa.array(values, type=type_) for values, type_ in zip(zip(*batch), schema.types)]
+        # One row group per window
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+ENCODERS = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}
+
+
+def export_chunks(engine, fmt: str, layout: str, today: date) -> Iterator[bytes]:
+    """Encoded export, chunk by chunk; holds one connection until exhausted or closed."""
+    with engine.connect() as conn:
+        columns, batches = _wide(conn, today) if layout == "wide" else _long(conn)
+        yield from ENCODERS[fmt](columns, batches)
+
+
+def export_response(engine, fmt: str, layout: str, today: date) -> StreamingResponse:
+    return StreamingResponse(
+        export_chunks(engine, fmt, layout, today),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="repayments-{layout}-{today}.{fmt}"'},
+    )
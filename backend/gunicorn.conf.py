@@ -0,0 +1,34 @@
+# backend/gunicorn.conf.py
+"""Multi-process serving: gunicorn managing uvicorn workers, app preloaded.
+
+The app is imported once in the master and forked into WEB_WORKERS workers
+(default: one per CPU). post_fork gives each worker its own connection
+pools, and WEB_WORKERS is exported so database.py can split
+DB_MAX_CONNECTIONS between them (the master opens no connections).
+
+Run from backend/:
+    gunicorn main:app -c gunicorn.conf.py
+    WEB_WORKERS=4 DB_MAX_CONNECTIONS=100 gunicorn main:app -c gunicorn.conf.py
+"""
+import os
+
+workers = int(os.getenv("WEB_WORKERS") or os.cpu_count() or 1)
+# Read by database.py when the app is preloaded below
+os.environ["WEB_WORKERS"] = str(workers)
+
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+preload_app = True
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+accesslog = "-" if os.getenv("WEB_ACCESS_LOG", "false").lower() in ("1", "true", "yes", "on") else None
+
+
+def post_fork(server, worker):
+    # Pools and queue connections created while preloading belong to the master
+    from database import dispose_after_fork
+    from intake import application_queue
+
+    dispose_after_fork()
+    if application_queue is not None:
+        application_queue.reset_after_fork()
@@ -0,0 +1,100 @@
+# backend/http_cache.py
+"""Conditional GETs for the polled read endpoints.
+
+Their responses carry a strong ETag and a Last-Modified built from the
+change counters the body depends on (versions.py), plus today's date when
+the body has date-dependent statuses. A request whose If-None-Match (or,
+without one, If-Modified-Since) still matches gets an empty 304 before any
+row is loaded or serialised. HTTP_CACHE_CONTROL goes out with both.
+
+Large responses are gzipped by StreamingGZipMiddleware (GZIP_ENABLED,
+GZIP_MIN_SIZE) in main.py.
+"""
+import os
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+HTTP_CACHE_CONTROL = os.getenv("HTTP_CACHE_CONTROL", "private, no-cache")
+GZIP_ENABLED = os.getenv("GZIP_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1000"))
+
+# Bump when a validated response body changes shape, so tags handed out by
+# an older release no longer match
+REPRESENTATION = 1
+
+
+class Validators:
+    """ETag and Last-Modified of one response; both None if the counters are unknown."""
+
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[datetime]):
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def for_counters(cls, versions: dict, names, today: Optional[date] = None) -> "Validators":
+        if not all(name in versions for name in names):
+            # change_counters has not been migrated in yet
+            return cls(None, None)
+        parts = [f"v{REPRESENTATION}", *(f"{name}{versions[name][0]}" for name in names)]
+        modified = [versions[name][1].replace(tzinfo=timezone.utc) for name in names]
+        if today is not None:
+            parts.append(today.strftime("%Y%m%d"))
+            modified.append(datetime.combine(today, time.min).astimezone(timezone.utc))
+        return cls(f'"{"-".join(parts)}"', max(modified).replace(microsecond=0))
+
+    def fresh(self, request: Request) -> bool:
+        """True if the client's copy is current (If-None-Match wins over If-Modified-Since)."""
+        if self.etag is None:
+            return False
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return self.etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified <= since
+
+    def headers(self) -> dict:
+        headers = {"Cache-Control": HTTP_CACHE_CONTROL}
+        if self.etag is not None:
+            headers["ETag"] = self.etag
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers())
+        return response
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves the paths in `skip_paths` (event streams) uncompressed.
+
+    Starlette only skips text/event-stream itself from 0.41; older versions
+    hold compressed output back until enough has built up, stalling events.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, skip_paths=()):
+        super().__init__(app, minimum_size=minimum_size)
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
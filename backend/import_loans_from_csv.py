@@ -1,13 +1,27 @@
 # backend/import_loans_from_csv.py
+import argparse
 import os
 from datetime import datetime
-from typing import Optional
 
 import pandas as pd
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.orm import Session
 
-from .database import engine
-from .models import Account, Loan, LoanRepayment
+from cache import mark_stale
+from csv_ingest import (
+    ACCOUNT_TEXT_COLUMNS,
+    CHUNK_SIZE,
+    LOAN_CSV_DTYPES,
+    MONTH_AMOUNT_COLUMNS,
+    MONTH_DATE_COLUMNS,
+    ingest_csv,
+    none_if_missing,
+    normalise_frame,
+)
+from database import engine
+from events import queue_events
+from loan_status import refresh_loan_status
+from models import Account, ImportCheckpoint, Loan, LoanRepayment
 
 CSV_PATH = os.path.join(
     os.path.dirname(__file__),
@@ -15,127 +29,311 @@ CSV_PATH = os.path.join(
     "microloans_500(Sheet1).csv",
 )
 
+# Rows per INSERT batch / IN-list slice in bulk mode
+BATCH_SIZE = 1000
+
+TERM_MONTHS = 12
+REPAYMENT_FIELDS = {
+    "AgreedDate": "agreed_date",
+    "ActualDate": "actual_date",
+    "AmountRepaid": "amount_repaid",
+}
+
+
+def normalise_loan_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip text columns and parse MonthN_* dates/amounts, column by column."""
+    return normalise_frame(
+        df,
+        text_cols=ACCOUNT_TEXT_COLUMNS,
+        date_cols=MONTH_DATE_COLUMNS,
+        amount_cols=MONTH_AMOUNT_COLUMNS,
+    )
 
-def norm(value: Optional[str]) -> Optional[str]:
-    """Normalize CSV text values: strip spaces, handle NaN/None."""
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-    return str(value).strip()
-
-
-def parse_date(value):
-    """Convert CSV cell value to Python date or None."""
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return None
-    if isinstance(value, datetime):
-        return value.date()
-    # Expecting 'YYYY-MM-DD' as string
-    try:
-        return datetime.strptime(str(value), "%Y-%m-%d").date()
-    except ValueError:
-        return None
-
-
-def import_loans_from_csv():
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"CSV file not found at: {CSV_PATH}")
-
-    # utf-8-sig handles BOM if present
-    df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
-
-    required_cols = ["Name", "Address", "Contact number", "email", "Loan amount"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column in CSV: {col}")
-
-    with Session(engine) as session:
-        for _, row in df.iterrows():
-            name = norm(row["Name"])
-            address = norm(row["Address"])
-            contact = norm(row["Contact number"])
-            email = norm(row["email"])
-            loan_amount = float(row["Loan amount"])
-
-            if not name:
-                print("Skipping row with no Name:", row.to_dict())
-                continue
-
-            # 1) Find or create Account
-            account = None
-
-            # Preferred: find by email
-            if email:
-                account = session.query(Account).filter(Account.email == email).first()
-
-            # Fallback: name + address
-            if account is None:
-                account = (
-                    session.query(Account)
-                    .filter(
-                        Account.full_name == name,
-                        Account.address == address,
-                    )
-                    .first()
-                )
 
-            if account is None:
-                print(f"[NEW ACCOUNT] Creating new account for {name}")
-                account = Account(
-                    full_name=name,
-                    dob=datetime(1990, 1, 1).date(),  # placeholder if non-nullable
-                    age=35,
-                    address=address,
-                    phone_number=contact or "",
-                    email=email,
-                    job_title="Unknown",
-                    monthly_income=0,
-                    house_rent=0,
+def _next_id(session: Session, column) -> int:
+    """First free primary key value, locking the current maximum for this transaction."""
+    current = session.execute(select(func.max(column)).with_for_update()).scalar()
+    return (current or 0) + 1
+
+
+def _preload_accounts(session: Session, emails: list, names: list):
+    """Existing accounts keyed by email and by (name, address), in set queries."""
+    by_email: dict = {}
+    by_name_address: dict = {}
+
+    for i in range(0, max(len(emails), len(names)), BATCH_SIZE):
+        rows = session.execute(
+            select(Account.user_id, Account.email, Account.full_name, Account.address)
+            .where(
+                or_(
+                    Account.email.in_(emails[i : i + BATCH_SIZE]),
+                    Account.full_name.in_(names[i : i + BATCH_SIZE]),
                 )
-                session.add(account)
-                session.flush()  # get account.user_id
-
-            # 2) Create Loan
-            start_date = parse_date(row.get("Month1_AgreedDate"))
-            if not start_date:
-                start_date = datetime(2025, 1, 1).date()  # fallback
-
-            print(f"[LOAN] Creating loan for {name} amount={loan_amount}")
-            loan = Loan(
-                account_id=account.user_id,
-                original_amount=loan_amount,
-                start_date=start_date,
-                term_months=12,
             )
-            session.add(loan)
-            session.flush()  # get loan.loan_id
-
-            # 3) Create LoanRepayment entries for months 1..12
-            for month in range(1, 13):
-                agreed_col = f"Month{month}_AgreedDate"
-                actual_col = f"Month{month}_ActualDate"
-                amount_col = f"Month{month}_AmountRepaid"
-
-                agreed_date = parse_date(row[agreed_col]) if agreed_col in df.columns else None
-                actual_date = parse_date(row[actual_col]) if actual_col in df.columns else None
-                amount_value = row[amount_col] if amount_col in df.columns else None
-
-                if isinstance(amount_value, float) and pd.isna(amount_value):
-                    amount_value = None
-
-                repayment = LoanRepayment(
-                    loan_id=loan.loan_id,
-                    month_number=month,
-                    agreed_date=agreed_date,
-                    actual_date=actual_date,
-                    amount_repaid=amount_value,
+            .order_by(Account.user_id)
+        )
+        for user_id, email, full_name, address in rows:
+            if email:
+                by_email.setdefault(email, user_id)
+            by_name_address.setdefault((full_name, address), user_id)
+
+    return by_email, by_name_address
+
+
+def repayments_from_wide(df: pd.DataFrame, loan_ids: pd.Series) -> pd.DataFrame:
+    """Melt the (normalised) MonthN_* columns into one row per (loan, month), months 1..12."""
+    month_cols = [
+        f"Month{month}_{field}"
+        for month in range(1, TERM_MONTHS + 1)
+        for field in REPAYMENT_FIELDS
+        if f"Month{month}_{field}" in df.columns
+    ]
+
+    wide = df[month_cols].astype(object).assign(loan_id=loan_ids.to_numpy())
+    long = wide.melt(id_vars="loan_id", var_name="column")
+    parts = long["column"].str.extract(r"^Month(\d+)_(\w+)$")
+    long["month_number"] = parts[0].astype(int)
+    long["field"] = parts[1].map(REPAYMENT_FIELDS)
+
+    repayments = long.pivot(
+        index=["loan_id", "month_number"], columns="field", values="value"
+    )
+
+    # Every loan gets all 12 months, even when the file lacks some columns
+    full_index = pd.MultiIndex.from_product(
+        [loan_ids.to_numpy(), range(1, TERM_MONTHS + 1)],
+        names=["loan_id", "month_number"],
+    )
+    repayments = repayments.reindex(full_index).reset_index()
+    for col in REPAYMENT_FIELDS.values():
+        if col not in repayments.columns:
+            repayments[col] = None
+
+    for col in REPAYMENT_FIELDS.values():
+        repayments[col] = none_if_missing(repayments[col])
+
+    return repayments[["loan_id", "month_number", *REPAYMENT_FIELDS.values()]]
+
+
+def bulk_import_loans(session: Session, df: pd.DataFrame) -> tuple[int, int]:
+    """Set-based import of a loans frame; returns (new accounts, loans) inserted."""
+    df = normalise_loan_frame(df)
+    frame = pd.DataFrame(
+        {
+            "name": df["Name"],
+            "address": df["Address"],
+            "contact": df["Contact number"],
+            "email": df["email"],
+            "loan_amount": pd.to_numeric(df["Loan amount"]).astype(float),
+        },
+        index=df.index,
+    )
+
+    has_name = frame["name"].notna() & (frame["name"] != "")
+    if not has_name.all():
+        print(f"Skipping {int((~has_name).sum())} rows with no Name")
+    frame = frame[has_name]
+    df = df[has_name]
+    if frame.empty:
+        return 0, 0
+
+    # 1) Resolve accounts in file order, as the row-by-row import does: by email
+    #    first, then by name + address, counting accounts made by earlier rows
+    emails = frame["email"].dropna().loc[lambda s: s != ""].unique().tolist()
+    names = frame["name"].unique().tolist()
+    by_email, by_name_address = _preload_accounts(session, emails, names)
+
+    account_ids = []
+    rows = []
+    next_account_id = None
+    for name, address, contact, email in zip(
+        frame["name"], frame["address"], frame["contact"], frame["email"]
+    ):
+        account_id = by_email.get(email) if email else None
+        if account_id is None:
+            account_id = by_name_address.get((name, address))
+        if account_id is None:
+            # 2) New account, with a preallocated id so its loans can reference it
+            if next_account_id is None:
+                next_account_id = _next_id(session, Account.user_id)
+            account_id = next_account_id
+            next_account_id += 1
+            rows.append(
+                {
+                    "user_id": account_id,
+                    "full_name": name,
+                    "dob": datetime(1990, 1, 1).date(),  # placeholder if non-nullable
+                    "age": 35,
+                    "address": address,
+                    "phone_number": contact or "",
+                    "email": email,
+                    "job_title": "Unknown",
+                    "monthly_income": 0,
+                    "house_rent": 0,
+                }
+            )
+            if email:
+                by_email[email] = account_id
+            by_name_address.setdefault((name, address), account_id)
+        account_ids.append(account_id)
+
+    for i in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(Account), rows[i : i + BATCH_SIZE])
+    new_account_count = len(rows)
+
+    # 3) Create loans with preallocated ids so repayments can reference them
+    first_loan_id = _next_id(session, Loan.loan_id)
+    loan_ids = pd.Series(
+        range(first_loan_id, first_loan_id + len(frame)), index=frame.index
+    )
+
+    fallback_start = datetime(2025, 1, 1).date()
+    if "Month1_AgreedDate" in df.columns:
+        start_dates = df["Month1_AgreedDate"].where(df["Month1_AgreedDate"].notna(), fallback_start)
+    else:
+        start_dates = pd.Series(fallback_start, index=df.index)
+
+    loan_rows = [
+        {
+            "loan_id": int(loan_id),
+            "account_id": int(account_id),
+            "original_amount": amount,
+            "start_date": start_date,
+            "term_months": TERM_MONTHS,
+        }
+        for loan_id, account_id, amount, start_date in zip(
+            loan_ids, account_ids, frame["loan_amount"], start_dates
+        )
+    ]
+    for i in range(0, len(loan_rows), BATCH_SIZE):
+        session.execute(insert(Loan), loan_rows[i : i + BATCH_SIZE])
+    # Core inserts bypass the ORM cache hooks: drop these accounts' latest-loan entries
+    mark_stale(session, user_ids=set(account_ids))
+
+    # 4) Repayment schedule: 12 rows per loan built column-wise
+    repayment_rows = repayments_from_wide(df, loan_ids).to_dict("records")
+    for i in range(0, len(repayment_rows), BATCH_SIZE * TERM_MONTHS):
+        session.execute(
+            insert(LoanRepayment), repayment_rows[i : i + BATCH_SIZE * TERM_MONTHS]
+        )
+    queue_events(
+        session,
+        "repayment.recorded",
+        [row for row in repayment_rows if row["actual_date"] is not None],
+    )
+
+    # 5) Materialised status columns (the ORM flush hook does not see Core inserts)
+    refresh_loan_status(session, loan_ids)
+
+    return new_account_count, len(loan_rows)
+
+
+def import_loan_rows(session: Session, df: pd.DataFrame):
+    """Row-by-row import of a loans frame (one lookup/flush per row)."""
+    df = normalise_loan_frame(df)
+    # Records, not iterrows(): a row of text columns would turn None back into NaN
+    for row in df.to_dict("records"):
+        name = row["Name"]
+        address = row["Address"]
+        contact = row["Contact number"]
+        email = row["email"]
+        loan_amount = float(row["Loan amount"])
+
+        if not name:
+            print("Skipping row with no Name:", row)
+            continue
+
+        # 1) Find or create Account
+        account = None
+
+        # Preferred: find by email
+        if email:
+            account = session.query(Account).filter(Account.email == email).first()
+
+        # Fallback: name + address
+        if account is None:
+            account = (
+                session.query(Account)
+                .filter(
+                    Account.full_name == name,
+                    Account.address == address,
                 )
-                session.add(repayment)
+                .first()
+            )
+
+        if account is None:
+            print(f"[NEW ACCOUNT] Creating new account for {name}")
+            account = Account(
+                full_name=name,
+                dob=datetime(1990, 1, 1).date(),  # placeholder if non-nullable
+                age=35,
+                address=address,
+                phone_number=contact or "",
+                email=email,
+                job_title="Unknown",
+                monthly_income=0,
+                house_rent=0,
+            )
+            session.add(account)
+            session.flush()  # get account.user_id
+
+        # 2) Create Loan
+        start_date = row.get("Month1_AgreedDate")
+        if not start_date:
+            start_date = datetime(2025, 1, 1).date()  # fallback
+
+        print(f"[LOAN] Creating loan for {name} amount={loan_amount}")
+        loan = Loan(
+            account_id=account.user_id,
+            original_amount=loan_amount,
+            start_date=start_date,
+            term_months=12,
+        )
+        session.add(loan)
+        session.flush()  # get loan.loan_id
+
+        # 3) Create LoanRepayment entries for months 1..12
+        for month in range(1, 13):
+            agreed_col = f"Month{month}_AgreedDate"
+            actual_col = f"Month{month}_ActualDate"
+            amount_col = f"Month{month}_AmountRepaid"
+
+            agreed_date = row[agreed_col] if agreed_col in df.columns else None
+            actual_date = row[actual_col] if actual_col in df.columns else None
+            amount_value = row[amount_col] if amount_col in df.columns else None
+
+            repayment = LoanRepayment(
+                loan_id=loan.loan_id,
+                month_number=month,
+                agreed_date=agreed_date,
+                actual_date=actual_date,
+                amount_repaid=amount_value,
+            )
+            session.add(repayment)
+
 
-        session.commit()
-        print("✅ Loan import from CSV completed.")
+def import_loans_from_csv(bulk: bool = False, chunksize: int = CHUNK_SIZE, path: str = CSV_PATH):
+    # utf-8-sig handles BOM if present; rows are streamed and committed per chunk
+    rows = ingest_csv(
+        engine,
+        path,
+        source="loans:" + os.path.basename(path),
+        handle_chunk=bulk_import_loans if bulk else import_loan_rows,
+        checkpoint_model=ImportCheckpoint,
+        required_cols=["Name", "Address", "Contact number", "email", "Loan amount"],
+        dtype=LOAN_CSV_DTYPES,
+        chunksize=chunksize,
+    )
+    print(f"✅ Loan import from CSV completed ({rows} rows).")
 
 
 if __name__ == "__main__":
-    import_loans_from_csv()
+    parser = argparse.ArgumentParser(description="Import loans and repayments from CSV")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="set-based import (batched inserts, no per-row lookups)",
+    )
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    import_loans_from_csv(bulk=args.bulk, chunksize=args.chunksize)
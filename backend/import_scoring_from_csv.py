@@ -1,10 +1,14 @@
 # backend/import_scoring_from_csv.py
 
+import argparse
 import os
+from functools import partial
 
 import pandas as pd
+from csv_ingest import CHUNK_SIZE, SCORING_CSV_DTYPES, ingest_csv
 from database import engine
-from sqlalchemy import text
+from models import ImportCheckpoint
+from scoring import BATCH_SIZE, round_to_scale, upsert_scores
 from sqlalchemy.orm import Session
 
 CSV_PATH = os.path.join(
@@ -13,44 +17,45 @@ CSV_PATH = os.path.join(
     "output(PointScore).csv"
 )
 
-def import_scoring():
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"CSV not found: {CSV_PATH}")
-
-    # Load CSV
-    df = pd.read_csv(CSV_PATH)
-
-    # Ensure required columns exist
-    required = ["PointScore", "Percentage"]
-    for col in required:
-        if col not in df.columns:
-            raise ValueError(f"Missing column in CSV: {col}")
-
-    with Session(engine) as session:
-
-        for idx, row in df.iterrows():
-
-            user_id = idx + 101  # assign each row a user_id
-            point = float(row["PointScore"])
-            percent = float(row["Percentage"])
-
-            print(f"Inserting user_id={user_id}, score={point}, pct={percent}")
-
-            session.execute(
-                text("""
-                    INSERT INTO scoring_table (user_id, point_score, percentage)
-                    VALUES (:uid, :ps, :pct)
-                    ON DUPLICATE KEY UPDATE
-                        point_score = VALUES(point_score),
-                        percentage = VALUES(percentage)
-                """),
-                {"uid": user_id, "ps": point, "pct": percent}
-            )
-
-        session.commit()
+def import_scoring_rows(session: Session, df: pd.DataFrame, batch_size: int = BATCH_SIZE):
+    """Upsert one scoring row per CSV row; df.index is the row's position in the file."""
+    scores = round_to_scale(
+        pd.DataFrame(
+            {
+                "user_id": df.index.to_numpy() + 101,  # assign each row a user_id
+                "point_score": df["PointScore"].astype("float64").to_numpy(),
+                "percentage": df["Percentage"].astype("float64").to_numpy(),
+            }
+        )
+    )
+    upsert_scores(session, scores, batch_size=batch_size)
+
+
+def import_scoring(chunksize: int = CHUNK_SIZE, batch_size: int = BATCH_SIZE, path: str = CSV_PATH):
+    # Stream the CSV, committing each chunk; ingest_csv reports progress per chunk
+    ingest_csv(
+        engine,
+        path,
+        source="scoring:" + os.path.basename(path),
+        handle_chunk=partial(import_scoring_rows, batch_size=batch_size),
+        checkpoint_model=ImportCheckpoint,
+        required_cols=["PointScore", "Percentage"],
+        dtype=SCORING_CSV_DTYPES,
+        chunksize=chunksize,
+        encoding="utf-8",
+    )
 
     print("✅ Scoring data import completed successfully!")
 
 
 if __name__ == "__main__":
-    import_scoring()
+    parser = argparse.ArgumentParser(description="Import point scores from CSV")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="rows per upsert statement",
+    )
+    args = parser.parse_args()
+    import_scoring(chunksize=args.chunksize, batch_size=args.batch_size)
@@ -0,0 +1,343 @@
+# backend/intake.py
+"""Queued loan application intake (APPLY_QUEUE=true).
+
+POST /api/apply stores the validated application in a local SQLite queue
+file and answers straight away with a ticket. A background writer moves
+queued applications into loan_applications in batches, and
+GET /api/apply/{ticket} reports where an application is.
+
+The queue survives process crashes and restarts, so it belongs on a
+persistent volume (APPLY_QUEUE_PATH). Several API processes on one host can
+share it: writers claim batches under a lease, and loan_applications.ticket
+is unique, so a batch that was committed remotely but not yet marked here
+is never inserted twice.
+
+Run from backend/ to add loan_applications.ticket to an existing database:
+    python intake.py
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import insert, inspect, select, text
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, env_bool
+from events import publish
+from models import LoanApplication, LoanApplicationModel
+
+logger = logging.getLogger(__name__)
+
+APPLY_QUEUE = env_bool("APPLY_QUEUE", False)
+APPLY_QUEUE_PATH = os.getenv(
+    "APPLY_QUEUE_PATH", os.path.join(os.path.dirname(__file__), "apply_queue.sqlite3")
+)
+APPLY_BATCH_SIZE = int(os.getenv("APPLY_BATCH_SIZE", "200"))
+APPLY_FLUSH_INTERVAL = float(os.getenv("APPLY_FLUSH_INTERVAL", "0.5"))
+# Written entries are dropped after this; their status then comes from loan_applications
+APPLY_QUEUE_RETENTION_HOURS = float(os.getenv("APPLY_QUEUE_RETENTION_HOURS", "168"))
+
+# A claimed batch is handed to another writer if not finished within this
+CLAIM_LEASE_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queued_applications (
+    ticket TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    application_id INTEGER,
+    error TEXT,
+    claimed_until REAL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_queued_applications_status_created_at
+    ON queued_applications (status, created_at);
+"""
+
+
+def application_row(payload: LoanApplication) -> dict:
+    """loan_applications column values for a validated application."""
+    return dict(
+        full_name=payload.fullName,
+        dob=payload.dob,
+        email=payload.email,
+        phone=payload.phone,
+        monthly_income=payload.monthlyIncome,
+        house_rent=payload.houseRent,
+        reference_name=payload.referenceName,
+        reference_relationship=payload.referenceRelationship,
+        reference_phone=payload.referencePhone,
+        reference_email=payload.referenceEmail,
+    )
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat(sep=" ")
+
+
+class ApplicationQueue:
+    """Durable FIFO of applications in a local SQLite file (one connection per thread)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def reset_after_fork(self):
+        """Forget connections inherited from a parent process; each thread reconnects."""
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # WAL + NORMAL: a commit survives a process crash without an fsync per request
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def put(self, payload: LoanApplication) -> str:
+        ticket = uuid.uuid4().hex
+        now = _now()
+        self._connect().execute(
+            "INSERT INTO queued_applications (ticket, payload, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (ticket, payload.model_dump_json(), now, now),
+        )
+        return ticket
+
+    def get(self, ticket: str) -> Optional[sqlite3.Row]:
+        return (
+            self._connect()
+            .execute(
+                "SELECT ticket, status, application_id, error FROM queued_applications WHERE ticket = ?",
+                (ticket,),
+            )
+            .fetchone()
+        )
+
+    def claim(self, limit: int) -> list:
+        """Oldest queued entries not leased by another writer, leased to this one."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT ticket, payload FROM queued_applications
+                WHERE status = 'queued' AND (claimed_until IS NULL OR claimed_until < ?)
+                ORDER BY created_at
+                LIMIT ?
+                """,
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE queued_applications SET claimed_until = ? WHERE ticket = ?",
+                [(now + CLAIM_LEASE_SECONDS, row["ticket"]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def mark_written(self, application_ids: dict):
+        now = _now()
+        self._connect().executemany(
+            """
+            UPDATE queued_applications
+            SET status = 'written', application_id = ?, claimed_until = NULL, updated_at = ?
+            WHERE ticket = ?
+            """,
+            [(application_id, now, ticket) for ticket, application_id in application_ids.items()],
+        )
+
+    def mark_failed(self, ticket: str, error: str):
+        self._connect().execute(
+            """
+            UPDATE queued_applications
+            SET status = 'failed', error = ?, claimed_until = NULL, updated_at = ?
+            WHERE ticket = ?
+            """,
+            (error, _now(), ticket),
+        )
+
+    def purge_written(self, older_than: timedelta) -> int:
+        cutoff = (datetime.utcnow() - older_than).isoformat(sep=" ")
+        cursor = self._connect().execute(
+            "DELETE FROM queued_applications WHERE status = 'written' AND updated_at < ?",
+            (cutoff,),
+        )
+        return cursor.rowcount
+
+    def pending(self) -> int:
+        return (
+            self._connect()
+            .execute("SELECT COUNT(*) FROM queued_applications WHERE status = 'queued'")
+            .fetchone()[0]
+        )
+
+
+def _insert_applications(rows: dict) -> dict:
+    """Insert ticket -> application row dicts not already in loan_applications.
+
+    Returns ticket -> loan_applications.id for every ticket in `rows`.
+    """
+    table = LoanApplicationModel.__table__
+    with SessionLocal() as db:
+        existing = dict(
+            db.execute(select(table.c.ticket, table.c.id).where(table.c.ticket.in_(list(rows)))).all()
+        )
+        missing = [{**row, "ticket": ticket} for ticket, row in rows.items() if ticket not in existing]
+        if missing:
+            db.execute(insert(table), missing)
+            db.commit()
+            existing.update(
+                db.execute(
+                    select(table.c.ticket, table.c.id).where(
+                        table.c.ticket.in_([row["ticket"] for row in missing])
+                    )
+                ).all()
+            )
+            # Core insert: the ORM hook in events.py does not see these
+            publish(
+                "application.created",
+                [
+                    {
+                        "id": existing[row["ticket"]],
+                        "full_name": row["full_name"],
+                        "monthly_income": row["monthly_income"],
+                        "house_rent": row["house_rent"],
+                    }
+                    for row in missing
+                ],
+            )
+    return existing
+
+
+def flush_batch(queue: ApplicationQueue, batch_size: int = APPLY_BATCH_SIZE) -> int:
+    """Write one batch of queued applications; returns how many were taken off the queue."""
+    claimed = queue.claim(batch_size)
+    if not claimed:
+        return 0
+
+    rows = {
+        row["ticket"]: application_row(LoanApplication.model_validate_json(row["payload"]))
+        for row in claimed
+    }
+    try:
+        queue.mark_written(_insert_applications(rows))
+        return len(rows)
+    except (IntegrityError, DataError):
+        logger.warning("Application batch rejected, writing %d rows one by one", len(rows))
+
+    # A bad row fails the whole batch: retry singly so only that row is marked failed
+    for ticket, row in rows.items():
+        try:
+            queue.mark_written(_insert_applications({ticket: row}))
+        except (IntegrityError, DataError) as exc:
+            queue.mark_failed(ticket, str(exc.orig))
+    return len(rows)
+
+
+class BatchWriter:
+    """Background thread that drains the queue into loan_applications."""
+
+    def __init__(self, queue: ApplicationQueue, batch_size: int, interval: float):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="apply-batch-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Stop after a final drain of what is queued (bounded by `timeout`)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        retention = timedelta(hours=APPLY_QUEUE_RETENTION_HOURS)
+        while True:
+            try:
+                # Drain full batches back to back, then wait for more
+                while flush_batch(self.queue, self.batch_size) == self.batch_size:
+                    pass
+                self.queue.purge_written(retention)
+            except Exception:
+                # Database unreachable etc.: claimed entries stay queued and retry after the lease
+                logger.exception("Application batch write failed; retrying")
+            if self._stop.is_set():
+                return
+            # Wait a little to gather a batch
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+def _open_queue() -> Optional[ApplicationQueue]:
+    return ApplicationQueue(APPLY_QUEUE_PATH) if APPLY_QUEUE else None
+
+
+application_queue = _open_queue()
+batch_writer = (
+    BatchWriter(application_queue, APPLY_BATCH_SIZE, APPLY_FLUSH_INTERVAL)
+    if application_queue is not None
+    else None
+)
+
+
+def application_status(ticket: str, db: Session) -> Optional[dict]:
+    """Status of a queued application, or None for an unknown ticket."""
+    row = application_queue.get(ticket) if application_queue is not None else None
+    if row is not None:
+        return {
+            "ticket": ticket,
+            "status": row["status"],
+            "application_id": row["application_id"],
+            "error": row["error"],
+        }
+
+    # Purged from the local queue (or queued on another host): written if the ticket is there
+    table = LoanApplicationModel.__table__
+    application_id = db.execute(select(table.c.id).where(table.c.ticket == ticket)).scalar()
+    if application_id is None:
+        return None
+    return {"ticket": ticket, "status": "written", "application_id": application_id, "error": None}
+
+
+def add_ticket_column(engine):
+    """Add loan_applications.ticket and its unique index to a table created before them."""
+    inspector = inspect(engine)
+    existing = {col["name"] for col in inspector.get_columns("loan_applications")}
+    indexes = {index["name"] for index in inspector.get_indexes("loan_applications")}
+    with engine.begin() as conn:
+        if "ticket" not in existing:
+            conn.execute(text("ALTER TABLE loan_applications ADD COLUMN ticket VARCHAR(32)"))
+        for index in LoanApplicationModel.__table__.indexes:
+            # Only the ticket index: others may need columns added by later migrations
+            if index.name not in indexes and "ticket" in index.columns:
+                index.create(conn)
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    add_ticket_column(engine)
+    print("✅ loan_applications.ticket is in place.")
@@ -0,0 +1,205 @@
+# backend/loan_status.py
+"""Materialised repayment status on `loans`.
+
+Each loan row carries its next due date, last payment and amount paid to date,
+kept in step with its repayments:
+
+- ORM writes to LoanRepayment, and new Loan rows, refresh their loans
+  automatically on flush (a loan with no repayments is Closed, as before);
+- Core/bulk writers call refresh_loan_status() with the loan ids they touched;
+- rebuild_loan_status() recomputes every loan in batches.
+
+Every refresh also stamps status_updated_at, which the scoring engine uses
+to find accounts whose repayments changed since its last run.
+
+Only Active/Closed is stored. Overdue depends on today's date, so it is
+derived when reading: an Active loan whose next_due_date has passed.
+
+Run from backend/ to add the columns to an existing database and rebuild them:
+    python loan_status.py
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain
+
+from sqlalchemy import and_, bindparam, case, event, inspect, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+
+import versions  # noqa: F401  (status refreshes bump the loans counter)
+from models import Loan, LoanRepayment
+
+BATCH_SIZE = 1000
+
+_PENDING = "loan_status_refresh"
+
+STATUS_COLUMNS = (
+    "next_due_date",
+    "next_payment_amount",
+    "last_paid_date",
+    "last_payment_amount",
+    "amount_paid",
+    "status",
+)
+
+# Added by add_status_columns() alongside the materialised columns
+TRACKING_COLUMNS = ("status_updated_at",)
+
+
+def summarise_repayments(repayments) -> dict:
+    """Derived status columns for one loan's repayments (ordered by month)."""
+    # Last payment: last repayment with actual_date and amount
+    last_paid = None
+    for rep in repayments:
+        if rep.actual_date and rep.amount_repaid is not None:
+            last_paid = rep
+
+    # Next payment: first repayment where actual_date is NULL
+    next_rep = None
+    for rep in repayments:
+        if rep.actual_date is None:
+            next_rep = rep
+            break
+
+    amount_paid = sum(
+        (Decimal(rep.amount_repaid) for rep in repayments if rep.actual_date and rep.amount_repaid is not None),
+        Decimal("0"),
+    )
+
+    return {
+        "next_due_date": next_rep.agreed_date if next_rep else None,
+        "next_payment_amount": next_rep.amount_repaid if next_rep else None,
+        "last_paid_date": last_paid.actual_date if last_paid else None,
+        "last_payment_amount": last_paid.amount_repaid if last_paid else None,
+        "amount_paid": amount_paid,
+        "status": "Closed" if next_rep is None else "Active",
+    }
+
+
+def loan_status(loan, today: date) -> str:
+    """Active / Overdue / Closed for a loan row with materialised columns."""
+    if loan.status == "Closed":
+        return "Closed"
+    if loan.next_due_date and loan.next_due_date < today:
+        return "Overdue"
+    return "Active"
+
+
+def status_expression(today: date):
+    """SQL equivalent of loan_status(), for filtering and grouping loans."""
+    return case(
+        (Loan.status == "Closed", "Closed"),
+        (and_(Loan.next_due_date.isnot(None), Loan.next_due_date < today), "Overdue"),
+        else_="Active",
+    )
+
+
+def refresh_loan_status(session: Session, loan_ids) -> int:
+    """Recompute the materialised columns of `loan_ids` from their repayments."""
+    loan_ids = sorted({int(loan_id) for loan_id in loan_ids})
+    loans = Loan.__table__
+    statement = (
+        loans.update()
+        .where(loans.c.loan_id == bindparam("b_loan_id"))
+        .values(
+            {
+                **{col: bindparam(f"b_{col}") for col in STATUS_COLUMNS},
+                "status_updated_at": datetime.utcnow(),
+            }
+        )
+    )
+
+    for i in range(0, len(loan_ids), BATCH_SIZE):
+        batch = loan_ids[i : i + BATCH_SIZE]
+        rows = session.execute(
+            select(
+                LoanRepayment.loan_id,
+                LoanRepayment.month_number,
+                LoanRepayment.agreed_date,
+                LoanRepayment.actual_date,
+                LoanRepayment.amount_repaid,
+            )
+            .where(LoanRepayment.loan_id.in_(batch))
+            .order_by(LoanRepayment.loan_id, LoanRepayment.month_number)
+        ).all()
+
+        by_loan = {loan_id: [] for loan_id in batch}
+        for row in rows:
+            by_loan[row.loan_id].append(row)
+
+        params = []
+        for loan_id, repayments in by_loan.items():
+            summary = summarise_repayments(repayments)
+            params.append(
+                {"b_loan_id": loan_id, **{f"b_{col}": value for col, value in summary.items()}}
+            )
+        session.connection().execute(statement, params)
+
+    # Loans already in the session would otherwise show the old values
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Loan) and obj.loan_id in loan_ids:
+            session.expire(obj, [*STATUS_COLUMNS, *TRACKING_COLUMNS])
+
+    return len(loan_ids)
+
+
+def rebuild_loan_status(session: Session) -> int:
+    """Recompute every loan, walking loan ids in batches."""
+    done = 0
+    last_id = 0
+    while True:
+        batch = session.execute(
+            select(Loan.loan_id)
+            .where(Loan.loan_id > last_id)
+            .order_by(Loan.loan_id)
+            .limit(BATCH_SIZE)
+        ).scalars().all()
+        if not batch:
+            return done
+        done += refresh_loan_status(session, batch)
+        last_id = batch[-1]
+        session.commit()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_loans(session, flush_context):
+    pending = session.info.setdefault(_PENDING, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, LoanRepayment) and obj.loan_id is not None:
+            pending.add(obj.loan_id)
+    # A new loan keeps the column default until something refreshes it
+    for obj in session.new:
+        if isinstance(obj, Loan) and obj.loan_id is not None:
+            pending.add(obj.loan_id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_changed_loans(session, flush_context):
+    loan_ids = session.info.pop(_PENDING, None)
+    if loan_ids:
+        refresh_loan_status(session, loan_ids)
+
+
+def add_status_columns(engine):
+    """Add the materialised columns to a `loans` table created before they existed."""
+    existing = {col["name"] for col in inspect(engine).get_columns("loans")}
+    with engine.begin() as conn:
+        for name in STATUS_COLUMNS + TRACKING_COLUMNS:
+            if name in existing:
+                continue
+            column = CreateColumn(Loan.__table__.c[name]).compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE loans ADD COLUMN {column}"
+            conn.execute(text(ddl))
+        indexes = {index["name"] for index in inspect(conn).get_indexes("loans")}
+        for index in Loan.__table__.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    add_status_columns(engine)
+    with Session(engine) as session:
+        count = rebuild_loan_status(session)
+    print(f"✅ Loan status rebuilt for {count} loans.")
@@ -1,24 +1,63 @@
 # backend/main.py
-from datetime import date, datetime, timedelta
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Literal, Optional
 
 import models
-from database import Base, engine, get_db
-from fastapi import Depends, FastAPI, HTTPException
+from admin import end_session, require_admin, require_admin_token, start_session
+from cache import cache, latest_loan_key, loan_key
+from database import DB_ASYNC, async_engine, engine, get_async_db, get_db, pool_stats
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from events import EVENTS_ENABLED, EVENTS_PATH, broker, bus, event_stream_response, overdue_watcher
+from export import FORMATS, LAYOUTS, export_response, parquet_available
+from http_cache import GZIP_ENABLED, GZIP_MIN_SIZE, StreamingGZipMiddleware, Validators
+from loan_status import loan_status
+from metrics import CONTENT_TYPE, METRICS_ENABLED, MetricsMiddleware, instrument_engine, render_metrics
+from migrations import LATEST_VERSION, schema_version
+from intake import application_queue, application_row, application_status, batch_writer
 from models import (
     AccountOut,
+    ApplicationStatusOut,
+    DashboardOut,
     LoanApplication,
     LoanApplicationModel,
     LoanSummaryOut,
     PaymentHistoryPoint,
+    PortfolioOut,
     ScoringOut,
 )
-from sqlalchemy import text
+from portfolio import cached_portfolio_stats
+from responses import FastJSONResponse
+from schedule import LoanSchedule, schedule_select
+from sqlalchemy import Float, and_, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from versions import current_versions, current_versions_async
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if batch_writer is not None:
+        batch_writer.start()
+    if broker is not None:
+        broker.start()
+        overdue_watcher.start()
+    yield
+    if broker is not None:
+        overdue_watcher.stop()
+        broker.stop()
+    if batch_writer is not None:
+        batch_writer.stop()
+
+
+# Hot read handlers return FastJSONResponse themselves (see responses.py)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+if GZIP_ENABLED:
+    # Innermost, so the other middleware see the compressed size
+    app.add_middleware(StreamingGZipMiddleware, minimum_size=GZIP_MIN_SIZE, skip_paths=(EVENTS_PATH,))
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,12 +69,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+if METRICS_ENABLED:
+    # Outermost, so its timings include the other middleware
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+
+    # Per-route timings and pool usage are for operators: scrape with the admin token
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin)])
+    def metrics():
+        return Response(render_metrics(pool_stats()), media_type=CONTENT_TYPE)
+
 @app.get("/health")
 def health(db = Depends(get_db)):
-    db.execute(text("SELECT 1"))
-    return {"status": "ok", "db": "connected"}
+    body = {
+        "status": "ok",
+        "db": "connected",
+        # Behind LATEST_VERSION until `python migrations.py` has run for this release
+        "schema": {"version": schema_version(db.connection()), "latest": LATEST_VERSION},
+        "pool": pool_stats(),
+    }
+    if application_queue is not None:
+        body["queued_applications"] = application_queue.pending()
+    if EVENTS_ENABLED:
+        body["event_streams"] = bus.subscribers()
+    return body
 
 @app.get("/")
 def read_root():
@@ -47,164 +109,322 @@ def list_items(db: Session = Depends(get_db)):
     return db.query(models.Item).all()
 
 
-@app.get("/api/accounts/{user_id}", response_model=AccountOut)
-def get_account(user_id: int, db: Session = Depends(get_db)):
-    # Now models.Account exists
-    account = db.query(models.Account).filter(models.Account.user_id == user_id).first()
+def sync_read(path: str, **kwargs):
+    """Register a sync read handler, unless DB_ASYNC serves `path` from async_reads."""
+    if DB_ASYNC:
+        return lambda handler: handler
+    return app.get(path, **kwargs)
 
-    if account is None:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    return account
+# Async versions of the read endpoints, included instead of the sync ones when DB_ASYNC is on
+async_reads = APIRouter()
+
+
+def _account_select(user_id: int):
+    return select(models.Account).where(models.Account.user_id == user_id)
 
-@app.get("/api/accounts/{user_id}/loan-summary", response_model=LoanSummaryOut)
-def get_loan_summary(user_id: int, db: Session = Depends(get_db)):
-    # 1) Get the most recent loan for this account
-    loan = (
-        db.query(models.Loan)
-        .filter(models.Loan.account_id == user_id)
+
+def _latest_loan_id(user_id: int):
+    """Scalar subquery: the account's most recent loan id."""
+    return (
+        select(models.Loan.loan_id)
+        .where(models.Loan.account_id == user_id)
         .order_by(models.Loan.start_date.desc())
-        .first()
+        .limit(1)
+        .scalar_subquery()
     )
 
-    if loan is None:
-        raise HTTPException(status_code=404, detail="No loan found for this user")
 
-    # 2) Get all repayments for that loan, ordered by month
-    repayments = (
-        db.query(models.LoanRepayment)
-        .filter(models.LoanRepayment.loan_id == loan.loan_id)
-        .order_by(models.LoanRepayment.month_number)
-        .all()
+# Materialised columns read by build_loan_summary() and loan_status()
+SUMMARY_COLUMNS = (
+    models.Loan.loan_id,
+    models.Loan.original_amount,
+    models.Loan.term_months,
+    models.Loan.last_payment_amount,
+    models.Loan.last_paid_date,
+    models.Loan.next_payment_amount,
+    models.Loan.next_due_date,
+    models.Loan.status,
+)
+
+
+def _latest_loan_select(user_id: int):
+    """Most recent loan for an account, as a row of its summary columns."""
+    return (
+        select(*SUMMARY_COLUMNS)
+        .where(models.Loan.account_id == user_id)
+        .order_by(models.Loan.start_date.desc())
+        .limit(1)
     )
 
-    term_months = loan.term_months or len(repayments) or 1
-    original_amount = float(loan.original_amount)
-    monthly_payment = round(original_amount / term_months, 2)
 
-    # 3) Last payment: last repayment with actual_date and amount
-    last_paid = None
-    for rep in repayments:
-        if rep.actual_date and rep.amount_repaid is not None:
-            last_paid = rep
+def _dashboard_select(user_id: int):
+    """An account and its most recent loan's summary columns (NULL without a loan), in one row."""
+    return (
+        select(models.Account, *SUMMARY_COLUMNS)
+        .outerjoin(models.Loan, models.Loan.account_id == models.Account.user_id)
+        .where(models.Account.user_id == user_id)
+        .order_by(models.Loan.start_date.desc())
+        .limit(1)
+    )
 
-    # 4) Next payment: first repayment where actual_date is NULL
-    next_rep = None
-    for rep in repayments:
-        if rep.actual_date is None:
-            next_rep = rep
-            break
 
-    today = date.today()
+def _cached_schedule(user_id: int) -> Optional[LoanSchedule]:
+    loan_id = cache.get(latest_loan_key(user_id))
+    if loan_id is None:
+        return None
+    return cache.get(loan_key(loan_id))
 
-    if next_rep is None:
-        status = "Closed"
-    else:
-        if next_rep.agreed_date and next_rep.agreed_date < today:
-            status = "Overdue"
-        else:
-            status = "Active"
 
-    # 5) Reminder date: 7 days before next agreed_date (if there is a next payment)
+def _store_schedule(user_id: int, schedule: LoanSchedule):
+    cache.set(loan_key(schedule.loan_id), schedule)
+    cache.set(latest_loan_key(user_id), schedule.loan_id)
+
+
+def loan_schedule(db: Session, loan_id: int) -> Optional[LoanSchedule]:
+    """A loan's repayment schedule, read through the loan cache."""
+    schedule = cache.get(loan_key(loan_id))
+    if schedule is None:
+        rows = db.execute(schedule_select(loan_id)).all()
+        if not rows:
+            return None
+        schedule = LoanSchedule.from_rows(rows)
+        cache.set(loan_key(loan_id), schedule)
+    return schedule
+
+
+def latest_loan_schedule(db: Session, user_id: int) -> Optional[LoanSchedule]:
+    """Schedule of this account's most recent loan, read through the loan cache."""
+    schedule = _cached_schedule(user_id)
+    if schedule is None:
+        rows = db.execute(schedule_select(_latest_loan_id(user_id))).all()
+        if not rows:
+            return None
+        schedule = LoanSchedule.from_rows(rows)
+        _store_schedule(user_id, schedule)
+    return schedule
+
+
+async def latest_loan_schedule_async(db: AsyncSession, user_id: int) -> Optional[LoanSchedule]:
+    schedule = _cached_schedule(user_id)
+    if schedule is None:
+        rows = (await db.execute(schedule_select(_latest_loan_id(user_id)))).all()
+        if not rows:
+            return None
+        schedule = LoanSchedule.from_rows(rows)
+        _store_schedule(user_id, schedule)
+    return schedule
+
+
+@sync_read("/api/accounts/{user_id}", response_model=AccountOut)
+def get_account(user_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    validators = Validators.for_counters(current_versions(db), ("accounts",))
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    account = db.execute(_account_select(user_id)).scalars().first()
+
+    if account is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    validators.apply(response)
+    return account
+
+
+@async_reads.get("/api/accounts/{user_id}", response_model=AccountOut)
+async def get_account_async(
+    user_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    validators = Validators.for_counters(await current_versions_async(db), ("accounts",))
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    account = (await db.execute(_account_select(user_id))).scalars().first()
+
+    if account is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    validators.apply(response)
+    return account
+
+
+
+def build_loan_summary(loan, today: date) -> LoanSummaryOut:
+    """Loan summary from a loan row's materialised status columns (see loan_status.py)."""
+    term_months = loan.term_months or 1
+    original_amount = float(loan.original_amount)
+    monthly_payment = round(original_amount / term_months, 2)
+
+    # Reminder date: 7 days before next agreed_date (if there is a next payment)
     reminder_date = None
-    if next_rep and next_rep.agreed_date:
-        reminder_date = next_rep.agreed_date - timedelta(days=7)
+    if loan.next_due_date:
+        reminder_date = loan.next_due_date - timedelta(days=7)
 
     return LoanSummaryOut(
         loan_id=loan.loan_id,
         amount=original_amount,
         term_months=term_months,
         monthly_payment=monthly_payment,
-        last_payment_amount=float(last_paid.amount_repaid)
-        if last_paid and last_paid.amount_repaid is not None
+        last_payment_amount=float(loan.last_payment_amount)
+        if loan.last_payment_amount is not None
         else None,
-        last_payment_date=last_paid.actual_date if last_paid else None,
-        next_payment_amount=float(next_rep.amount_repaid)
-        if next_rep and next_rep.amount_repaid is not None
+        last_payment_date=loan.last_paid_date,
+        next_payment_amount=float(loan.next_payment_amount)
+        if loan.next_payment_amount is not None
         else None,
-        next_payment_date=next_rep.agreed_date if next_rep else None,
-        status=status,
+        next_payment_date=loan.next_due_date,
+        status=loan_status(loan, today),
         reminder_date=reminder_date,
     )
 
 
-@app.get(
-    "/api/accounts/{user_id}/payment-history",
-    response_model=list[PaymentHistoryPoint],
-)
-def get_payment_history(user_id: int, db: Session = Depends(get_db)):
-    # 1) Most recent loan for this user
-    loan = (
-        db.query(models.Loan)
-        .filter(models.Loan.account_id == user_id)
-        .order_by(models.Loan.start_date.desc())
-        .first()
-    )
+def build_payment_history(schedule: LoanSchedule, today: date) -> list[dict]:
+    """Turn a loan's schedule (ordered by month) into chart points for the dashboard.
 
-    if loan is None:
-        raise HTTPException(status_code=404, detail="No loan found for this user")
+    Plain dicts shaped like PaymentHistoryPoint, ready to serialise as they are.
+    """
+    history: list[dict] = []
 
-    # 2) Repayments ordered by month
-    repayments = (
-        db.query(models.LoanRepayment)
-        .filter(models.LoanRepayment.loan_id == loan.loan_id)
-        .order_by(models.LoanRepayment.month_number)
-        .all()
-    )
-
-    today = date.today()
-    history: list[PaymentHistoryPoint] = []
-
-    for rep in repayments:
+    for month_number, agreed_date, actual_date, amount_repaid in zip(
+        schedule.month_number, schedule.agreed_date, schedule.actual_date, schedule.amount_repaid
+    ):
         # month label (Jan, Feb…)
-        if rep.agreed_date:
-            month_label = rep.agreed_date.strftime("%b")
+        if agreed_date:
+            month_label = agreed_date.strftime("%b")
         else:
-            month_label = f"M{rep.month_number}"
+            month_label = f"M{month_number}"
 
         # simple status logic
-        if rep.actual_date:
+        if actual_date:
             status = "Paid"
-        elif rep.agreed_date and rep.agreed_date < today:
+        elif agreed_date and agreed_date < today:
             status = "Missed"
         else:
             status = "Upcoming"
 
         history.append(
-            PaymentHistoryPoint(
-                month_number=rep.month_number,
-                month=month_label,
-                agreed_date=rep.agreed_date,
-                actual_date=rep.actual_date,
-                amount_repaid=float(rep.amount_repaid)
-                if rep.amount_repaid is not None
+            {
+                "month_number": month_number,
+                "month": month_label,
+                "agreed_date": agreed_date,
+                "actual_date": actual_date,
+                "amount_repaid": float(amount_repaid)
+                if amount_repaid is not None
                 else None,
-                status=status,
-            )
+                "status": status,
+            }
         )
 
     return history
 
+
+@sync_read("/api/accounts/{user_id}/loan-summary", response_model=LoanSummaryOut)
+def get_loan_summary(user_id: int, request: Request, db: Session = Depends(get_db)):
+    # The status depends on today as well as on the loan
+    today = date.today()
+    validators = Validators.for_counters(current_versions(db), ("loans",), today)
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    # Most recent loan for this account: one indexed row of materialised columns
+    loan = db.execute(_latest_loan_select(user_id)).first()
+
+    if loan is None:
+        raise HTTPException(status_code=404, detail="No loan found for this user")
+
+    return validators.apply(FastJSONResponse(build_loan_summary(loan, today)))
+
+
+@async_reads.get("/api/accounts/{user_id}/loan-summary", response_model=LoanSummaryOut)
+async def get_loan_summary_async(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    today = date.today()
+    validators = Validators.for_counters(await current_versions_async(db), ("loans",), today)
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    loan = (await db.execute(_latest_loan_select(user_id))).first()
+
+    if loan is None:
+        raise HTTPException(status_code=404, detail="No loan found for this user")
+
+    return validators.apply(FastJSONResponse(build_loan_summary(loan, today)))
+
+
+@sync_read(
+    "/api/accounts/{user_id}/payment-history",
+    response_model=list[PaymentHistoryPoint],
+)
+def get_payment_history(user_id: int, request: Request, db: Session = Depends(get_db)):
+    today = date.today()
+    validators = Validators.for_counters(current_versions(db), ("loans",), today)
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    # Most recent loan for this user, repayments ordered by month
+    schedule = latest_loan_schedule(db, user_id)
+
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="No loan found for this user")
+
+    return validators.apply(FastJSONResponse(build_payment_history(schedule, today)))
+
+
+@async_reads.get(
+    "/api/accounts/{user_id}/payment-history",
+    response_model=list[PaymentHistoryPoint],
+)
+async def get_payment_history_async(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    today = date.today()
+    validators = Validators.for_counters(await current_versions_async(db), ("loans",), today)
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    schedule = await latest_loan_schedule_async(db, user_id)
+
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="No loan found for this user")
+
+    return validators.apply(FastJSONResponse(build_payment_history(schedule, today)))
+
+
+@app.get("/api/accounts/{user_id}/dashboard", response_model=DashboardOut)
+def get_dashboard(user_id: int, request: Request, db: Session = Depends(get_db)):
+    today = date.today()
+    validators = Validators.for_counters(current_versions(db), ("accounts", "loans"), today)
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    # 1) Account and its most recent loan's summary columns in one SELECT;
+    #    the loan's schedule comes from the loan cache or one more query.
+    row = db.execute(_dashboard_select(user_id)).first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    account_out = AccountOut.model_validate(row.Account)
+    loan = row if row.loan_id is not None else None
+
+    # 2) Build every dashboard section from that one result
+    if loan is None:
+        dashboard = DashboardOut(account=account_out, loan_summary=None, payment_history=[])
+    else:
+        dashboard = DashboardOut(
+            account=account_out,
+            loan_summary=build_loan_summary(loan, today),
+            payment_history=build_payment_history(loan_schedule(db, loan.loan_id), today),
+        )
+    return validators.apply(FastJSONResponse(dashboard))
+
 @app.post("/api/apply")
-def submit_application(payload: LoanApplication, db: Session = Depends(get_db)):
+def submit_application(payload: LoanApplication, response: Response, db: Session = Depends(get_db)):
+    if application_queue is not None:
+        # Queued intake: acknowledge now, the batch writer inserts it shortly
+        ticket = application_queue.put(payload)
+        batch_writer.notify()
+        response.status_code = 202
+        return {"status": "queued", "ticket": ticket}
 
-    try:
-        dob_parsed = datetime.strptime(payload.dob, "%Y-%m-%d").date()
-    except:
-        raise HTTPException(status_code=400, detail="Invalid date format for dob")
-
-    new_app = LoanApplicationModel(
-        full_name=payload.fullName,
-        dob=dob_parsed,
-        email=payload.email,
-        phone=payload.phone,
-        monthly_income=payload.monthlyIncome,
-        house_rent=payload.houseRent,
-        reference_name=payload.referenceName,
-        reference_relationship=payload.referenceRelationship,
-        reference_phone=payload.referencePhone,
-        reference_email=payload.referenceEmail
-    )
+    new_app = LoanApplicationModel(**application_row(payload))
 
     db.add(new_app)
     db.commit()
@@ -212,7 +432,195 @@ def submit_application(payload: LoanApplication, db: Session = Depends(get_db)):
 
     return {"status": "success", "application_id": new_app.id}
 
-@app.get("/api/scoring", response_model=list[ScoringOut])
-def get_scoring(db: Session = Depends(get_db)):
-    rows = db.query(models.Scoring).all()
-    return rows
+
+@app.get("/api/apply/{ticket}", response_model=ApplicationStatusOut)
+def get_application_status(ticket: str, db: Session = Depends(get_db)):
+    status = application_status(ticket, db)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return status
+
+SCORING_PAGE_SIZE = 100
+SCORING_MAX_PAGE_SIZE = 500
+
+
+def _parse_scoring_cursor(cursor: str, sort: str):
+    """Decode a scoring cursor: '<id>' for id order, '<score>_<id>' for score order."""
+    try:
+        if sort == "id":
+            return None, int(cursor)
+        score, last_id = cursor.rsplit("_", 1)
+        score = Decimal(score)
+        last_id = int(last_id)
+    except (ValueError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # NaN and Infinity parse, but compare to no score
+    if not score.is_finite():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return score, last_id
+
+
+class ScoringParams:
+    """Query parameters shared by the sync and async /api/scoring handlers."""
+
+    def __init__(
+        self,
+        limit: int = Query(SCORING_PAGE_SIZE, ge=1, le=SCORING_MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        sort: Literal["id", "point_score", "-point_score"] = "id",
+        min_score: Optional[float] = Query(None, allow_inf_nan=False),
+        max_score: Optional[float] = Query(None, allow_inf_nan=False),
+        min_percentage: Optional[float] = Query(None, allow_inf_nan=False),
+        max_percentage: Optional[float] = Query(None, allow_inf_nan=False),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.min_score = min_score
+        self.max_score = max_score
+        self.min_percentage = min_percentage
+        self.max_percentage = max_percentage
+
+
+def _scoring_select(params: ScoringParams):
+    Scoring = models.Scoring
+    sort = params.sort
+    # Plain row tuples: the page is serialised straight from them. cursor_score
+    # is point_score as stored, not rounded to the column's scale the way
+    # Numeric results are: SQLite keeps extra digits, and a rounded cursor would
+    # skip or repeat rows that compare against the stored value.
+    stmt = select(
+        Scoring.id,
+        Scoring.user_id,
+        Scoring.point_score,
+        Scoring.percentage,
+        type_coerce(Scoring.point_score, Float).label("cursor_score"),
+    )
+
+    # 1) Range filters
+    if params.min_score is not None:
+        stmt = stmt.where(Scoring.point_score >= params.min_score)
+    if params.max_score is not None:
+        stmt = stmt.where(Scoring.point_score <= params.max_score)
+    if params.min_percentage is not None:
+        stmt = stmt.where(Scoring.percentage >= params.min_percentage)
+    if params.max_percentage is not None:
+        stmt = stmt.where(Scoring.percentage <= params.max_percentage)
+
+    # 2) Keyset: continue strictly after the last row of the previous page.
+    #    Score order walks the (point_score, id) index in one direction.
+    if sort == "id":
+        order_by = (Scoring.id.asc(),)
+    else:
+        stmt = stmt.where(Scoring.point_score.isnot(None))
+        if sort == "point_score":
+            order_by = (Scoring.point_score.asc(), Scoring.id.asc())
+        else:
+            order_by = (Scoring.point_score.desc(), Scoring.id.desc())
+
+    if params.cursor:
+        last_score, last_id = _parse_scoring_cursor(params.cursor, sort)
+        if sort == "id":
+            stmt = stmt.where(Scoring.id > last_id)
+        elif sort == "point_score":
+            stmt = stmt.where(
+                or_(
+                    Scoring.point_score > last_score,
+                    and_(Scoring.point_score == last_score, Scoring.id > last_id),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    Scoring.point_score < last_score,
+                    and_(Scoring.point_score == last_score, Scoring.id < last_id),
+                )
+            )
+
+    # 3) Fetch one extra row to know whether another page exists
+    return stmt.order_by(*order_by).limit(params.limit + 1)
+
+
+def _scoring_page(rows, params: ScoringParams) -> FastJSONResponse:
+    """Trim the look-ahead row, advertise the next cursor (if any) and serialise the page."""
+    headers = {}
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        # repr() of the float round-trips exactly (DECIMAL(10,2) fits a double)
+        headers["X-Next-Cursor"] = (
+            str(last.id) if params.sort == "id" else f"{last.cursor_score!r}_{last.id}"
+        )
+    content = [
+        {"user_id": user_id, "point_score": point_score, "percentage": percentage}
+        for _, user_id, point_score, percentage, _ in rows
+    ]
+    return FastJSONResponse(content, headers=headers)
+
+
+@sync_read("/api/scoring", response_model=list[ScoringOut])
+def get_scoring(request: Request, params: ScoringParams = Depends(), db: Session = Depends(get_db)):
+    # Validated per URL, so the query string is part of the resource
+    validators = Validators.for_counters(current_versions(db), ("scoring",))
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    rows = db.execute(_scoring_select(params)).all()
+    return validators.apply(_scoring_page(rows, params))
+
+
+@async_reads.get("/api/scoring", response_model=list[ScoringOut])
+async def get_scoring_async(
+    request: Request, params: ScoringParams = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    validators = Validators.for_counters(await current_versions_async(db), ("scoring",))
+    if validators.fresh(request):
+        return validators.not_modified()
+
+    rows = (await db.execute(_scoring_select(params))).all()
+    return validators.apply(_scoring_page(rows, params))
+
+
+@sync_read("/api/admin/portfolio", response_model=PortfolioOut, dependencies=[Depends(require_admin)])
+def get_portfolio(db: Session = Depends(get_db)):
+    return FastJSONResponse(cached_portfolio_stats(db, date.today()))
+
+
+@async_reads.get("/api/admin/portfolio", response_model=PortfolioOut, dependencies=[Depends(require_admin)])
+async def get_portfolio_async(db: AsyncSession = Depends(get_async_db)):
+    return FastJSONResponse(await db.run_sync(cached_portfolio_stats, date.today()))
+
+
+@app.post("/api/admin/session", status_code=204, dependencies=[Depends(require_admin_token)])
+def start_admin_session(response: Response):
+    # Exchanges the admin token for an httpOnly cookie, e.g. for the event stream
+    start_session(response)
+
+
+@app.delete("/api/admin/session", status_code=204)
+def end_admin_session(response: Response):
+    end_session(response)
+
+
+@app.get("/api/admin/export/repayments", dependencies=[Depends(require_admin)])
+def export_repayments(
+    fmt: Literal[tuple(FORMATS)] = Query("csv", alias="format"),
+    layout: Literal[LAYOUTS] = "wide",
+):
+    # Streams from its own connection (see export.py), so no request session
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs the pyarrow package")
+    return export_response(engine, fmt, layout, date.today())
+
+
+if EVENTS_ENABLED:
+
+    @app.get(EVENTS_PATH, include_in_schema=False, dependencies=[Depends(require_admin)])
+    async def admin_events(request: Request):
+        # Pushed from the in-process event bus (see events.py); EventSource
+        # sends Last-Event-ID when it reconnects
+        return event_stream_response(request.headers.get("last-event-id"))
+
+
+if DB_ASYNC:
+    app.include_router(async_reads)
@@ -0,0 +1,271 @@
+# backend/metrics.py
+"""Request and database instrumentation, rendered in Prometheus text format.
+
+- MetricsMiddleware times every HTTP request, labelled by route template
+  (/api/accounts/{user_id}, not the raw path) so label sets stay bounded;
+- cursor hooks from instrument_engine() count statements and DB time, for
+  the process and for the request that ran them;
+- statements slower than SLOW_QUERY_MS (0 = off) are logged together with
+  the request they belong to.
+
+A route whose http_request_db_queries histogram grows with the size of its
+result is running one query per row (N+1). The import scripts get the same
+hooks through csv_ingest, which reports queries per chunk.
+
+Everything is per process: with several workers, each one serves its own.
+/metrics needs the admin token (admin.py), e.g. Prometheus' `authorization`.
+"""
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labelnames:
+            values = [((), 0.0)]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # labels -> [per-bucket counts..., sum, count]
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted((labels, list(state)) for labels, state in self._values.items())
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+                )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{suffix} {state[-1]}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request", ("method", "route")
+)
+QUERIES = Counter("db_queries_total", "SQL statements executed by this process")
+QUERY_SECONDS = Counter("db_query_seconds_total", "Time spent in SQL statements by this process")
+SLOW_QUERIES = Counter("db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS")
+
+REGISTRY = (REQUESTS, REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_DB_SECONDS, QUERIES, QUERY_SECONDS, SLOW_QUERIES)
+
+
+class QueryStats:
+    """Statements run on behalf of one request."""
+
+    __slots__ = ("request", "queries", "seconds")
+
+    def __init__(self, request: str):
+        self.request = request
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware; sync handlers see it too, as the threadpool copies the context
+_current_request: ContextVar[Optional[QueryStats]] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    QUERIES.inc()
+    QUERY_SECONDS.inc(elapsed)
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        # Statement text only: parameters can carry personal data
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            elapsed * 1000,
+            stats.request if stats is not None else "background",
+            " ".join(statement.split())[:1000],
+        )
+
+
+def instrument_engine(engine):
+    """Attach the cursor hooks to a sync Engine (for an AsyncEngine, pass .sync_engine)."""
+    if not METRICS_ENABLED or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_totals() -> tuple:
+    """(statements, seconds) executed by this process so far."""
+    return int(QUERIES.value()), QUERY_SECONDS.value()
+
+
+def _route_label(scope) -> str:
+    """Path template of the route that handled `scope`, without path parameters."""
+    route = scope.get("route")
+    if route is None:
+        # Older Starlette versions do not record the matched route in the scope
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and DB usage per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = _current_request.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            method, route = scope["method"], _route_label(scope)
+            REQUESTS.inc(1, method, route, str(status))
+            REQUEST_SECONDS.observe(elapsed, method, route)
+            REQUEST_QUERIES.observe(stats.queries, method, route)
+            REQUEST_DB_SECONDS.observe(stats.seconds, method, route)
+
+
+def _pool_lines(stats: dict) -> list:
+    gauges = {
+        "size": "db_pool_size",
+        "checked_out": "db_pool_checked_out",
+        "overflow": "db_pool_overflow",
+    }
+    counters = {
+        "checkouts": "db_pool_checkouts_total",
+        "wait_seconds_total": "db_pool_wait_seconds_total",
+    }
+    lines = []
+    for kind, names in (("gauge", gauges), ("counter", counters)):
+        for key, name in names.items():
+            if key in stats:
+                lines += [f"# TYPE {name} {kind}", f"{name} {_format_value(stats[key])}"]
+    return lines
+
+
+def render_metrics(pool: Optional[dict] = None) -> str:
+    """Every metric in Prometheus text exposition format; `pool` is database.pool_stats()."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    if pool:
+        lines.extend(_pool_lines(pool))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+# backend/migrations.py
+"""Versioned schema migrations, run as an explicit deploy step.
+
+The API does not touch the schema when it starts: run this first, and again
+after upgrading. Migrations run once each, in order, and are recorded in
+schema_migrations. Every step is idempotent, so databases created by
+earlier versions (tables made on import, columns added by hand with the
+add_*_columns helpers) upgrade cleanly too.
+
+New schema changes go at the end of MIGRATIONS with the next version number.
+
+Run from backend/:
+    python migrations.py            # apply pending migrations
+    python migrations.py --status   # list applied and pending migrations
+"""
+import argparse
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+
+from database import Base
+
+# Kept out of Base.metadata so create_all() and drop_all() leave it alone
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def create_tables(engine):
+    """Tables that do not exist yet; existing tables are not altered."""
+    import models  # noqa: F401  (registers every table on Base.metadata)
+
+    Base.metadata.create_all(bind=engine)
+
+
+def loan_status_columns(engine):
+    from sqlalchemy.orm import Session
+
+    from loan_status import add_status_columns, rebuild_loan_status
+
+    add_status_columns(engine)
+    with Session(engine) as session:
+        rebuild_loan_status(session)
+
+
+def scoring_columns(engine):
+    from scoring import add_scoring_columns
+
+    add_scoring_columns(engine)
+
+
+def application_ticket(engine):
+    from intake import add_ticket_column
+
+    add_ticket_column(engine)
+
+
+def application_decisions(engine):
+    from decisions import add_decision_columns
+
+    add_decision_columns(engine)
+
+
+def create_missing_indexes(bind):
+    """Create model indexes / unique constraints that an older schema lacks."""
+    import models  # noqa: F401
+
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        existing |= {uc["name"] for uc in inspector.get_unique_constraints(table.name)}
+        columns = {col["name"] for col in inspector.get_columns(table.name)}
+        with bind.begin() as conn:
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if not {col.name for col in index.columns} <= columns:
+                    # Added with its columns by that feature's add_*_columns() helper
+                    print(f"skipped {index.name}: {table.name} lacks some of its columns")
+                    continue
+                index.create(conn)
+            for constraint in table.constraints:
+                if constraint.__visit_name__ == "unique_constraint" and constraint.name not in existing:
+                    columns = ", ".join(col.name for col in constraint.columns)
+                    conn.execute(
+                        text(f"CREATE UNIQUE INDEX {constraint.name} ON {table.name} ({columns})")
+                    )
+
+
+# (version, name, step); never renumber or remove an entry once released
+MIGRATIONS = (
+    (1, "create tables", create_tables),
+    (2, "loans: materialised status columns", loan_status_columns),
+    (3, "scoring_table: scored_at, unique user_id", scoring_columns),
+    (4, "loan_applications: ticket", application_ticket),
+    (5, "loan_applications: decision columns", application_decisions),
+    (6, "indexes for hot queries", create_missing_indexes),
+    (7, "change_counters", create_tables),
+)
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def applied_versions(conn) -> set:
+    if not inspect(conn).has_table("schema_migrations"):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def schema_version(conn) -> int:
+    """Highest applied migration, 0 for a database that has never been migrated."""
+    return max(applied_versions(conn), default=0)
+
+
+def migrate(engine) -> list:
+    """Apply pending migrations in order; returns the names of those applied."""
+    _metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version in done:
+            continue
+        step(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow())
+            )
+        print(f"[MIGRATE] {version}: {name}")
+        applied.append(name)
+    return applied
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying any")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.connect() as conn:
+            done = applied_versions(conn)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:>3} {'applied' if version in done else 'pending':<8} {name}")
+    else:
+        applied = migrate(engine)
+        print(f"✅ Schema at version {LATEST_VERSION} ({len(applied)} migrations applied).")
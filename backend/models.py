@@ -3,8 +3,19 @@ from datetime import date, datetime, timedelta
 from typing import Literal, Optional
 
 from database import Base
-from pydantic import BaseModel
-from sqlalchemy import DECIMAL, Column, Date, ForeignKey, Integer, String
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import (
+    DECIMAL,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.orm import relationship
 
 
@@ -17,6 +28,11 @@ class Item(Base):
 
 class Account(Base):
     __tablename__ = "account_information"
+    __table_args__ = (
+        # Importer lookups: by email, then by (full_name, address)
+        Index("ix_account_information_email", "email"),
+        Index("ix_account_information_full_name_address", "full_name", "address"),
+    )
 
     user_id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(120), nullable=False)
@@ -33,6 +49,14 @@ class Account(Base):
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        # Latest loan per account: WHERE account_id = ? ORDER BY start_date DESC
+        Index("ix_loans_account_id_start_date", "account_id", "start_date"),
+        # Admin lookups by status, e.g. Active loans past their next due date
+        Index("ix_loans_status_next_due_date", "status", "next_due_date"),
+        # Incremental scoring: loans refreshed since the last scoring run
+        Index("ix_loans_status_updated_at", "status_updated_at"),
+    )
 
     loan_id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("account_information.user_id"), nullable=False)
@@ -40,12 +64,45 @@ class Loan(Base):
     start_date = Column(Date, nullable=False)
     term_months = Column(Integer, nullable=False)
 
+    # Materialised from loan_repayments by loan_status.py
+    next_due_date = Column(Date)
+    next_payment_amount = Column(DECIMAL(10, 2))
+    last_paid_date = Column(Date)
+    last_payment_amount = Column(DECIMAL(10, 2))
+    amount_paid = Column(DECIMAL(10, 2), nullable=False, default=0, server_default="0")
+    status = Column(String(10), nullable=False, default="Active", server_default="Active")
+    status_updated_at = Column(DateTime)
+
     account = relationship("Account", back_populates="loans")
-    repayments = relationship("LoanRepayment", back_populates="loan")
+    repayments = relationship(
+        "LoanRepayment",
+        back_populates="loan",
+        order_by="LoanRepayment.month_number",
+    )
 
 
 class LoanRepayment(Base):
     __tablename__ = "loan_repayments"
+    __table_args__ = (
+        # One row per month of a loan; also serves WHERE loan_id = ? ORDER BY month_number
+        UniqueConstraint("loan_id", "month_number", name="uq_loan_repayments_loan_id_month_number"),
+        # Covers the portfolio's per-month aggregates without reading whole rows
+        Index(
+            "ix_loan_repayments_month_number_dates",
+            "month_number",
+            "agreed_date",
+            "actual_date",
+        ),
+        # Reminder scans: unpaid (actual_date IS NULL) with agreed_date in a window.
+        # Covering, so planners do not prefer the month_number index above.
+        Index(
+            "ix_loan_repayments_actual_date_agreed_date",
+            "actual_date",
+            "agreed_date",
+            "loan_id",
+            "month_number",
+        ),
+    )
 
     repayment_id = Column(Integer, primary_key=True, index=True)
     loan_id = Column(Integer, ForeignKey("loans.loan_id"), nullable=False)
@@ -58,11 +115,64 @@ class LoanRepayment(Base):
 
 class Scoring(Base):
     __tablename__ = "scoring_table" 
+    __table_args__ = (
+        # Backs score-ordered keyset pages and score range filters
+        Index("ix_scoring_point_score_id", "point_score", "id"),
+        Index("ix_scoring_percentage_id", "percentage", "id"),
+        # One score per account; the conflict target for bulk upserts
+        UniqueConstraint("user_id", name="uq_scoring_table_user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True)
     point_score = Column(DECIMAL(10, 2))
     percentage = Column(DECIMAL(10, 4))
+    # Set by scoring.py; NULL for scores imported from CSV
+    scored_at = Column(DateTime)
+
+class ReminderSend(Base):
+    __tablename__ = "reminder_sends"
+    __table_args__ = (
+        # A repayment gets each reminder (7, 3, 1 days before) at most once
+        UniqueConstraint("repayment_id", "days_before", name="uq_reminder_sends_repayment_id_days_before"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    repayment_id = Column(Integer, ForeignKey("loan_repayments.repayment_id"), nullable=False)
+    days_before = Column(Integer, nullable=False)
+    sent_at = Column(DateTime, default=datetime.utcnow)
+
+class ImportCheckpoint(Base):
+    __tablename__ = "import_checkpoints"
+
+    # One row per in-progress CSV import, removed when the import completes
+    source = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    rows_done = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+# Counter name -> the tables whose writes bump it (see versions.py)
+CHANGE_COUNTERS = {
+    "accounts": ("account_information",),
+    "loans": ("loans", "loan_repayments"),
+    "scoring": ("scoring_table",),
+}
+
+class ChangeCounter(Base):
+    __tablename__ = "change_counters"
+
+    # One row per CHANGE_COUNTERS entry, created with the table
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+@event.listens_for(ChangeCounter.__table__, "after_create")
+def _create_counters(table, connection, **kw):
+    now = datetime.utcnow()
+    connection.execute(
+        table.insert(), [{"name": name, "version": 0, "updated_at": now} for name in CHANGE_COUNTERS]
+    )
 
 # -------- Pydantic schemas (response / request models) --------
 
@@ -78,8 +188,7 @@ class AccountOut(BaseModel):
     monthly_income: float
     house_rent: float | None = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class LoanSummaryOut(BaseModel):
     loan_id: int
@@ -93,8 +202,7 @@ class LoanSummaryOut(BaseModel):
     status: Literal["Active", "Overdue", "Closed"]
     reminder_date: Optional[date] = None 
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PaymentHistoryPoint(BaseModel):
     month_number: int
@@ -104,21 +212,45 @@ class PaymentHistoryPoint(BaseModel):
     amount_repaid: float | None = None
     status: Literal["Paid", "Upcoming", "Missed"]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class DashboardOut(BaseModel):
+    account: AccountOut
+    loan_summary: Optional[LoanSummaryOut] = None
+    payment_history: list[PaymentHistoryPoint] = []
 
 class ScoringOut(BaseModel):
     user_id: int
     point_score: float
     percentage: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class MonthlyRepaymentStats(BaseModel):
+    month_number: int
+    due: int
+    on_time: int
+    late: int
+    missed: int
+    on_time_rate: float
+    late_rate: float
+    missed_rate: float
+    average_days_late: float
+
+class PortfolioOut(BaseModel):
+    as_of: date
+    total_loans: int
+    active: int
+    overdue: int
+    closed: int
+    outstanding_balance: float
+    average_days_late: float
+    by_month: list[MonthlyRepaymentStats] = []
 
 
 class LoanApplication(BaseModel):
     fullName: str
-    dob: str
+    dob: date
     email: str
     phone: str
     monthlyIncome: float
@@ -128,9 +260,19 @@ class LoanApplication(BaseModel):
     referencePhone: str
     referenceEmail: str | None = None
 
+class ApplicationStatusOut(BaseModel):
+    ticket: str
+    status: Literal["queued", "written", "failed"]
+    application_id: Optional[int] = None
+    error: Optional[str] = None
+
 
 class LoanApplicationModel(Base):
     __tablename__ = "loan_applications"
+    __table_args__ = (
+        # Decision workers walk pending applications in id order
+        Index("ix_loan_applications_decision_id", "decision", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -146,3 +288,12 @@ class LoanApplicationModel(Base):
     reference_relationship = Column(String(120), nullable=False)
     reference_phone = Column(String(20), nullable=False)
     reference_email = Column(String(255), nullable=True)
+
+    # Set by the queued intake (intake.py); NULL for applications written directly
+    ticket = Column(String(32), nullable=True, unique=True, index=True)
+
+    # Set by decisions.py: pending -> approved (with a tier) or review
+    decision = Column(String(10), nullable=False, default="pending", server_default="pending")
+    tier_amount = Column(DECIMAL(10, 2))
+    strain_ratio = Column(DECIMAL(10, 4))
+    decided_at = Column(DateTime)
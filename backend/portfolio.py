@@ -0,0 +1,105 @@
+# backend/portfolio.py
+"""Portfolio-wide loan and repayment figures for the admin dashboard.
+
+Everything is aggregated in the database with a handful of GROUP BY queries
+over the materialised loan columns (see loan_status.py) and loan_repayments,
+so the cost does not grow with per-loan Python work. The result is cached
+under PORTFOLIO_KEY and dropped whenever a loan or repayment is written.
+"""
+from datetime import date
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from cache import PORTFOLIO_KEY, cache
+from loan_status import status_expression
+from models import Loan, LoanRepayment, MonthlyRepaymentStats, PortfolioOut
+from versions import current_versions
+
+
+def _days_late(dialect_name: str):
+    """actual_date - agreed_date in days, in the dialect's date arithmetic."""
+    if dialect_name == "sqlite":
+        return func.julianday(LoanRepayment.actual_date) - func.julianday(LoanRepayment.agreed_date)
+    return func.datediff(LoanRepayment.actual_date, LoanRepayment.agreed_date)
+
+
+def _rate(count: int, due: int) -> float:
+    return round(count / due, 4) if due else 0.0
+
+
+def portfolio_stats(session: Session, today: date) -> PortfolioOut:
+    """Loan status counts, outstanding balance and repayment performance by month."""
+    # 1) Loans by status (Overdue derived from next_due_date, as in loan_status())
+    status = status_expression(today).label("status")
+    counts = dict(session.execute(select(status, func.count()).group_by(status)).all())
+
+    outstanding = session.execute(
+        select(func.coalesce(func.sum(Loan.original_amount - Loan.amount_paid), 0)).where(
+            Loan.status != "Closed"
+        )
+    ).scalar_one()
+
+    # 2) Repayments by month number. A repayment is due once it has been paid
+    #    or its agreed date has passed; later ones are not counted yet.
+    paid = LoanRepayment.actual_date.isnot(None)
+    late = and_(paid, LoanRepayment.actual_date > LoanRepayment.agreed_date)
+    missed = and_(LoanRepayment.actual_date.is_(None), LoanRepayment.agreed_date < today)
+    days_late = _days_late(session.get_bind().dialect.name)
+
+    rows = session.execute(
+        select(
+            LoanRepayment.month_number,
+            func.sum(case((paid, 1), else_=0)).label("paid"),
+            func.sum(case((late, 1), else_=0)).label("late"),
+            func.sum(case((missed, 1), else_=0)).label("missed"),
+            func.sum(case((late, days_late), else_=0)).label("days_late"),
+        )
+        .group_by(LoanRepayment.month_number)
+        .order_by(LoanRepayment.month_number)
+    ).all()
+
+    by_month = []
+    total_late = total_days_late = 0
+    for row in rows:
+        paid_count, late_count, missed_count = int(row.paid or 0), int(row.late or 0), int(row.missed or 0)
+        on_time_count = paid_count - late_count
+        due = paid_count + missed_count
+        by_month.append(
+            MonthlyRepaymentStats(
+                month_number=row.month_number,
+                due=due,
+                on_time=on_time_count,
+                late=late_count,
+                missed=missed_count,
+                on_time_rate=_rate(on_time_count, due),
+                late_rate=_rate(late_count, due),
+                missed_rate=_rate(missed_count, due),
+                average_days_late=round(float(row.days_late or 0) / late_count, 2) if late_count else 0.0,
+            )
+        )
+        total_late += late_count
+        total_days_late += float(row.days_late or 0)
+
+    return PortfolioOut(
+        as_of=today,
+        total_loans=sum(counts.values()),
+        active=counts.get("Active", 0),
+        overdue=counts.get("Overdue", 0),
+        closed=counts.get("Closed", 0),
+        outstanding_balance=round(float(outstanding), 2),
+        average_days_late=round(total_days_late / total_late, 2) if total_late else 0.0,
+        by_month=by_month,
+    )
+
+
+def cached_portfolio_stats(session: Session, today: date) -> PortfolioOut:
+    """portfolio_stats() read through the cache; recomputed when the date changes."""
+    # Clears a per-process cache that predates another process's writes
+    current_versions(session)
+    cached = cache.get(PORTFOLIO_KEY)
+    if cached is not None and cached.as_of == today:
+        return cached
+    stats = portfolio_stats(session, today)
+    cache.set(PORTFOLIO_KEY, stats)
+    return stats
@@ -0,0 +1,104 @@
+# backend/query_plans.py
+"""EXPLAIN the hot endpoint and importer queries and fail on full table scans.
+
+Run from backend/ against a populated database (planners may pick a scan for
+near-empty tables):
+    python query_plans.py                   # exit code 1 if any query scans a table
+    python query_plans.py --create-missing  # first add indexes missing from an older schema
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+import models
+from database import engine
+from main import (
+    ScoringParams,
+    _account_select,
+    _dashboard_select,
+    _latest_loan_id,
+    _latest_loan_select,
+    _scoring_select,
+)
+from migrations import create_missing_indexes
+from schedule import schedule_select
+
+
+def _scoring_params(**overrides) -> ScoringParams:
+    params = dict(
+        limit=100,
+        cursor=None,
+        sort="id",
+        min_score=None,
+        max_score=None,
+        min_percentage=None,
+        max_percentage=None,
+    )
+    params.update(overrides)
+    return ScoringParams(**params)
+
+
+def hot_queries() -> dict:
+    """Name -> statement for every query on a request or import hot path."""
+    Account, Loan, LoanRepayment = models.Account, models.Loan, models.LoanRepayment
+    return {
+        "account by user_id": _account_select(1),
+        "latest loan for account": _latest_loan_select(1),
+        "schedule of latest loan": schedule_select(_latest_loan_id(1)),
+        "dashboard account + latest loan": _dashboard_select(1),
+        "scoring page by id": _scoring_select(_scoring_params(cursor="100")),
+        "scoring page by score": _scoring_select(
+            _scoring_params(sort="-point_score", cursor="500.00_100", min_score=10)
+        ),
+        "account by email": select(Account.user_id).where(Account.email == "a@example.com"),
+        "account by name + address": select(Account.user_id).where(
+            Account.full_name == "A", Account.address == "1 High Street"
+        ),
+        "overdue loans": select(Loan.loan_id).where(
+            Loan.status == "Active", Loan.next_due_date < date.today()
+        ),
+        "unpaid repayments due in reminder window": select(
+            LoanRepayment.repayment_id, LoanRepayment.loan_id, LoanRepayment.month_number
+        )
+        .where(
+            LoanRepayment.actual_date.is_(None),
+            LoanRepayment.agreed_date.between(date.today(), date.today() + timedelta(days=7)),
+        )
+        .order_by(LoanRepayment.agreed_date, LoanRepayment.repayment_id),
+    }
+
+
+def full_scans(conn, stmt) -> list:
+    """Tables the plan reads in full, as reported by the dialect's EXPLAIN."""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).all()
+        # detail is e.g. "SCAN loans" vs "SEARCH loans USING INDEX ..."
+        return [row.detail for row in plan if row.detail.startswith("SCAN ")]
+    plan = conn.exec_driver_sql("EXPLAIN " + sql).mappings().all()
+    return [f"{row['table']} (type=ALL)" for row in plan if row["type"] == "ALL"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check hot queries for full table scans")
+    parser.add_argument("--create-missing", action="store_true", help="create missing indexes first")
+    args = parser.parse_args()
+
+    if args.create_missing:
+        create_missing_indexes(engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt in hot_queries().items():
+            scans = full_scans(conn, stmt)
+            status = "FULL SCAN: " + "; ".join(scans) if scans else "ok"
+            print(f"{name:<42} {status}")
+            failures += bool(scans)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# backend/reminders.py
+"""Repayment reminders, sent REMINDER_DAYS_BEFORE (7, 3 and 1) days before due dates.
+
+Each run looks at unpaid repayments falling due within the next
+max(REMINDER_DAYS_BEFORE) days, via the (actual_date, agreed_date) index,
+walking that window in keyset batches so only the window's rows are read.
+A repayment's current reminder is the nearest one that has come round: due
+in 5 days -> the 7-day reminder, due in 2 days -> the 3-day one. Reminders
+missed while the scheduler was down are skipped rather than sent together.
+
+A reminder_sends row is committed before each batch goes out, and its
+(repayment_id, days_before) pair is unique, so nothing is sent twice even if
+runs overlap or a run is retried. If the sender raises, the batch's rows are
+removed again so the next run retries them. Run one scheduler at a time;
+a second one gets an IntegrityError and sends nothing for that batch.
+
+REMINDER_SENDER picks the channel: "log" (default), "file" (JSON lines in
+REMINDER_FILE, a stand-in for tests) or "package.module:Class" for a real
+sender, whose send(reminders) receives one batch at a time.
+
+Run from backend/, e.g. daily from cron:
+    python reminders.py
+    python reminders.py --today 2025-06-30   # as if run on that date
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+from sqlalchemy import and_, delete, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from models import Account, Loan, LoanRepayment, ReminderSend
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+REMINDER_DAYS_BEFORE = (7, 3, 1)
+
+REMINDER_SENDER = os.getenv("REMINDER_SENDER", "log")
+REMINDER_FILE = os.getenv("REMINDER_FILE", os.path.join(os.path.dirname(__file__), "reminders.jsonl"))
+
+
+class Reminder(NamedTuple):
+    repayment_id: int
+    loan_id: int
+    month_number: int
+    due_date: date
+    days_before: int
+    amount: float
+    full_name: str
+    email: Optional[str]
+    phone_number: str
+
+
+class LogSender:
+    """Writes reminders to the log; for development."""
+
+    def send(self, reminders: list):
+        for reminder in reminders:
+            logger.info(
+                "Reminder: loan %s month %s (£%.2f) due %s -> %s",
+                reminder.loan_id,
+                reminder.month_number,
+                reminder.amount,
+                reminder.due_date,
+                reminder.email or reminder.phone_number,
+            )
+
+
+class FileSender:
+    """Appends reminders as JSON lines to `path`; a stand-in for tests."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, reminders: list):
+        with open(self.path, "a", encoding="utf-8") as out:
+            for reminder in reminders:
+                out.write(json.dumps(reminder._asdict(), default=str) + "\n")
+
+
+def load_sender(name: str = REMINDER_SENDER):
+    if name == "log":
+        return LogSender()
+    if name == "file":
+        return FileSender(REMINDER_FILE)
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def days_before_due(days_until_due: int) -> Optional[int]:
+    """Which reminder is current for a repayment due in `days_until_due` days."""
+    current = [days for days in REMINDER_DAYS_BEFORE if days >= days_until_due]
+    return min(current) if current and days_until_due >= 0 else None
+
+
+def _window_batches(session: Session, today: date, batch_size: int):
+    """Unpaid repayments due between today and the furthest reminder, in keyset batches."""
+    monthly = (Loan.original_amount / Loan.term_months).label("amount")
+    stmt = (
+        select(
+            LoanRepayment.repayment_id,
+            LoanRepayment.loan_id,
+            LoanRepayment.month_number,
+            LoanRepayment.agreed_date,
+            monthly,
+            Account.full_name,
+            Account.email,
+            Account.phone_number,
+        )
+        .join(Loan, Loan.loan_id == LoanRepayment.loan_id)
+        .join(Account, Account.user_id == Loan.account_id)
+        .where(
+            LoanRepayment.actual_date.is_(None),
+            LoanRepayment.agreed_date.between(today, today + timedelta(days=max(REMINDER_DAYS_BEFORE))),
+        )
+        .order_by(LoanRepayment.agreed_date, LoanRepayment.repayment_id)
+        .limit(batch_size)
+    )
+
+    last = None
+    while True:
+        page = stmt
+        if last is not None:
+            page = stmt.where(
+                or_(
+                    LoanRepayment.agreed_date > last.agreed_date,
+                    and_(
+                        LoanRepayment.agreed_date == last.agreed_date,
+                        LoanRepayment.repayment_id > last.repayment_id,
+                    ),
+                )
+            )
+        rows = session.execute(page).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+
+
+def _unsent(session: Session, rows, today: date) -> list:
+    """Reminders for `rows` that are due now and have no reminder_sends record yet."""
+    candidates = []
+    for row in rows:
+        days = days_before_due((row.agreed_date - today).days)
+        if days is not None:
+            candidates.append(
+                Reminder(
+                    repayment_id=row.repayment_id,
+                    loan_id=row.loan_id,
+                    month_number=row.month_number,
+                    due_date=row.agreed_date,
+                    days_before=days,
+                    amount=round(float(row.amount), 2),
+                    full_name=row.full_name,
+                    email=row.email,
+                    phone_number=row.phone_number,
+                )
+            )
+    if not candidates:
+        return []
+
+    sent = set(
+        session.execute(
+            select(ReminderSend.repayment_id, ReminderSend.days_before).where(
+                ReminderSend.repayment_id.in_([reminder.repayment_id for reminder in candidates])
+            )
+        ).all()
+    )
+    return [r for r in candidates if (r.repayment_id, r.days_before) not in sent]
+
+
+def send_due_reminders(session: Session, sender, today: date, batch_size: int = BATCH_SIZE) -> int:
+    """Send every reminder due on `today` that has not been sent; returns how many went out."""
+    table = ReminderSend.__table__
+    total = 0
+    for rows in _window_batches(session, today, batch_size):
+        reminders = _unsent(session, rows, today)
+        if not reminders:
+            continue
+
+        # Record first: a crash after this commit loses a reminder rather than repeating it
+        keys = [(reminder.repayment_id, reminder.days_before) for reminder in reminders]
+        session.execute(
+            table.insert(),
+            [{"repayment_id": repayment_id, "days_before": days} for repayment_id, days in keys],
+        )
+        session.commit()
+
+        try:
+            sender.send(reminders)
+        except Exception:
+            session.execute(
+                delete(table).where(tuple_(table.c.repayment_id, table.c.days_before).in_(keys))
+            )
+            session.commit()
+            raise
+        total += len(reminders)
+    return total
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Send repayment reminders that are due")
+    parser.add_argument("--today", type=date.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with Session(engine) as session:
+        count = send_due_reminders(session, load_sender(), args.today or date.today(), args.batch_size)
+    print(f"✅ Sent {count} reminders.")
@@ -0,0 +1,38 @@
+# backend/responses.py
+"""JSON responses rendered with orjson.
+
+FastJSONResponse is the app's default response class. Handlers on hot paths
+return it directly with content that is already shaped for the client
+(dicts built from row tuples, or schema instances they constructed
+themselves): FastAPI then skips its response_model validation pass, which
+only feeds the OpenAPI docs for those routes.
+"""
+from decimal import Decimal
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    # Types orjson does not handle itself
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if type(value).__module__ == "numpy":
+        # Scalars and arrays, without importing numpy here or using orjson's
+        # OPT_SERIALIZE_NUMPY, whose lazy setup races between threads
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
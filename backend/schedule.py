@@ -0,0 +1,60 @@
+# backend/schedule.py
+"""Compact read model of a loan's repayment schedule.
+
+Reads for the payment history never build LoanRepayment objects: a Core
+select returns plain tuples, which LoanSchedule keeps as one tuple per
+column (month_number, agreed_date, ...) in month order. It has no
+per-instance __dict__, is not tracked by a session, and is what the loan
+cache stores.
+"""
+from sqlalchemy import select
+
+from models import Loan, LoanRepayment
+
+SCHEDULE_COLUMNS = ("month_number", "agreed_date", "actual_date", "amount_repaid")
+
+
+class LoanSchedule:
+    __slots__ = ("loan_id", *SCHEDULE_COLUMNS)
+
+    def __init__(self, loan_id: int, month_number=(), agreed_date=(), actual_date=(), amount_repaid=()):
+        self.loan_id = loan_id
+        self.month_number = tuple(month_number)
+        self.agreed_date = tuple(agreed_date)
+        self.actual_date = tuple(actual_date)
+        self.amount_repaid = tuple(amount_repaid)
+
+    @classmethod
+    def from_rows(cls, rows) -> "LoanSchedule":
+        """From schedule_select() rows: (loan_id, month_number, agreed_date, actual_date, amount_repaid)."""
+        loan_id = rows[0][0]
+        # An outer-joined loan without repayments comes back as one row of NULLs
+        months = [row[1:] for row in rows if row[1] is not None]
+        return cls(loan_id, *zip(*months)) if months else cls(loan_id)
+
+    def __len__(self) -> int:
+        return len(self.month_number)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LoanSchedule):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"LoanSchedule(loan_id={self.loan_id!r}, months={len(self)})"
+
+
+def schedule_select(loan_id):
+    """Rows for LoanSchedule.from_rows(); `loan_id` may be a value or a scalar subquery."""
+    return (
+        select(
+            Loan.loan_id,
+            LoanRepayment.month_number,
+            LoanRepayment.agreed_date,
+            LoanRepayment.actual_date,
+            LoanRepayment.amount_repaid,
+        )
+        .outerjoin(LoanRepayment, LoanRepayment.loan_id == Loan.loan_id)
+        .where(Loan.loan_id == loan_id)
+        .order_by(LoanRepayment.month_number)
+    )
@@ -0,0 +1,230 @@
+# backend/scoring.py
+"""Recompute scoring_table from each account's repayment history.
+
+Every repayment that has fallen due earns points: ON_TIME_POINTS when paid on
+or before its agreed date, LATE_POINTS when paid after it, MISSED_POINTS when
+still unpaid past it. An account's point_score is the sum over all its loans
+(never below 0), and percentage is point_score / MAX_POINTS capped at 1, so a
+12-month loan repaid on time scores 1200 / 1.0 like the imported CSV scores.
+
+The database only counts each account's on-time / late / missed repayments
+(one GROUP BY); the points are computed from those counts with NumPy over all
+accounts at once and written with batched upserts keyed on
+scoring_table.user_id.
+
+Run from backend/:
+    python scoring.py                # rescore every account with repayments
+    python scoring.py --incremental  # only accounts whose loans changed, or whose
+                                     # repayments fell due unpaid, since the last run
+"""
+import argparse
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, case, func, inspect, not_, select, text, union
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+
+import versions  # noqa: F401  (score upserts bump the scoring counter)
+from events import EVENTS_MAX_ITEMS, queue_events
+from models import Loan, LoanRepayment, Scoring
+
+BATCH_SIZE = 1000
+
+ON_TIME_POINTS = 100
+LATE_POINTS = 50
+MISSED_POINTS = -100
+MAX_POINTS = 1200
+
+OUTCOMES = ("on_time", "late", "missed")
+SCORE_COLUMNS = ("user_id", "point_score", "percentage", "scored_at")
+
+
+def load_repayment_counts(session: Session, today: date, account_ids=None) -> pd.DataFrame:
+    """on_time / late / missed repayment counts per account_id, for these accounts (or all)."""
+    paid = LoanRepayment.actual_date.isnot(None)
+    late = and_(paid, LoanRepayment.actual_date > LoanRepayment.agreed_date)
+    missed = and_(LoanRepayment.actual_date.is_(None), LoanRepayment.agreed_date < today)
+    stmt = (
+        select(
+            Loan.account_id,
+            func.sum(case((and_(paid, not_(late)), 1), else_=0)),
+            func.sum(case((late, 1), else_=0)),
+            func.sum(case((missed, 1), else_=0)),
+        )
+        .join(LoanRepayment, LoanRepayment.loan_id == Loan.loan_id)
+        .group_by(Loan.account_id)
+    )
+
+    if account_ids is None:
+        rows = session.execute(stmt).all()
+    else:
+        account_ids = sorted({int(account_id) for account_id in account_ids})
+        rows = []
+        for i in range(0, len(account_ids), BATCH_SIZE):
+            batch = account_ids[i : i + BATCH_SIZE]
+            rows.extend(session.execute(stmt.where(Loan.account_id.in_(batch))).all())
+
+    counts = pd.DataFrame(rows, columns=["account_id", *OUTCOMES])
+    return counts.fillna(0).astype("int64")
+
+
+def round_to_scale(scores: pd.DataFrame) -> pd.DataFrame:
+    """point_score and percentage rounded to their column's scale.
+
+    MySQL's DECIMAL columns would round them anyway, SQLite keeps every
+    digit; every writer rounds first so both store the same values.
+    """
+    columns = Scoring.__table__.c
+    return scores.assign(
+        point_score=scores["point_score"].round(columns.point_score.type.scale),
+        percentage=scores["percentage"].round(columns.percentage.type.scale),
+    )
+
+
+def compute_scores(counts: pd.DataFrame) -> pd.DataFrame:
+    """One row per account: user_id, point_score, percentage."""
+    weights = np.array([ON_TIME_POINTS, LATE_POINTS, MISSED_POINTS], dtype="int64")
+    points = counts[list(OUTCOMES)].to_numpy(dtype="int64") @ weights
+    point_score = np.clip(points, 0, None).astype("float64")
+    return round_to_scale(
+        pd.DataFrame(
+            {
+                "user_id": counts["account_id"].to_numpy(dtype="int64"),
+                "point_score": point_score,
+                "percentage": np.minimum(point_score / MAX_POINTS, 1),
+            }
+        )
+    )
+
+
+def _upsert_statement(dialect_name: str):
+    """INSERT into scoring_table that updates the existing row for the same user_id."""
+    table = Scoring.__table__
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={col: stmt.excluded[col] for col in SCORE_COLUMNS[1:]},
+        )
+    stmt = mysql.insert(table)
+    return stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in SCORE_COLUMNS[1:]})
+
+
+def upsert_scores(
+    session: Session,
+    scores: pd.DataFrame,
+    scored_at=None,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Write `scores` (user_id, point_score, percentage), one statement per `batch_size` rows."""
+    scores = scores.assign(scored_at=scored_at)
+    dialect_name = session.get_bind().dialect.name
+    statement = _upsert_statement(dialect_name)
+    records = [
+        dict(zip(SCORE_COLUMNS, values))
+        for values in scores[list(SCORE_COLUMNS)].astype(object).itertuples(index=False, name=None)
+    ]
+    for i in range(0, len(records), batch_size):
+        batch = records[i : i + batch_size]
+        if dialect_name == "sqlite":
+            # In-process driver: executemany costs no round trips
+            session.execute(statement, batch)
+        else:
+            # One multi-row INSERT ... VALUES (...), (...) per batch over the network
+            session.execute(statement.values(batch))
+    queue_events(
+        session,
+        "score.changed",
+        [{col: record[col] for col in SCORE_COLUMNS[:3]} for record in records[:EVENTS_MAX_ITEMS]],
+        count=len(records),
+    )
+    return len(records)
+
+
+def changed_accounts(session: Session, since: datetime, today: date) -> list[int]:
+    """Accounts whose score may have changed since `since`.
+
+    Those with a loan whose repayments were refreshed after it, and those
+    with a repayment that has become missed since: unpaid, agreed on a day
+    from `since` up to yesterday. Nothing is written when that happens.
+    """
+    refreshed = select(Loan.account_id).where(Loan.status_updated_at > since)
+    lapsed = (
+        select(Loan.account_id)
+        .join(LoanRepayment, LoanRepayment.loan_id == Loan.loan_id)
+        .where(
+            LoanRepayment.actual_date.is_(None),
+            LoanRepayment.agreed_date >= since.date(),
+            LoanRepayment.agreed_date < today,
+        )
+    )
+    return session.execute(union(refreshed, lapsed)).scalars().all()
+
+
+def run_scoring(session: Session, incremental: bool = False, today: date | None = None) -> int:
+    """Rescore accounts and commit; returns how many scores were written."""
+    today = today or date.today()
+    # Taken before reading, so loans refreshed during the run are picked up next time
+    started = datetime.utcnow()
+
+    account_ids = None
+    if incremental:
+        last_run = session.execute(select(func.max(Scoring.scored_at))).scalar()
+        if last_run is not None:
+            account_ids = changed_accounts(session, last_run, today)
+            if not account_ids:
+                return 0
+
+    scores = compute_scores(load_repayment_counts(session, today, account_ids))
+    written = upsert_scores(session, scores, scored_at=started)
+    session.commit()
+    return written
+
+
+def add_scoring_columns(engine):
+    """Add scored_at and the unique user_id index to a scoring_table created before them.
+
+    The original importer's ON DUPLICATE KEY UPDATE had no unique key to hit,
+    so every re-run added another row per account. Before the index is
+    created, each account keeps only its newest (highest id) score.
+    """
+    inspector = inspect(engine)
+    existing = {col["name"] for col in inspector.get_columns("scoring_table")}
+    indexes = {index["name"] for index in inspector.get_indexes("scoring_table")}
+    indexes |= {uc["name"] for uc in inspector.get_unique_constraints("scoring_table")}
+    with engine.begin() as conn:
+        if "scored_at" not in existing:
+            column = CreateColumn(Scoring.__table__.c.scored_at).compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE scoring_table ADD COLUMN {column}"))
+        if "uq_scoring_table_user_id" not in indexes:
+            # The derived table lets MySQL delete from the table the subquery reads
+            removed = conn.execute(
+                text(
+                    "DELETE FROM scoring_table WHERE user_id IS NOT NULL AND id NOT IN ("
+                    " SELECT id FROM (SELECT MAX(id) AS id FROM scoring_table"
+                    " WHERE user_id IS NOT NULL GROUP BY user_id) AS newest)"
+                )
+            ).rowcount
+            if removed:
+                print(f"removed {removed} duplicate scoring_table rows")
+            conn.execute(text("CREATE UNIQUE INDEX uq_scoring_table_user_id ON scoring_table (user_id)"))
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Recompute scoring_table from repayments")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rescore accounts whose repayments changed since the last run",
+    )
+    args = parser.parse_args()
+
+    add_scoring_columns(engine)
+    with Session(engine) as session:
+        count = run_scoring(session, incremental=args.incremental)
+    print(f"✅ Scored {count} accounts.")
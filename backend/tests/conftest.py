@@ -0,0 +1,75 @@
+# backend/tests/conftest.py
+"""Tests run against a throwaway SQLite file, never the configured MySQL.
+
+Run from backend/:  python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# database.py builds its engine at import, so point it at SQLite first
+_DB_DIR = tempfile.mkdtemp(prefix="aidmakers-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'app.db')}"
+os.environ.setdefault("EVENTS_ENABLED", "true")
+os.environ.setdefault("EVENTS_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """A fresh, empty SQLite database."""
+    from sqlalchemy import create_engine
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrated_engine():
+    """The app's engine on a fully migrated, empty database."""
+    from database import Base, engine
+    from migrations import _metadata, migrate
+
+    migrate(engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    _metadata.drop_all(bind=engine)
+    import versions
+
+    versions.clear_versions()
+
+
+@pytest.fixture
+def loan_account(migrated_engine):
+    """Account 1 with a 3-month loan (id 1) started 2025-01-01 and nothing repaid yet."""
+    from datetime import date
+
+    from sqlalchemy.orm import Session
+
+    from cache import cache
+    from models import Account, Loan, LoanRepayment
+
+    with Session(migrated_engine) as session:
+        session.add(
+            Account(
+                user_id=1,
+                full_name="Ada Lovelace",
+                dob=date(1990, 1, 1),
+                age=35,
+                phone_number="0123",
+                email="ada@example.com",
+                monthly_income=3000,
+                house_rent=900,
+            )
+        )
+        session.add(Loan(loan_id=1, account_id=1, original_amount=300, start_date=date(2025, 1, 1), term_months=3))
+        session.add_all(
+            LoanRepayment(loan_id=1, month_number=month, agreed_date=date(2025, 1 + month, 1))
+            for month in (1, 2, 3)
+        )
+        session.commit()
+    yield 1
+    cache.clear()
@@ -0,0 +1,111 @@
+# backend/tests/test_admin.py
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import admin
+from main import app
+
+client = TestClient(app)
+
+EXPORT = "/api/admin/export/repayments?format=csv&layout=long"
+
+
+def test_export_is_disabled_without_an_admin_token(monkeypatch, loan_account):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+
+    assert client.get(EXPORT).status_code == 404
+    assert client.get(EXPORT, headers={"X-Admin-Token": ""}).status_code == 404
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [{}, {"X-Admin-Token": "wrong"}, {"Authorization": "Bearer wrong"}, {"Authorization": "Basic s3cret"}],
+)
+def test_export_rejects_a_missing_or_wrong_token(monkeypatch, loan_account, headers):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+
+    assert client.get(EXPORT, headers=headers).status_code == 401
+
+
+@pytest.mark.parametrize("headers", [{"X-Admin-Token": "s3cret"}, {"Authorization": "Bearer s3cret"}])
+def test_export_streams_with_the_admin_token(monkeypatch, loan_account, headers):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+
+    response = client.get(EXPORT, headers=headers)
+
+    assert response.status_code == 200
+    assert response.text.splitlines()[0].startswith("loan_id,user_id,month_number")
+
+
+def test_event_stream_requires_the_admin_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    assert client.get("/api/admin/events").status_code == 404
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/admin/events").status_code == 401
+    # Tokens are not taken from the URL
+    assert client.get("/api/admin/events", params={"access_token": "s3cret"}).status_code == 401
+
+
+def test_session_cookie_is_issued_for_the_token_only(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    browser = TestClient(app, base_url="https://testserver")
+
+    assert browser.post("/api/admin/session").status_code == 401
+    assert browser.post("/api/admin/session", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    response = browser.post("/api/admin/session", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 204
+    cookie = response.headers["set-cookie"].lower()
+    assert "httponly" in cookie and "secure" in cookie and "path=/api/admin" in cookie
+    assert "s3cret" not in cookie
+
+
+def test_session_cookie_admits_to_admin_endpoints(monkeypatch, loan_account):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    browser = TestClient(app, base_url="https://testserver")
+    browser.post("/api/admin/session", headers={"X-Admin-Token": "s3cret"})
+
+    assert browser.get(EXPORT).status_code == 200
+
+    browser.delete("/api/admin/session")
+    assert browser.get(EXPORT).status_code == 401
+
+
+def test_session_cookie_is_rejected_when_forged_expired_or_the_token_changed(monkeypatch, loan_account):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    expired = str(int(time.time()) - 1)
+    cookies = {
+        "forged": f"{int(time.time()) + 3600}.{'0' * 64}",
+        "expired": f"{expired}.{admin._signature(expired)}",
+    }
+    for value in cookies.values():
+        browser = TestClient(app, base_url="https://testserver", cookies={admin.SESSION_COOKIE: value})
+        assert browser.get(EXPORT).status_code == 401
+
+    browser = TestClient(app, base_url="https://testserver")
+    browser.post("/api/admin/session", headers={"X-Admin-Token": "s3cret"})
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "rotated")
+    assert browser.get(EXPORT).status_code == 401
+
+
+def test_metrics_require_the_admin_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text or "# TYPE" in response.text
+
+
+def test_portfolio_requires_the_admin_token(monkeypatch, loan_account):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    assert client.get("/api/admin/portfolio").status_code == 404
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/admin/portfolio").status_code == 401
+    response = client.get("/api/admin/portfolio", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.json()["total_loans"] == 1
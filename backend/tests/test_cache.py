@@ -0,0 +1,156 @@
+from datetime import date
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import admin
+import cache as cache_module
+from cache import PORTFOLIO_KEY, MemoryCache, cache, latest_loan_key, loan_key
+from import_loans_from_csv import import_loans_from_csv
+from import_scoring_from_csv import import_scoring_rows
+from main import app
+from models import LoanRepayment
+from scoring import run_scoring
+
+client = TestClient(app)
+
+DASHBOARD = "/api/accounts/1/dashboard"
+HISTORY = "/api/accounts/1/payment-history"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    memory = MemoryCache(max_entries=10, ttl=60)
+
+    memory.set("a", 1)
+    clock.now += 59
+    assert memory.get("a") == 1
+    clock.now += 2
+    assert memory.get("a") is None
+
+    # Setting again restarts the TTL
+    memory.set("a", 2)
+    clock.now += 59
+    memory.set("a", 3)
+    clock.now += 59
+    assert memory.get("a") == 3
+
+
+def test_least_recently_used_entry_is_evicted():
+    memory = MemoryCache(max_entries=3, ttl=60)
+    for key in "abc":
+        memory.set(key, key)
+
+    assert memory.get("a") == "a"  # now the most recently used
+    memory.set("d", "d")
+
+    assert memory.get("b") is None
+    assert [memory.get(key) for key in "acd"] == ["a", "c", "d"]
+
+    memory.set("c", "C")  # overwriting counts as a use
+    memory.set("e", "e")
+    assert memory.get("a") is None
+    assert [memory.get(key) for key in "cde"] == ["C", "d", "e"]
+
+
+def _second_loan_csv(path) -> str:
+    """One more loan for account 1 (matched by email), starting after its first one."""
+    row = {
+        "Name": "Ada Lovelace",
+        "Address": "",
+        "Contact number": "0123",
+        "email": "ada@example.com",
+        "Loan amount": 600,
+    }
+    for month in range(1, 13):
+        row[f"Month{month}_AgreedDate"] = f"2026-{month:02d}-07"
+        row[f"Month{month}_ActualDate"] = None
+        row[f"Month{month}_AmountRepaid"] = None
+    csv = path / "loans.csv"
+    pd.DataFrame([row]).to_csv(csv, index=False)
+    return str(csv)
+
+
+def test_loan_import_invalidates_the_cached_dashboard(loan_account, tmp_path):
+    first = client.get(DASHBOARD)
+    assert first.json()["loan_summary"]["loan_id"] == 1
+    history = client.get(HISTORY)
+    assert len(history.json()) == 3
+    assert cache.get(latest_loan_key(1)) == 1
+
+    import_loans_from_csv(bulk=True, path=_second_loan_csv(tmp_path))
+    # Dropped on commit by mark_stale(), not only when the counter is next read
+    assert cache.get(latest_loan_key(1)) is None
+
+    second = client.get(DASHBOARD, headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    summary = second.json()["loan_summary"]
+    assert (summary["loan_id"], summary["amount"], summary["next_payment_date"]) == (2, 600, "2026-01-07")
+    assert len(second.json()["payment_history"]) == 12
+
+    history = client.get(HISTORY, headers={"If-None-Match": history.headers["etag"]})
+    assert history.status_code == 200
+    assert [point["agreed_date"] for point in history.json()][:2] == ["2026-01-07", "2026-02-07"]
+
+
+def test_repayment_write_invalidates_cached_schedules_and_portfolio(loan_account, migrated_engine, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+
+    first = client.get(DASHBOARD)
+    portfolio = client.get("/api/admin/portfolio", headers=headers).json()
+    assert cache.get(loan_key(1)) is not None
+    assert cache.get(PORTFOLIO_KEY) is not None
+    assert portfolio["outstanding_balance"] == 300
+
+    with Session(migrated_engine) as session:
+        repayment = session.scalars(
+            select(LoanRepayment).where(LoanRepayment.loan_id == 1, LoanRepayment.month_number == 1)
+        ).one()
+        repayment.actual_date = date(2025, 2, 1)
+        repayment.amount_repaid = 100
+        session.commit()
+    assert cache.get(loan_key(1)) is None
+    assert cache.get(PORTFOLIO_KEY) is None
+
+    second = client.get(DASHBOARD, headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["payment_history"][0]["status"] == "Paid"
+    assert second.json()["loan_summary"]["last_payment_amount"] == 100
+    assert client.get("/api/admin/portfolio", headers=headers).json()["outstanding_balance"] == 200
+
+
+def test_scoring_run_changes_the_scoring_etag(loan_account, migrated_engine):
+    first = client.get("/api/scoring")
+    assert first.json() == []
+
+    with Session(migrated_engine) as session:
+        assert run_scoring(session, today=date(2025, 6, 1)) == 1
+
+    second = client.get("/api/scoring", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert [row["user_id"] for row in second.json()] == [1]
+
+    third = client.get("/api/scoring", headers={"If-None-Match": second.headers["etag"]})
+    assert third.status_code == 304
+
+    # The CSV importer's bulk upsert moves it too
+    with Session(migrated_engine) as session:
+        import_scoring_rows(session, pd.DataFrame({"PointScore": [640.0], "Percentage": [0.5333]}))
+        session.commit()
+
+    fourth = client.get("/api/scoring", headers={"If-None-Match": second.headers["etag"]})
+    assert fourth.status_code == 200
+    assert [row["user_id"] for row in fourth.json()] == [1, 101]
@@ -0,0 +1,200 @@
+import os
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+import import_loans_from_csv as importer
+from csv_ingest import _fingerprint, ingest_csv, normalise_frame
+from models import Account, ImportCheckpoint, Loan, LoanRepayment
+from update_accounts_from_csv import update_accounts_from_csv
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _sample_csv(path, rows: int = 25) -> str:
+    df = pd.read_csv(importer.CSV_PATH, encoding="utf-8-sig", dtype=str).head(rows)
+    csv = path / "loans.csv"
+    df.to_csv(csv, index=False)
+    return str(csv)
+
+
+def _loans(engine) -> list:
+    with engine.connect() as conn:
+        return sorted(conn.execute(text("SELECT account_id, original_amount, start_date FROM loans")).all())
+
+
+def _fail_on_chunk(monkeypatch, number: int):
+    """Make the bulk handler raise on its `number`-th chunk (1-based)."""
+    handle = importer.bulk_import_loans
+    calls = []
+
+    def flaky(session, chunk):
+        calls.append(chunk.index[0])
+        if len(calls) == number:
+            handle(session, chunk)  # the partial writes must be rolled back
+            raise Interrupted
+        return handle(session, chunk)
+
+    monkeypatch.setattr(importer, "bulk_import_loans", flaky)
+    return calls
+
+
+def test_interrupted_import_resumes_after_the_last_committed_chunk(migrated_engine, tmp_path, monkeypatch):
+    csv = _sample_csv(tmp_path)
+    source = "loans:" + os.path.basename(csv)
+
+    calls = _fail_on_chunk(monkeypatch, 3)
+    with pytest.raises(Interrupted):
+        importer.import_loans_from_csv(bulk=True, chunksize=10, path=csv)
+    assert calls == [0, 10, 20]
+
+    with Session(migrated_engine) as session:
+        assert session.get(ImportCheckpoint, source).rows_done == 20
+        assert session.scalar(select(func.count()).select_from(Loan)) == 20
+        assert session.scalar(select(func.count()).select_from(LoanRepayment)) == 20 * 12
+
+    monkeypatch.undo()
+    importer.import_loans_from_csv(bulk=True, chunksize=10, path=csv)
+    resumed = _loans(migrated_engine)
+
+    with Session(migrated_engine) as session:
+        assert session.get(ImportCheckpoint, source) is None
+        assert session.scalar(select(func.count()).select_from(LoanRepayment)) == 25 * 12
+
+    # Same rows as an uninterrupted import
+    with migrated_engine.begin() as conn:
+        for table in ("loan_repayments", "loans", "account_information"):
+            conn.execute(text(f"DELETE FROM {table}"))
+    importer.import_loans_from_csv(bulk=True, chunksize=10, path=csv)
+    assert resumed == _loans(migrated_engine)
+
+
+def test_resume_keeps_absolute_row_positions(migrated_engine, tmp_path):
+    csv = _sample_csv(tmp_path)
+    with Session(migrated_engine) as session:
+        session.add(ImportCheckpoint(source="test", fingerprint=_fingerprint(csv), rows_done=12))
+        session.commit()
+
+    seen = []
+    rows = ingest_csv(
+        migrated_engine,
+        csv,
+        source="test",
+        handle_chunk=lambda session, chunk: seen.append((list(chunk.index), list(chunk["Name"]))),
+        checkpoint_model=ImportCheckpoint,
+        chunksize=5,
+    )
+
+    names = pd.read_csv(csv, dtype=str)["Name"].tolist()
+    assert rows == 25
+    assert [index for index, _ in seen] == [list(range(12, 17)), list(range(17, 22)), list(range(22, 25))]
+    assert [name for _, chunk_names in seen for name in chunk_names] == names[12:]
+
+
+def test_checkpoint_for_another_version_of_the_file_is_ignored(migrated_engine, tmp_path):
+    csv = _sample_csv(tmp_path)
+    with Session(migrated_engine) as session:
+        session.add(ImportCheckpoint(source="test", fingerprint="0:0", rows_done=12))
+        session.commit()
+
+    seen = []
+    rows = ingest_csv(
+        migrated_engine,
+        csv,
+        source="test",
+        handle_chunk=lambda session, chunk: seen.extend(chunk.index),
+        checkpoint_model=ImportCheckpoint,
+        chunksize=10,
+    )
+
+    assert rows == 25
+    assert seen == list(range(25))
+    with Session(migrated_engine) as session:
+        assert session.get(ImportCheckpoint, "test") is None
+
+
+
+def _norm(value):
+    """The importers' original per-cell text normalisation."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return str(value).strip()
+
+
+def _parse_date(value):
+    """The importers' original per-cell date parsing."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def test_column_normalisation_matches_the_per_cell_functions():
+    dates = [
+        "2025-02-07", "2025-2-7", "07/02/2025", "2025-13-01", "2025-02-30",
+        "", " 2025-02-07", "2025-02-07 10:00:00", None, float("nan"),
+    ]
+    texts = ["  Ada ", "", "nan", "+44 797", None, float("nan"), "a\tb ", "x", "y", "z"]
+    amounts = ["8.33", "abc", "", " 12 ", None, "1e3", "-0", "8,33", "12.5", float("nan")]
+    df = pd.DataFrame({"Name": texts, "Month1_AgreedDate": dates, "Month1_AmountRepaid": amounts})
+
+    out = normalise_frame(
+        df,
+        text_cols=["Name", "Address"],  # columns missing from the frame are skipped
+        date_cols=["Month1_AgreedDate"],
+        amount_cols=["Month1_AmountRepaid"],
+    )
+
+    assert list(out.columns) == list(df.columns)
+    assert out["Name"].tolist() == [_norm(value) for value in texts]
+    assert out["Month1_AgreedDate"].tolist() == [_parse_date(value) for value in dates]
+    assert out["Month1_AmountRepaid"].tolist() == [8.33, None, None, 12.0, None, 1000.0, 0.0, None, 12.5, None]
+    # The input frame is left alone
+    assert df["Name"].tolist()[:2] == ["  Ada ", ""]
+
+
+def test_account_sync_skips_nameless_rows_and_strips_values(migrated_engine, tmp_path):
+    with Session(migrated_engine) as session:
+        session.add(
+            Account(
+                user_id=1,
+                full_name="Ada Lovelace",
+                dob=date(1990, 1, 1),
+                age=35,
+                address="Old Street",
+                phone_number="0123",
+                email="ada@example.com",
+                monthly_income=3000,
+            )
+        )
+        session.commit()
+
+    csv = tmp_path / "accounts.csv"
+    pd.DataFrame(
+        {
+            "Name": ["  Ada Lovelace ", "   ", None, "Alan Turing", "Alan Turing"],
+            "Address": [" 12 New Road ", "Nowhere", "Nowhere", "Bletchley", "Bletchley"],
+            "Contact number": ["", "999", "999", " 07700 ", None],
+            "email": [" ada@example.com", "ghost@example.com", None, None, "alan@example.com"],
+        }
+    ).to_csv(csv, index=False)
+
+    update_accounts_from_csv(chunksize=2, path=str(csv))
+
+    with Session(migrated_engine) as session:
+        accounts = session.scalars(select(Account).order_by(Account.user_id)).all()
+        rows = [(a.full_name, a.address, a.phone_number, a.email) for a in accounts]
+
+    assert rows == [
+        # Matched by email; a blank contact keeps the stored number
+        ("Ada Lovelace", "12 New Road", "0123", "ada@example.com"),
+        # Created from the first row, then matched by name + address and given the email
+        ("Alan Turing", "Bletchley", "07700", "alan@example.com"),
+    ]
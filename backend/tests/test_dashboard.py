@@ -0,0 +1,81 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from main import app
+from models import Account, Loan, LoanRepayment
+
+client = TestClient(app)
+
+
+def _pay_first_month_and_add_an_older_loan(engine):
+    with Session(engine) as session:
+        repayment = session.scalars(
+            select(LoanRepayment).where(LoanRepayment.loan_id == 1, LoanRepayment.month_number == 1)
+        ).one()
+        repayment.actual_date = date(2025, 2, 3)
+        repayment.amount_repaid = 100
+        session.add(Loan(loan_id=2, account_id=1, original_amount=900, start_date=date(2024, 1, 1), term_months=1))
+        session.add(LoanRepayment(loan_id=2, month_number=1, agreed_date=date(2024, 2, 1)))
+        session.commit()
+
+
+def test_dashboard_combines_account_summary_and_history(loan_account, migrated_engine):
+    _pay_first_month_and_add_an_older_loan(migrated_engine)
+
+    dashboard = client.get(f"/api/accounts/{loan_account}/dashboard").json()
+
+    assert dashboard["account"]["full_name"] == "Ada Lovelace"
+    assert dashboard["account"]["email"] == "ada@example.com"
+    # The most recent loan, not the older one
+    assert dashboard["loan_summary"] == {
+        "loan_id": 1,
+        "amount": 300.0,
+        "term_months": 3,
+        "monthly_payment": 100.0,
+        "last_payment_amount": 100.0,
+        "last_payment_date": "2025-02-03",
+        "next_payment_amount": None,
+        "next_payment_date": "2025-03-01",
+        "status": "Overdue",
+        "reminder_date": "2025-02-22",
+    }
+    assert [
+        (point["month_number"], point["month"], point["actual_date"], point["amount_repaid"], point["status"])
+        for point in dashboard["payment_history"]
+    ] == [
+        (1, "Feb", "2025-02-03", 100.0, "Paid"),
+        (2, "Mar", None, None, "Missed"),
+        (3, "Apr", None, None, "Missed"),
+    ]
+
+    # Same content as the three endpoints it replaces
+    assert dashboard["account"] == client.get(f"/api/accounts/{loan_account}").json()
+    assert dashboard["loan_summary"] == client.get(f"/api/accounts/{loan_account}/loan-summary").json()
+    assert dashboard["payment_history"] == client.get(f"/api/accounts/{loan_account}/payment-history").json()
+
+
+def test_dashboard_of_an_account_without_loans(migrated_engine):
+    with Session(migrated_engine) as session:
+        session.add(
+            Account(
+                user_id=7,
+                full_name="Grace Hopper",
+                dob=date(1990, 1, 1),
+                age=35,
+                phone_number="0123",
+                email="grace@example.com",
+                monthly_income=3000,
+            )
+        )
+        session.commit()
+
+    dashboard = client.get("/api/accounts/7/dashboard")
+    assert dashboard.status_code == 200
+    assert dashboard.json()["account"]["full_name"] == "Grace Hopper"
+    assert dashboard.json()["loan_summary"] is None
+    assert dashboard.json()["payment_history"] == []
+
+    assert client.get("/api/accounts/8/dashboard").status_code == 404
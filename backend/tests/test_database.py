@@ -0,0 +1,33 @@
+# backend/tests/test_database.py
+import pytest
+
+import database
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        dict(DB_MAX_CONNECTIONS=100, WEB_WORKERS=4, DB_ASYNC=False, DB_POOL_SIZE=20, DB_MAX_OVERFLOW=20),
+        dict(DB_MAX_CONNECTIONS=100, WEB_WORKERS=4, DB_ASYNC=True, DB_POOL_SIZE=10, DB_MAX_OVERFLOW=30),
+        dict(DB_MAX_CONNECTIONS=50, WEB_WORKERS=3, DB_ASYNC=False, DB_POOL_SIZE=0, DB_MAX_OVERFLOW=-1),
+        dict(DB_MAX_CONNECTIONS=7, WEB_WORKERS=7, DB_ASYNC=False, DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10),
+    ],
+)
+def test_pools_stay_within_the_connection_budget(monkeypatch, settings):
+    for name, value in settings.items():
+        monkeypatch.setattr(database, name, value)
+
+    pool_size, max_overflow = database._pool_limits()
+
+    engines = settings["WEB_WORKERS"] * (2 if settings["DB_ASYNC"] else 1)
+    assert pool_size >= 1 and max_overflow >= 0
+    assert (pool_size + max_overflow) * engines <= settings["DB_MAX_CONNECTIONS"]
+
+
+def test_budget_too_small_for_every_pool_is_rejected(monkeypatch):
+    monkeypatch.setattr(database, "DB_MAX_CONNECTIONS", 3)
+    monkeypatch.setattr(database, "WEB_WORKERS", 4)
+    monkeypatch.setattr(database, "DB_ASYNC", False)
+
+    with pytest.raises(ValueError):
+        database._pool_limits()
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from decisions import STARTER_AMOUNT, decide, run_decisions
+from models import Account, LoanApplicationModel, Scoring
+
+
+def test_tiers_and_strain():
+    applications = pd.DataFrame(
+        [
+            # id, income, rent, percentage -> decision, tier
+            (1, 3000, 900, 0.95),
+            (2, 3000, 900, 0.90),
+            (3, 3000, 900, 0.8999),
+            (4, 3000, 900, 0.75),
+            (5, 3000, 900, 0.7499),
+            (6, 3000, 900, np.nan),
+            (7, 3000, 1500, 0.95),  # exactly half: not strained
+            (8, 3000, 1501, 0.95),
+            (9, 0, 0, 0.95),
+        ],
+        columns=["id", "monthly_income", "house_rent", "percentage"],
+    )
+
+    decided = decide(applications)
+
+    assert decided["id"].tolist() == list(range(1, 10))
+    assert decided["decision"].tolist() == ["approved"] * 7 + ["review"] * 2
+    assert decided["tier_amount"].tolist()[:7] == [150, 150, 100, 100, STARTER_AMOUNT, STARTER_AMOUNT, 150]
+    assert np.isnan(decided["tier_amount"].tolist()[7:]).all()
+    assert decided["strain_ratio"].tolist() == [0.3] * 6 + [0.5, 0.5003, 9999]
+
+
+def _application(id: int, email: str, income: float, rent: float) -> LoanApplicationModel:
+    return LoanApplicationModel(
+        id=id,
+        full_name=f"Applicant {id}",
+        dob=date(1990, 1, 1),
+        email=email,
+        phone="0123",
+        monthly_income=income,
+        house_rent=rent,
+        reference_name="Ref",
+        reference_relationship="Friend",
+        reference_phone="0456",
+    )
+
+
+def _decisions(engine) -> dict:
+    apps = LoanApplicationModel
+    with Session(engine) as session:
+        rows = session.execute(
+            select(apps.id, apps.decision, apps.tier_amount, apps.decided_at).order_by(apps.id)
+        ).all()
+    return {row.id: (row.decision, row.tier_amount and float(row.tier_amount), row.decided_at) for row in rows}
+
+
+def test_run_decides_pending_applications_once(migrated_engine):
+    with Session(migrated_engine) as session:
+        for user_id, email, percentage in ((1, "top@example.com", 0.92), (2, "mid@example.com", 0.8)):
+            session.add(
+                Account(
+                    user_id=user_id,
+                    full_name=email,
+                    dob=date(1990, 1, 1),
+                    age=35,
+                    phone_number="0123",
+                    email=email,
+                    monthly_income=3000,
+                )
+            )
+            session.add(Scoring(user_id=user_id, point_score=percentage * 1200, percentage=percentage))
+        session.add_all(
+            [
+                _application(1, "top@example.com", 3000, 900),
+                _application(2, "mid@example.com", 3000, 900),
+                _application(3, "new@example.com", 3000, 900),
+                _application(4, "top@example.com", 1000, 900),
+                _application(5, "new@example.com", 3000, 900),
+            ]
+        )
+        # Already decided by hand: left alone
+        session.get(LoanApplicationModel, 5).decision = "review"
+        session.commit()
+
+    # Threads stand in for the process pool: each batch opens its own session either way
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        totals = run_decisions(pool, workers=2, batch_size=2)
+        first = _decisions(migrated_engine)
+
+        assert totals == {"approved": 3, "review": 1}
+        assert {id: decision[:2] for id, decision in first.items()} == {
+            1: ("approved", 150),
+            2: ("approved", 100),
+            3: ("approved", STARTER_AMOUNT),
+            4: ("review", None),
+            5: ("review", None),
+        }
+        assert first[5][2] is None
+
+        # A rerun finds nothing pending and rewrites nothing
+        assert run_decisions(pool, workers=2, batch_size=2) == {}
+        assert _decisions(migrated_engine) == first
+
+        # Only a new application is decided on the next run
+        with Session(migrated_engine) as session:
+            session.add(_application(6, "mid@example.com", 3000, 900))
+            session.commit()
+        assert run_decisions(pool, workers=2, batch_size=2) == {"approved": 1}
+        after = _decisions(migrated_engine)
+        assert after[6][:2] == ("approved", 100)
+        assert {id: after[id] for id in first} == first
@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import admin
+import export
+from export import export_chunks
+from import_loans_from_csv import CSV_PATH
+from main import app
+from models import Loan, LoanRepayment
+
+client = TestClient(app)
+
+TODAY = date(2025, 3, 15)
+
+
+@pytest.fixture
+def loans(loan_account, migrated_engine):
+    """Loan 1 with month 1 paid, loans 2-4 of one month each and loan 5 with no repayments."""
+    with Session(migrated_engine) as session:
+        repayment = session.scalars(
+            select(LoanRepayment).where(LoanRepayment.loan_id == 1, LoanRepayment.month_number == 1)
+        ).one()
+        repayment.actual_date = date(2025, 2, 3)
+        repayment.amount_repaid = 100
+        for loan_id in range(2, 6):
+            session.add(
+                Loan(
+                    loan_id=loan_id,
+                    account_id=1,
+                    original_amount=50 * loan_id,
+                    start_date=date(2025, 3, 1),
+                    term_months=1,
+                )
+            )
+            if loan_id < 5:
+                session.add(LoanRepayment(loan_id=loan_id, month_number=1, agreed_date=date(2025, 4, 1)))
+        session.commit()
+    return migrated_engine
+
+
+def _csv(engine, layout: str) -> list:
+    data = b"".join(export_chunks(engine, "csv", layout, TODAY)).decode()
+    return list(csv.reader(io.StringIO(data)))
+
+
+def test_wide_csv_has_one_row_per_loan_in_the_import_layout(loans):
+    header, *rows = _csv(loans, "wide")
+
+    assert header[:5] == ["loan_id", "user_id", "start_date", "term_months", "status"]
+    # The rest is the microloans CSV's own header, up to the longest schedule (3 months here)
+    source_header = list(pd.read_csv(CSV_PATH, encoding="utf-8-sig", nrows=0).columns)
+    assert header[5:] == source_header[: 5 + 3 * 3]
+
+    assert [row[0] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert rows[0] == [
+        "1", "1", "2025-01-01", "3", "Overdue",
+        "Ada Lovelace", "", "0123", "ada@example.com", "300.00",
+        "2025-02-01", "2025-02-03", "100.00",
+        "2025-03-01", "", "",
+        "2025-04-01", "", "",
+    ]
+    assert rows[1][4:10] == ["Active", "Ada Lovelace", "", "0123", "ada@example.com", "100.00"]
+    assert rows[1][10:] == ["2025-04-01", "", ""] + [""] * 6
+    # No repayments: closed, with empty month columns
+    assert rows[4][4] == "Closed"
+    assert rows[4][10:] == [""] * 9
+
+
+def test_long_csv_has_one_row_per_repayment(loans):
+    header, *rows = _csv(loans, "long")
+
+    assert header == ["loan_id", "user_id", "month_number", "agreed_date", "actual_date", "amount_repaid"]
+    assert rows == [
+        ["1", "1", "1", "2025-02-01", "2025-02-03", "100.00"],
+        ["1", "1", "2", "2025-03-01", "", ""],
+        ["1", "1", "3", "2025-04-01", "", ""],
+        ["2", "1", "1", "2025-04-01", "", ""],
+        ["3", "1", "1", "2025-04-01", "", ""],
+        ["4", "1", "1", "2025-04-01", "", ""],
+    ]
+
+
+def test_ndjson_has_the_same_records(loans):
+    data = b"".join(export_chunks(loans, "ndjson", "long", TODAY)).decode()
+    records = [json.loads(line) for line in data.splitlines()]
+
+    assert len(records) == 6
+    assert records[0] == {
+        "loan_id": 1,
+        "user_id": 1,
+        "month_number": 1,
+        "agreed_date": "2025-02-01",
+        "actual_date": "2025-02-03",
+        "amount_repaid": 100.0,
+    }
+
+
+def test_export_is_streamed_one_window_of_loans_at_a_time(loans, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+
+    chunks = export_chunks(loans, "csv", "wide", TODAY)
+    # The header goes out before any loan is read
+    assert next(chunks).decode().startswith("loan_id,user_id,")
+    windows = [chunk.decode().splitlines() for chunk in chunks]
+    assert [[row.split(",")[0] for row in window] for window in windows] == [["1", "2"], ["3", "4"], ["5"]]
+
+
+def test_export_endpoint_streams_csv(loans, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+
+    with client.stream(
+        "GET", "/api/admin/export/repayments?format=csv&layout=long", headers={"X-Admin-Token": "s3cret"}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert response.headers["content-disposition"].startswith('attachment; filename="repayments-long-')
+        assert "content-length" not in response.headers
+        body = b"".join(response.iter_bytes()).decode()
+
+    assert len(body.splitlines()) == 1 + 6
+
+
+def test_parquet_export_matches_the_csv(loans):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(io.BytesIO(b"".join(export_chunks(loans, "parquet", "long", TODAY))))
+
+    assert table.num_rows == 6
+    assert table.column("amount_repaid").to_pylist()[0] == 100
@@ -0,0 +1,43 @@
+# backend/tests/test_http_cache.py
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+
+import versions
+from database import SQLALCHEMY_DATABASE_URL
+from main import app
+from models import LoanRepayment
+
+client = TestClient(app)
+
+
+def test_write_by_another_process_is_not_served_from_the_cache(loan_account):
+    first = client.get(f"/api/accounts/{loan_account}/payment-history")
+    assert [point["status"] for point in first.json()] == ["Missed", "Missed", "Missed"]
+
+    # Another worker or an import script: a Core write on its own engine,
+    # which bumps the counter but not this process's cache
+    other = create_engine(SQLALCHEMY_DATABASE_URL)
+    with other.begin() as conn:
+        conn.execute(
+            update(LoanRepayment)
+            .where(LoanRepayment.loan_id == 1, LoanRepayment.month_number == 1)
+            .values(actual_date=date(2025, 2, 1), amount_repaid=100)
+        )
+    other.dispose()
+    versions.clear_versions()  # as if VERSIONS_TTL_SECONDS had passed
+
+    second = client.get(
+        f"/api/accounts/{loan_account}/payment-history",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert [point["status"] for point in second.json()] == ["Paid", "Missed", "Missed"]
+
+    third = client.get(
+        f"/api/accounts/{loan_account}/payment-history",
+        headers={"If-None-Match": second.headers["etag"]},
+    )
+    assert third.status_code == 304
@@ -0,0 +1,98 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from import_loans_from_csv import CSV_PATH, import_loans_from_csv
+from models import Account
+
+SNAPSHOT_QUERIES = {
+    "accounts": "SELECT user_id, full_name, address, phone_number, email FROM account_information",
+    "loans": (
+        "SELECT loan_id, account_id, original_amount, start_date, term_months, next_due_date,"
+        " next_payment_amount, last_paid_date, last_payment_amount, amount_paid, status FROM loans"
+    ),
+    "repayments": (
+        "SELECT loan_id, month_number, agreed_date, actual_date, amount_repaid FROM loan_repayments"
+    ),
+}
+
+
+def _loans_csv(path) -> str:
+    """Forty rows of the sample file plus the awkward cases both modes must handle alike."""
+    df = pd.read_csv(CSV_PATH, encoding="utf-8-sig", dtype=str).head(40)
+    extra = [
+        # Second loan for an account created earlier in the same file
+        {**df.iloc[0].to_dict(), "Loan amount": "250"},
+        # Matches the seeded account by email, padded with whitespace
+        {**df.iloc[1].to_dict(), "Name": "  Grace Hopper ", "email": " grace@example.com "},
+        # No email: matches the seeded account by name + address
+        {**df.iloc[2].to_dict(), "Name": "Grace Hopper", "Address": "1 Navy Way", "email": None},
+        # No name: skipped
+        {**df.iloc[3].to_dict(), "Name": "   "},
+        # New email, but name + address of an earlier row: reuses that account.
+        # Malformed and missing month values are stored as NULL
+        {
+            **df.iloc[4].to_dict(),
+            "email": "odd@example.com",
+            "Month1_AgreedDate": None,
+            "Month2_AgreedDate": "07/02/2025",
+            "Month2_AmountRepaid": None,
+        },
+    ]
+    df = pd.concat([df, pd.DataFrame(extra)], ignore_index=True)
+    csv = path / "loans.csv"
+    df.to_csv(csv, index=False)
+    return str(csv)
+
+
+def _reset(engine):
+    with engine.begin() as conn:
+        for table in ("loan_repayments", "loans", "account_information", "import_checkpoints"):
+            conn.execute(text(f"DELETE FROM {table}"))
+    with Session(engine) as session:
+        session.add(
+            Account(
+                user_id=1,
+                full_name="Grace Hopper",
+                dob=date(1906, 12, 9),
+                age=85,
+                address="1 Navy Way",
+                phone_number="0123",
+                email="grace@example.com",
+                monthly_income=3000,
+            )
+        )
+        session.commit()
+
+
+def _snapshot(engine) -> dict:
+    with engine.connect() as conn:
+        return {name: sorted(conn.execute(text(query)).all()) for name, query in SNAPSHOT_QUERIES.items()}
+
+
+@pytest.mark.parametrize("chunksize", [7, 5000])
+def test_bulk_import_matches_the_row_wise_import(migrated_engine, tmp_path, chunksize):
+    csv = _loans_csv(tmp_path)
+
+    _reset(migrated_engine)
+    import_loans_from_csv(bulk=False, chunksize=chunksize, path=csv)
+    row_wise = _snapshot(migrated_engine)
+
+    _reset(migrated_engine)
+    import_loans_from_csv(bulk=True, chunksize=chunksize, path=csv)
+    bulk = _snapshot(migrated_engine)
+
+    assert bulk == row_wise
+
+    # 44 loans (the nameless row is skipped), 12 months each
+    assert len(bulk["loans"]) == 44
+    assert len(bulk["repayments"]) == 44 * 12
+    # Only the sample rows create accounts: every extra row reuses one, including
+    # the new email whose name + address belong to an account made earlier in the file
+    assert len(bulk["accounts"]) == 1 + 40
+    loans_per_account = pd.Series([loan.account_id for loan in bulk["loans"]]).value_counts()
+    assert loans_per_account[1] == 2
+    assert (loans_per_account == 2).sum() == 3
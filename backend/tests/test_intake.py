@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+import intake
+import main
+from intake import ApplicationQueue, BatchWriter, application_row, flush_batch
+from models import LoanApplication, LoanApplicationModel
+
+APPLICATION = {
+    "fullName": "Ada Lovelace",
+    "dob": "1990-01-01",
+    "email": "ada@example.com",
+    "phone": "0123",
+    "monthlyIncome": 3000,
+    "houseRent": 900,
+    "referenceName": "Charles Babbage",
+    "referenceRelationship": "Colleague",
+    "referencePhone": "0456",
+}
+
+
+@pytest.fixture
+def queue(migrated_engine, tmp_path, monkeypatch):
+    """Queued intake on a fresh queue file; the batch writer is not started."""
+    queue = ApplicationQueue(str(tmp_path / "queue.sqlite3"))
+    monkeypatch.setattr(intake, "application_queue", queue)
+    monkeypatch.setattr(main, "application_queue", queue)
+    monkeypatch.setattr(main, "batch_writer", BatchWriter(queue, batch_size=10, interval=0.1))
+    return queue
+
+
+def _apply(client, **fields) -> str:
+    response = client.post("/api/apply", json={**APPLICATION, **fields})
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    return response.json()["ticket"]
+
+
+def _status(client, ticket) -> dict:
+    response = client.get(f"/api/apply/{ticket}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_queued_application_is_written_by_the_next_flush(queue, migrated_engine):
+    client = TestClient(main.app)
+    tickets = [_apply(client, email=f"user{n}@example.com") for n in range(3)]
+
+    assert queue.pending() == 3
+    assert [_status(client, ticket)["status"] for ticket in tickets] == ["queued"] * 3
+
+    assert flush_batch(queue, batch_size=2) == 2
+    assert flush_batch(queue, batch_size=2) == 1
+    assert flush_batch(queue, batch_size=2) == 0
+    assert queue.pending() == 0
+
+    with Session(migrated_engine) as session:
+        written = dict(session.execute(select(LoanApplicationModel.ticket, LoanApplicationModel.email)).all())
+    assert written == {ticket: f"user{n}@example.com" for n, ticket in enumerate(tickets)}
+
+    for ticket in tickets:
+        status = _status(client, ticket)
+        assert status["status"] == "written"
+        assert status["application_id"] is not None
+
+    # Once purged from the queue, the status comes from loan_applications
+    assert queue.purge_written(timedelta(0)) == 3
+    assert queue.get(tickets[0]) is None
+    assert _status(client, tickets[0])["status"] == "written"
+
+    assert client.get("/api/apply/unknown").status_code == 404
+
+
+def test_a_rejected_row_fails_alone(queue, migrated_engine):
+    # SQLite does not enforce VARCHAR lengths; MySQL in strict mode rejects the row
+    with migrated_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TRIGGER full_name_length BEFORE INSERT ON loan_applications"
+                " WHEN length(NEW.full_name) > 120"
+                " BEGIN SELECT RAISE(ABORT, 'Data too long for column full_name'); END"
+            )
+        )
+
+    client = TestClient(main.app)
+    good = _apply(client)
+    bad = _apply(client, fullName="A" * 121)
+    also_good = _apply(client, email="grace@example.com")
+
+    assert flush_batch(queue) == 3
+
+    assert _status(client, good)["status"] == "written"
+    assert _status(client, also_good)["status"] == "written"
+    failed = _status(client, bad)
+    assert failed["status"] == "failed"
+    assert failed["application_id"] is None
+    assert "Data too long" in failed["error"]
+
+    with Session(migrated_engine) as session:
+        tickets = set(session.scalars(select(LoanApplicationModel.ticket)))
+    assert tickets == {good, also_good}
+    # Failed entries are not retried
+    assert queue.pending() == 0
+    assert flush_batch(queue) == 0
+
+
+def test_flush_does_not_insert_a_batch_twice(queue, migrated_engine):
+    client = TestClient(main.app)
+    ticket = _apply(client)
+    claimed = queue.claim(10)
+
+    # Committed to the database, but the writer stopped before marking it written
+    intake._insert_applications(
+        {row["ticket"]: application_row(LoanApplication.model_validate_json(row["payload"])) for row in claimed}
+    )
+    # ...and its lease has run out
+    queue._connect().execute("UPDATE queued_applications SET claimed_until = NULL")
+
+    assert flush_batch(queue) == 1
+    with Session(migrated_engine) as session:
+        assert session.scalars(select(LoanApplicationModel.ticket)).all() == [ticket]
+    assert _status(client, ticket)["status"] == "written"
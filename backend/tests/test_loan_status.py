@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from loan_status import loan_status, rebuild_loan_status, status_expression
+from models import Account, Loan, LoanRepayment
+
+
+def _account(session):
+    session.add(
+        Account(
+            user_id=1,
+            full_name="Ada Lovelace",
+            dob=date(1990, 1, 1),
+            age=35,
+            phone_number="0123",
+            monthly_income=3000,
+        )
+    )
+
+
+def _status(session, today: date) -> tuple[str, str]:
+    """Python and SQL status of loan 1, which must agree."""
+    loan = session.get(Loan, 1)
+    sql = session.execute(select(status_expression(today)).where(Loan.loan_id == 1)).scalar_one()
+    return loan_status(loan, today), sql
+
+
+def test_loan_without_repayments_is_closed(migrated_engine):
+    today = date.today()
+    with Session(migrated_engine) as session:
+        _account(session)
+        session.add(Loan(loan_id=1, account_id=1, original_amount=300, start_date=today, term_months=3))
+        session.commit()
+
+        assert session.get(Loan, 1).status == "Closed"
+        assert _status(session, today) == ("Closed", "Closed")
+
+        # The full rebuild agrees with the flush hook
+        assert rebuild_loan_status(session) == 1
+        assert session.get(Loan, 1).status == "Closed"
+
+
+def test_status_follows_inserts_and_updates(loan_account, migrated_engine):
+    today = date(2025, 1, 15)
+    with Session(migrated_engine) as session:
+        loan = session.get(Loan, 1)
+        assert loan.status == "Active"
+        assert loan.next_due_date == date(2025, 2, 1)
+        assert _status(session, today) == ("Active", "Active")
+
+        repayments = session.scalars(
+            select(LoanRepayment).where(LoanRepayment.loan_id == 1).order_by(LoanRepayment.month_number)
+        ).all()
+        repayments[0].actual_date = date(2025, 2, 1)
+        repayments[0].amount_repaid = 100
+        session.commit()
+
+        loan = session.get(Loan, 1)
+        assert loan.next_due_date == date(2025, 3, 1)
+        assert loan.last_paid_date == date(2025, 2, 1)
+        assert float(loan.amount_paid) == 100
+
+        for rep in repayments[1:]:
+            rep.actual_date = rep.agreed_date
+            rep.amount_repaid = 100
+        session.commit()
+
+        loan = session.get(Loan, 1)
+        assert loan.next_due_date is None
+        assert float(loan.amount_paid) == 300
+        assert _status(session, today) == ("Closed", "Closed")
+
+        # A new unpaid month reopens the loan
+        session.add(LoanRepayment(loan_id=1, month_number=4, agreed_date=date(2025, 5, 1)))
+        session.commit()
+        assert session.get(Loan, 1).next_due_date == date(2025, 5, 1)
+        assert _status(session, today) == ("Active", "Active")
+
+        # Deleting every repayment leaves nothing to pay
+        for rep in session.scalars(select(LoanRepayment).where(LoanRepayment.loan_id == 1)):
+            session.delete(rep)
+        session.commit()
+        assert _status(session, today) == ("Closed", "Closed")
+
+
+def test_active_loan_becomes_overdue_once_its_due_date_passes(loan_account, migrated_engine):
+    due = date(2025, 2, 1)
+    with Session(migrated_engine) as session:
+        assert session.get(Loan, 1).status == "Active"
+
+        assert _status(session, due - timedelta(days=1)) == ("Active", "Active")
+        assert _status(session, due) == ("Active", "Active")
+        assert _status(session, due + timedelta(days=1)) == ("Overdue", "Overdue")
+
+        # Paying the overdue month moves the due date on
+        rep = session.scalars(
+            select(LoanRepayment).where(LoanRepayment.loan_id == 1, LoanRepayment.month_number == 1)
+        ).one()
+        rep.actual_date = due + timedelta(days=1)
+        rep.amount_repaid = 100
+        session.commit()
+        assert _status(session, due + timedelta(days=1)) == ("Active", "Active")
+        assert _status(session, date(2025, 3, 2)) == ("Overdue", "Overdue")
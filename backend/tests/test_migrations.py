@@ -0,0 +1,134 @@
+# backend/tests/test_migrations.py
+from datetime import date
+
+from sqlalchemy import DECIMAL, Column, Date, ForeignKey, Integer, MetaData, String, Table, inspect, text
+
+from migrations import LATEST_VERSION, migrate, schema_version
+
+
+def _baseline_schema(engine):
+    """The tables as the first release created them, before any migration existed."""
+    metadata = MetaData()
+    Table(
+        "items",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String(255), index=True),
+        Column("description", String(255)),
+    )
+    Table(
+        "account_information",
+        metadata,
+        Column("user_id", Integer, primary_key=True, index=True),
+        Column("full_name", String(120), nullable=False),
+        Column("dob", Date, nullable=False),
+        Column("age", Integer, nullable=False),
+        Column("address", String(255)),
+        Column("phone_number", String(20), nullable=False),
+        Column("email", String(255)),
+        Column("job_title", String(120)),
+        Column("monthly_income", DECIMAL(10, 2), nullable=False),
+        Column("house_rent", DECIMAL(10, 2)),
+    )
+    Table(
+        "loans",
+        metadata,
+        Column("loan_id", Integer, primary_key=True, index=True),
+        Column("account_id", Integer, ForeignKey("account_information.user_id"), nullable=False),
+        Column("original_amount", DECIMAL(10, 2), nullable=False),
+        Column("start_date", Date, nullable=False),
+        Column("term_months", Integer, nullable=False),
+    )
+    Table(
+        "loan_repayments",
+        metadata,
+        Column("repayment_id", Integer, primary_key=True, index=True),
+        Column("loan_id", Integer, ForeignKey("loans.loan_id"), nullable=False),
+        Column("month_number", Integer, nullable=False),
+        Column("agreed_date", Date),
+        Column("actual_date", Date),
+        Column("amount_repaid", DECIMAL(10, 2)),
+    )
+    Table(
+        "scoring_table",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("user_id", Integer, index=True),
+        Column("point_score", DECIMAL(10, 2)),
+        Column("percentage", DECIMAL(10, 4)),
+    )
+    Table(
+        "loan_applications",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("full_name", String(120), nullable=False),
+        Column("dob", Date, nullable=False),
+        Column("email", String(255), nullable=False),
+        Column("phone", String(20), nullable=False),
+        Column("monthly_income", DECIMAL(10, 2), nullable=False),
+        Column("house_rent", DECIMAL(10, 2), nullable=False),
+        Column("reference_name", String(120), nullable=False),
+        Column("reference_relationship", String(120), nullable=False),
+        Column("reference_phone", String(20), nullable=False),
+        Column("reference_email", String(255)),
+    )
+    metadata.create_all(bind=engine)
+
+
+def test_every_migration_applies_to_the_baseline_schema(sqlite_engine):
+    _baseline_schema(sqlite_engine)
+    with sqlite_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO account_information (user_id, full_name, dob, age, phone_number, monthly_income)"
+                " VALUES (1, 'A B', :dob, 30, '1', 1000)"
+            ),
+            {"dob": date(1990, 1, 1)},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO loans (loan_id, account_id, original_amount, start_date, term_months)"
+                " VALUES (1, 1, 100, :start, 12)"
+            ),
+            {"start": date(2025, 1, 1)},
+        )
+
+    applied = migrate(sqlite_engine)
+
+    assert len(applied) == LATEST_VERSION
+    with sqlite_engine.connect() as conn:
+        assert schema_version(conn) == LATEST_VERSION
+    inspector = inspect(sqlite_engine)
+    application_columns = {col["name"] for col in inspector.get_columns("loan_applications")}
+    assert {"ticket", "decision", "tier_amount", "strain_ratio", "decided_at"} <= application_columns
+    application_indexes = {index["name"] for index in inspector.get_indexes("loan_applications")}
+    assert {"ix_loan_applications_ticket", "ix_loan_applications_decision_id"} <= application_indexes
+    assert inspector.has_table("change_counters")
+
+    # Nothing left to do on a second run
+    assert migrate(sqlite_engine) == []
+
+
+def test_migrations_apply_to_an_empty_database(sqlite_engine):
+    assert len(migrate(sqlite_engine)) == LATEST_VERSION
+    assert migrate(sqlite_engine) == []
+
+
+def test_duplicate_scores_from_the_original_importer_are_removed(sqlite_engine):
+    _baseline_schema(sqlite_engine)
+    with sqlite_engine.begin() as conn:
+        # Two import runs: the second one's rows (higher ids) are the current scores
+        for point_score in (100, 900):
+            conn.execute(
+                text("INSERT INTO scoring_table (user_id, point_score, percentage) VALUES (:user_id, :score, 0.5)"),
+                [{"user_id": user_id, "score": point_score + user_id} for user_id in (101, 102, 103)],
+            )
+        conn.execute(text("INSERT INTO scoring_table (user_id, point_score, percentage) VALUES (104, 7, 0.1)"))
+
+    migrate(sqlite_engine)
+
+    with sqlite_engine.connect() as conn:
+        rows = conn.execute(text("SELECT user_id, point_score FROM scoring_table ORDER BY user_id")).all()
+    assert [(user_id, float(score)) for user_id, score in rows] == [(101, 1001), (102, 1002), (103, 1003), (104, 7)]
+    indexes = {index["name"]: index for index in inspect(sqlite_engine).get_indexes("scoring_table")}
+    assert indexes["uq_scoring_table_user_id"]["unique"]
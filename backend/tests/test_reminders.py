@@ -0,0 +1,75 @@
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import LoanRepayment, ReminderSend
+from reminders import FileSender, days_before_due, send_due_reminders
+
+
+class BrokenSender:
+    def send(self, reminders):
+        raise ConnectionError("SMS gateway down")
+
+
+def _sent(path) -> list:
+    """(due date, days before) of every reminder written by the FileSender."""
+    if not path.exists():
+        return []
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    return [(line["due_date"], line["days_before"]) for line in lines]
+
+
+def test_current_reminder_is_the_nearest_one_that_has_come_round():
+    assert [days_before_due(days) for days in range(-1, 10)] == [None, 1, 1, 3, 3, 7, 7, 7, 7, None, None]
+
+
+def test_each_reminder_goes_out_once(loan_account, migrated_engine, tmp_path):
+    out = tmp_path / "reminders.jsonl"
+    sender = FileSender(str(out))
+
+    with Session(migrated_engine) as session:
+        for day, expected in (
+            (date(2025, 1, 24), 0),  # 8 days before the first due date
+            (date(2025, 1, 25), 1),  # 7-day reminder
+            (date(2025, 1, 25), 0),  # same day again
+            (date(2025, 1, 27), 0),  # still the 7-day reminder
+            (date(2025, 1, 29), 1),  # 3-day reminder
+            (date(2025, 1, 31), 1),  # 1-day reminder
+            (date(2025, 2, 1), 0),   # due today: the 1-day reminder is already out
+        ):
+            assert send_due_reminders(session, sender, today=day, batch_size=1) == expected
+
+        # Paid early: no reminders for that month
+        march = session.scalars(select(LoanRepayment).where(LoanRepayment.month_number == 2)).one()
+        march.actual_date = date(2025, 2, 20)
+        march.amount_repaid = 100
+        session.commit()
+        assert send_due_reminders(session, sender, today=date(2025, 2, 22)) == 0
+        assert send_due_reminders(session, sender, today=date(2025, 3, 25)) == 1
+
+    assert _sent(out) == [("2025-02-01", 7), ("2025-02-01", 3), ("2025-02-01", 1), ("2025-04-01", 7)]
+    line = json.loads(out.read_text(encoding="utf-8").splitlines()[0])
+    assert (line["full_name"], line["email"], line["amount"]) == ("Ada Lovelace", "ada@example.com", 100.0)
+
+
+def test_missed_reminders_are_skipped_not_sent_together(loan_account, migrated_engine, tmp_path):
+    out = tmp_path / "reminders.jsonl"
+    with Session(migrated_engine) as session:
+        assert send_due_reminders(session, FileSender(str(out)), today=date(2025, 1, 31)) == 1
+    assert _sent(out) == [("2025-02-01", 1)]
+
+
+def test_failed_send_is_retried_on_the_next_run(loan_account, migrated_engine, tmp_path):
+    out = tmp_path / "reminders.jsonl"
+    with Session(migrated_engine) as session:
+        with pytest.raises(ConnectionError):
+            send_due_reminders(session, BrokenSender(), today=date(2025, 1, 25))
+        assert session.scalar(select(func.count()).select_from(ReminderSend)) == 0
+
+        assert send_due_reminders(session, FileSender(str(out)), today=date(2025, 1, 25)) == 1
+        assert send_due_reminders(session, FileSender(str(out)), today=date(2025, 1, 25)) == 0
+
+    assert _sent(out) == [("2025-02-01", 7)]
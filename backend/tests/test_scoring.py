@@ -0,0 +1,98 @@
+# backend/tests/test_scoring.py
+from datetime import date, timedelta
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import pandas as pd
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from import_scoring_from_csv import CSV_PATH, import_scoring, import_scoring_rows
+from models import Account, Loan, LoanRepayment, Scoring
+from scoring import ON_TIME_POINTS, compute_scores, run_scoring, upsert_scores
+
+
+def _score(session) -> float:
+    return float(session.execute(select(Scoring.point_score).where(Scoring.user_id == 1)).scalar_one())
+
+
+def test_incremental_run_rescores_repayments_that_fell_due_unpaid(migrated_engine):
+    today = date.today()
+    with Session(migrated_engine) as session:
+        session.add(
+            Account(
+                user_id=1,
+                full_name="Ada Lovelace",
+                dob=date(1990, 1, 1),
+                age=35,
+                phone_number="0123",
+                monthly_income=3000,
+            )
+        )
+        session.add(
+            Loan(loan_id=1, account_id=1, original_amount=300, start_date=today - timedelta(days=60), term_months=3)
+        )
+        session.add_all(
+            [
+                LoanRepayment(
+                    loan_id=1,
+                    month_number=1,
+                    agreed_date=today - timedelta(days=30),
+                    actual_date=today - timedelta(days=30),
+                    amount_repaid=100,
+                ),
+                LoanRepayment(loan_id=1, month_number=2, agreed_date=today + timedelta(days=10)),
+                LoanRepayment(loan_id=1, month_number=3, agreed_date=today + timedelta(days=40)),
+            ]
+        )
+        session.commit()
+
+        assert run_scoring(session, today=today) == 1
+        assert _score(session) == ON_TIME_POINTS
+
+        # Twenty days on, month 2 is unpaid past its agreed date; no row has changed
+        assert run_scoring(session, incremental=True, today=today + timedelta(days=20)) == 1
+        assert _score(session) == 0
+
+
+def _stored_scores(engine) -> dict:
+    """user_id -> (point_score, percentage) exactly as stored (no Numeric rounding)."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT user_id, point_score, percentage FROM scoring_table"))
+        return {user_id: (Decimal(repr(score)), Decimal(repr(percentage))) for user_id, score, percentage in rows}
+
+
+def _at_scale(value, places: int) -> Decimal:
+    """A value as a DECIMAL(10, places) column keeps it when written one row at a time."""
+    return Decimal(repr(float(value))).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_EVEN)
+
+
+def test_csv_import_stores_scores_like_the_row_wise_import(migrated_engine):
+    import_scoring(path=CSV_PATH, chunksize=128)
+
+    frame = pd.read_csv(CSV_PATH)
+    expected = {
+        101 + position: (_at_scale(row.PointScore, 2), _at_scale(row.Percentage, 4))
+        for position, row in enumerate(frame.itertuples(index=False))
+    }
+    assert _stored_scores(migrated_engine) == expected
+
+
+def test_csv_import_and_scoring_engine_store_the_same_values(migrated_engine):
+    counts = pd.DataFrame({"account_id": [1, 2, 3], "on_time": [7, 12, 1], "late": [3, 0, 0], "missed": [1, 0, 2]})
+    computed = compute_scores(counts)
+    with Session(migrated_engine) as session:
+        upsert_scores(session, computed)
+        session.commit()
+    engine_scores = _stored_scores(migrated_engine)
+    with migrated_engine.begin() as conn:
+        conn.execute(text("DELETE FROM scoring_table"))
+
+    # The same scores as the CSV carries them, unrounded
+    csv = pd.DataFrame({"PointScore": computed["point_score"] + 0.0004, "Percentage": computed["point_score"] / 1200})
+    csv.index = computed["user_id"] - 101  # the importer numbers rows from user 101
+
+    with Session(migrated_engine) as session:
+        import_scoring_rows(session, csv)
+        session.commit()
+
+    assert _stored_scores(migrated_engine) == engine_scores
@@ -1,12 +1,19 @@
 # backend/update_accounts_from_csv.py
 import os
-from typing import Optional
+from datetime import date
 
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from .database import engine
-from .models import Account
+from csv_ingest import (
+    ACCOUNT_TEXT_COLUMNS,
+    CHUNK_SIZE,
+    LOAN_CSV_DTYPES,
+    ingest_csv,
+    normalise_frame,
+)
+from database import engine
+from models import Account, ImportCheckpoint
 
 CSV_PATH = os.path.join(
     os.path.dirname(__file__),
@@ -15,81 +22,75 @@ CSV_PATH = os.path.join(
 )
 
 
-def normalise(value: Optional[str]) -> Optional[str]:
-    """Convert NaN/None to None and strip strings."""
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-    return str(value).strip()
-
-
-def update_accounts_from_csv():
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"CSV file not found at: {CSV_PATH}")
-
-    # Read CSV (utf-8-sig handles BOM if present)
-    df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
-
-    required_cols = ["Name", "Address", "Contact number", "email"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column in CSV: {col}")
-
-    with Session(engine) as session:
-        for _, row in df.iterrows():
-            name = normalise(row["Name"])
-            address = normalise(row["Address"])
-            contact = normalise(row["Contact number"])
-            email = normalise(row["email"])
-
-            if not name:
-                print("Skipping row with no Name:", row.to_dict())
-                continue
-
-            # 1) Try find existing account by email first
-            account = None
-            if email:
-                account = session.query(Account).filter(Account.email == email).first()
-
-            # 2) Fallback: match by name + address
-            if account is None:
-                account = (
-                    session.query(Account)
-                    .filter(
-                        Account.full_name == name,
-                        Account.address == address,
-                    )
-                    .first()
+def update_account_rows(session: Session, df: pd.DataFrame):
+    """Create or update one account per CSV row."""
+    df = normalise_frame(df, text_cols=ACCOUNT_TEXT_COLUMNS)
+    # Records, not iterrows(): a row of text columns would turn None back into NaN
+    for row in df.to_dict("records"):
+        name = row["Name"]
+        address = row["Address"]
+        contact = row["Contact number"]
+        email = row["email"]
+
+        if not name:
+            print("Skipping row with no Name:", row)
+            continue
+
+        # 1) Try find existing account by email first
+        account = None
+        if email:
+            account = session.query(Account).filter(Account.email == email).first()
+
+        # 2) Fallback: match by name + address
+        if account is None:
+            account = (
+                session.query(Account)
+                .filter(
+                    Account.full_name == name,
+                    Account.address == address,
                 )
-
-            if account is None:
-                # Create new account (dob/age placeholders if non-nullable)
-                print(f"[NEW] Creating account for {name}")
-                account = Account(
-                    full_name=name,
-                    dob="1990-01-01",   # TODO: adjust if you make dob nullable
-                    age=35,             # TODO: adjust
-                    address=address,
-                    phone_number=contact or "",
-                    email=email,
-                    job_title="Unknown",
-                    monthly_income=0,
-                    house_rent=0,
-                )
-                session.add(account)
-            else:
-                # Update existing account
-                print(f"[UPDATE] Updating account for {name} (id={account.user_id})")
-                if address:
-                    account.address = address
-                if contact:
-                    account.phone_number = contact
-                if email:
-                    account.email = email
-
-        session.commit()
-        print("✅ Account sync from CSV completed.")
+                .first()
+            )
+
+        if account is None:
+            # Create new account (dob/age placeholders if non-nullable)
+            print(f"[NEW] Creating account for {name}")
+            account = Account(
+                full_name=name,
+                dob=date(1990, 1, 1),  # TODO: adjust if you make dob nullable
+                age=35,             # TODO: adjust
+                address=address,
+                phone_number=contact or "",
+                email=email,
+                job_title="Unknown",
+                monthly_income=0,
+                house_rent=0,
+            )
+            session.add(account)
+        else:
+            # Update existing account
+            print(f"[UPDATE] Updating account for {name} (id={account.user_id})")
+            if address:
+                account.address = address
+            if contact:
+                account.phone_number = contact
+            if email:
+                account.email = email
+
+
+def update_accounts_from_csv(chunksize: int = CHUNK_SIZE, path: str = CSV_PATH):
+    # Read CSV (utf-8-sig handles BOM if present) in committed chunks
+    rows = ingest_csv(
+        engine,
+        path,
+        source="accounts:" + os.path.basename(path),
+        handle_chunk=update_account_rows,
+        checkpoint_model=ImportCheckpoint,
+        required_cols=["Name", "Address", "Contact number", "email"],
+        dtype=LOAN_CSV_DTYPES,
+        chunksize=chunksize,
+    )
+    print(f"✅ Account sync from CSV completed ({rows} rows).")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+# backend/versions.py
+"""Change counters: one version per group of tables, bumped by every write to them.
+
+Each counter in models.CHANGE_COUNTERS is a row of change_counters. A
+transaction that inserts, updates or deletes rows of one of its tables
+bumps it (version + 1, updated_at) right before it commits, in the same
+transaction: ORM flushes, the importers' Core bulk inserts and the scoring
+upserts alike. Statements written as text() are not seen.
+
+The hooks are registered on every Engine once this module is imported, so
+every process that writes those tables imports it. http_cache.py builds
+ETag / Last-Modified validators from current_versions().
+"""
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import Engine, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from cache import sync_loans_version
+from models import CHANGE_COUNTERS, ChangeCounter
+
+# How long a process reuses the counters it read; its own commits reset them
+VERSIONS_TTL_SECONDS = float(os.getenv("VERSIONS_TTL_SECONDS", "1"))
+
+_COUNTER_BY_TABLE = {table: name for name, tables in CHANGE_COUNTERS.items() for table in tables}
+_CHANGED = "changed_counters"
+
+counters = ChangeCounter.__table__
+
+# (expires, {name: (version, updated_at)})
+_memo = (0.0, None)
+
+
+@event.listens_for(Engine, "after_execute")
+def _collect_changed_counters(conn, clauseelement, multiparams, params, execution_options, result):
+    if not isinstance(clauseelement, UpdateBase):
+        return
+    name = _COUNTER_BY_TABLE.get(getattr(clauseelement.table, "name", None))
+    if name is not None:
+        conn.info.setdefault(_CHANGED, set()).add(name)
+
+
+@event.listens_for(Engine, "commit")
+def _bump_changed_counters(conn):
+    changed = conn.info.pop(_CHANGED, None)
+    if not changed:
+        return
+    # Still inside the committing transaction; sorted, so concurrent writers lock rows in one order
+    conn.execute(
+        update(counters)
+        .where(counters.c.name.in_(sorted(changed)))
+        .values(version=counters.c.version + 1, updated_at=datetime.utcnow())
+    )
+    clear_versions()
+
+
+@event.listens_for(Engine, "rollback")
+def _discard_changed_counters(conn):
+    conn.info.pop(_CHANGED, None)
+
+
+def clear_versions():
+    global _memo
+    _memo = (0.0, None)
+
+
+def _versions_select():
+    return select(counters.c.name, counters.c.version, counters.c.updated_at)
+
+
+def _remember(rows) -> dict:
+    global _memo
+    versions = {name: (version, updated_at) for name, version, updated_at in rows}
+    _memo = (time.monotonic() + VERSIONS_TTL_SECONDS, versions)
+    if "loans" in versions:
+        # Writes by other processes: drop loan data this process cached before them
+        sync_loans_version(versions["loans"][0])
+    return versions
+
+
+def _remembered():
+    expires, versions = _memo
+    return versions if expires > time.monotonic() else None
+
+
+def current_versions(db: Session) -> dict:
+    """Counter name -> (version, updated_at), at most VERSIONS_TTL_SECONDS old."""
+    versions = _remembered()
+    if versions is None:
+        versions = _remember(db.execute(_versions_select()).all())
+    return versions
+
+
+async def current_versions_async(db: AsyncSession) -> dict:
+    versions = _remembered()
+    if versions is None:
+        versions = _remember((await db.execute(_versions_select())).all())
+    return versions
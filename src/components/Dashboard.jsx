@@ -20,68 +20,41 @@ const Dashboard = () => {
     const [loadingUser, setLoadingUser] = useState(true);
     const [error, setError] = useState("");
 
-    useEffect(() => {
-        async function loadUser() {
-        try {
-            const res = await fetch("https://aidmakers.onrender.com/api/accounts/184");
-            if (!res.ok) throw new Error("Failed to fetch user");
-
-            const data = await res.json();
-            setUser(data);
-        } catch (err) {
-            setError(err.message);
-        } finally {
-            setLoadingUser(false);
-        }
-        }
-
-        loadUser();
-    }, []);    
-
-
     const [loan, setLoan] = useState(null);
     const [loadingLoan, setLoadingLoan] = useState(true);
     const [loanError, setLoanError] = useState("");
 
-    useEffect(() => {
-    async function loadLoan() {
-        try {
-        const res = await fetch("https://aidmakers.onrender.com/api/accounts/184/loan-summary");
-        if (!res.ok) throw new Error("Failed to fetch loan");
-
-        const data = await res.json();
-        setLoan(data);
-        } catch (err) {
-        setLoanError(err.message);
-        } finally {
-        setLoadingLoan(false);
-        }
-    }
-
-    loadLoan();
-    }, []);
-
-
     const [paymentHistory, setPaymentHistory] = useState([]);
     const [loadingHistory, setLoadingHistory] = useState(true);
     const [historyError, setHistoryError] = useState("");
 
+    // Account, loan summary and payment history arrive in one round trip
     useEffect(() => {
-    async function loadHistory() {
+    async function loadDashboard() {
         try {
-        const res = await fetch("https://aidmakers.onrender.com/api/accounts/184/payment-history");
-        if (!res.ok) throw new Error("Failed to fetch payment history");
+        const res = await fetch("https://aidmakers.onrender.com/api/accounts/184/dashboard");
+        if (!res.ok) throw new Error("Failed to fetch dashboard");
 
         const data = await res.json();
-        setPaymentHistory(data);
+        setUser(data.account);
+        setPaymentHistory(data.payment_history);
+        if (data.loan_summary) {
+            setLoan(data.loan_summary);
+        } else {
+            setLoanError("No loan found for this user");
+        }
         } catch (err) {
+        setError(err.message);
+        setLoanError(err.message);
         setHistoryError(err.message);
         } finally {
+        setLoadingUser(false);
+        setLoadingLoan(false);
         setLoadingHistory(false);
         }
     }
 
-    loadHistory();
+    loadDashboard();
     }, []);
 
     // Build cumulative payment progress data for the bar chart
@@ -1,14 +1,22 @@
 import { useEffect, useState } from "react";
+
+const API = "https://aidmakers.onrender.com";
+
 const Management = () => { 
 
     const [scores, setScores] = useState([]);
     const [loadingScores, setLoadingScores] = useState(true);
     const [scoresError, setScoresError] = useState("");
+    // Live updates need an admin session (httpOnly cookie set by /api/admin/session)
+    const [needsSignIn, setNeedsSignIn] = useState(false);
+    const [adminToken, setAdminToken] = useState("");
+    const [signInError, setSignInError] = useState("");
+    const [session, setSession] = useState(0);
 
     useEffect(() => {
     async function loadScores() {
         try {
-        const res = await fetch("https://aidmakers.onrender.com/api/scoring");
+        const res = await fetch("https://aidmakers.onrender.com/api/scoring?sort=-point_score&limit=10");
         if (!res.ok) throw new Error("Failed to fetch scores");
 
         const data = await res.json();
@@ -26,13 +34,57 @@ const Management = () => {
     }
 
     loadScores();
-    }, []);
+
+    // Refetch when scores change instead of polling. The session cookie goes
+    // with the request; without one the stream is refused and closes.
+    const events = new EventSource(`${API}/api/admin/events`, { withCredentials: true });
+    events.addEventListener("open", () => setNeedsSignIn(false));
+    events.addEventListener("score.changed", loadScores);
+    events.addEventListener("resync", loadScores);
+    events.addEventListener("error", () => {
+        if (events.readyState === EventSource.CLOSED) setNeedsSignIn(true);
+    });
+    return () => events.close();
+    }, [session]);
+
+    async function signIn(e) {
+    e.preventDefault();
+    setSignInError("");
+    try {
+        // The token is only sent here, in a header; it is not kept
+        const res = await fetch(`${API}/api/admin/session`, {
+        method: "POST",
+        headers: { "X-Admin-Token": adminToken },
+        credentials: "include",
+        });
+        if (!res.ok) throw new Error("Sign-in failed");
+        setAdminToken("");
+        setSession((n) => n + 1);
+    } catch (err) {
+        setSignInError(err.message);
+    }
+    }
 
 
     return(
          <section className="card card-full">
             <h2 className="card-title">User Score Overview</h2>
             <div className="card-content">
+                {needsSignIn && (
+                <form onSubmit={signIn}>
+                    <label>
+                    Admin token for live updates{" "}
+                    <input
+                        type="password"
+                        value={adminToken}
+                        onChange={(e) => setAdminToken(e.target.value)}
+                        autoComplete="off"
+                    />
+                    </label>
+                    <button type="submit">Sign in</button>
+                    {signInError && <p style={{ color: "red" }}>{signInError}</p>}
+                </form>
+                )}
                 {loadingScores && <p>Loading scores...</p>}
                 {scoresError && <p style={{ color: "red" }}>Error: {scoresError}</p>}
 